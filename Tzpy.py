@@ -1,10 +1,34 @@
-"""Desktop helper that fuses timezone conversion with weather lookups."""
+"""Desktop helper that fuses timezone conversion with weather lookups.
+
+Importing this module only defines the GUI; call ``main()`` (or run the file)
+to open the window. Conversion, bucketing and theme logic live in ``tzpy_core``.
+"""
+
+from time import perf_counter  # Startup-time measurement.
+_STARTUP_T0 = perf_counter()  # Taken before the heavy GUI import so the budget covers it.
+
+import os  # Startup report toggle.
+import sys  # Startup budget warnings go to stderr.
+from concurrent.futures import ThreadPoolExecutor  # Background pool for blocking weather lookups.
+from datetime import datetime  # Core datetime parsing.
+
+if __name__ == "__main__" and len(sys.argv) > 1:  # Console mode: stream conversions without loading wx at all.
+    from tzpy_cli import main as cli_main
+    sys.exit(cli_main())
 
-from datetime import datetime, time  # Core datetime parsing and comparisons.
-import pytz  # Timezone database and conversion helpers.
 import wx  # wxPython GUI toolkit.
 from tzlocal import get_localzone_name  # OS timezone helper for the "Current Local" button.
-import weather_api as wa  # Project weather helpers.
+from tzpy_core import (  # GUI-free core (re-exported here for existing callers).
+    BACKGROUND_IMAGES,
+    background_image_for,
+    time_bucket_for,
+    time_zone_converter,
+)
+from bitmap_cache import BitmapCache  # Decoded + pre-scaled background art.
+from render_scheduler import RenderScheduler  # Coalesced, change-detecting repaints.
+from zone_picker import EVT_ZONE_CHANGED, ZonePicker  # Typeahead zone search instead of a 600-row wx.Choice.
+from weather_prefetch import WeatherPrefetcher  # Speculative lookups ahead of GET WEATHER.
+import metrics  # Stage timings for the debug overlay / exports (no-ops unless enabled).
 
 # --- Global UI State ------------------------------------------------------
 result = ""  # Stores the latest converted timestamp (also feeds weather lookups + background shifts).
@@ -14,53 +38,23 @@ button_widgets = []  # Buttons grouped so they switch colours together.
 last_text_mode = "light"  # Captures the active palette so resize events can reapply it.
 bg_bitmap = None  # wx.StaticBitmap instance responsible for the hero artwork layer.
 
+# --- Background weather lookups ---
+weather_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="weather")  # Keeps HTTP off the UI thread.
+weather_generation = 0  # Bumped per request/target change; results from older generations are dropped.
+pending_weather = None  # Future for the in-flight lookup (if any) so it can be cancelled.
+PREFETCH_REPORT_ENV = "PYTHONJACKFRUIT_PREFETCH_REPORT"  # Set to 1 to print prefetch hit/waste counts on exit.
+
+# --- Instrumentation ---
+METRICS_FILE_ENV = "PYTHONJACKFRUIT_METRICS_FILE"  # Dump metrics here on exit (.prom -> Prometheus text, else JSON).
+debug_overlay = None  # wx.StaticText with the last weather/render stage breakdown (F12 toggles it).
+world_clock_frame = None  # Multi-zone world-clock window, created on first use.
+
 # --- Background Image System ---
 current_time_bucket = "night"          # pre_dawn, sunrise, morning, day, evening, night
 current_weather_condition = "clear"    # clear, cloudy, rain, snow, storm
 
-# Catalog mapping (time_bucket, condition) to the art asset used for the backdrop.
-# Keeping it as one dictionary lets back_fore_ground perform a single lookup per refresh.
-BACKGROUND_IMAGES = {
-    # PRE-DAWN / NIGHT BEFORE SUNRISE
-    ("pre_dawn", "clear"):  "images/pre_dawn_clear.png",
-    ("pre_dawn", "cloudy"): "images/pre_dawn_cloudy.png",
-    ("pre_dawn", "rain"):   "images/pre_dawn_rain.png",
-    ("pre_dawn", "snow"):   "images/pre_dawn_snow.png",
-    ("pre_dawn", "storm"):  "images/pre_dawn_storm.png",
-    # SUNRISE
-    ("sunrise", "clear"):   "images/morning_clear.png",
-    ("sunrise", "cloudy"):  "images/morning_cloudy.png",
-    ("sunrise", "rain"):    "images/morning_rain.png",
-    ("sunrise", "snow"):    "images/morning_snow.png",
-    ("sunrise", "storm"):   "images/morning_storm.png",
-
-    # MORNING – AFTER SUNRISE
-    ("morning", "clear"):   "images/after_morning_clear.png",
-    ("morning", "cloudy"):  "images/after_morning_cloudy.png",
-    ("morning", "rain"):    "images/after_morning_rain.png",
-    ("morning", "snow"):    "images/after_morning_snow.png",
-    ("morning", "storm"):   "images/after_morning_storm.png",
-    # DAYTIME
-    ("day", "clear"):       "images/day_clear.png",
-    ("day", "cloudy"):      "images/day_cloudy.png",
-    ("day", "rain"):        "images/day_rain.png",
-    ("day", "snow"):        "images/day_snow.png",
-    ("day", "storm"):       "images/day_storm.png",
-
-    # EVENING / SUNSET
-    ("evening", "clear"):   "images/evening_clear.png",
-    ("evening", "cloudy"):  "images/evening_cloudy.png",
-    ("evening", "rain"):    "images/evening_rain.png",
-    ("evening", "snow"):    "images/evening_snow.png",
-    ("evening", "storm"):   "images/evening_storm.png",
-
-    # NIGHT TIME
-    ("night", "clear"):     "images/night_clear.png",
-    ("night", "cloudy"):    "images/night_cloudy.png",
-    ("night", "rain"):      "images/night_rain.png",
-    ("night", "snow"):      "images/night_snow.png",
-    ("night", "storm"):     "images/night_storm.png",
-}
+# Decoded/scaled backdrops keyed by (path, width, height) so repeat paints skip disk + resample.
+background_cache = BitmapCache()
 
 # Font helper keeps headings consistent without repeating the wx.Font setup.
 BASE_FONT_NAME = "Segoe Print"  # Soft handwritten font that matches the illustrated backgrounds.
@@ -84,46 +78,61 @@ def apply_font(widget, size=11, weight=wx.FONTWEIGHT_NORMAL):
     widget.SetFont(font)  # Apply the resolved font to the widget.
 
 
-def time_zone_converter(time_str, from_tz, to_tz, time_format="%Y-%m-%d %H:%M:%S"):
-    """Localize the provided datetime to `from_tz`, convert it into `to_tz`, and return a formatted string."""
-    from_timezone = pytz.timezone(from_tz)  # Source tz definition used for localization.
-    to_timezone = pytz.timezone(to_tz)  # Destination tz definition for conversion target.
+def load_weather_api():
+    """Import weather_api on first use so startup does not pay for requests + the caches."""
+    import weather_api  # Cached in sys.modules after the first call.
+    return weather_api
+
 
-    naive_time = datetime.strptime(time_str, time_format)  # Create a naïve datetime from the provided string.
-    localized_time = from_timezone.localize(naive_time)  # Bind the naïve datetime to the source tz (handles DST).
-    converted_time = localized_time.astimezone(to_timezone)  # Shift that datetime into the destination tz.
+def _fetch_weather(dt_str, tz_name):
+    with metrics.trace("weather"):  # Groups geocode / HTTP / decode / row spans for the overlay.
+        return load_weather_api().get_weather_for_datetime(dt_str, tz_name)
+
+
+def _fetch_location(tz_name):
+    return load_weather_api().get_location_from_timezone(tz_name)
+
+
+# Converting (or picking a target zone) starts the lookup GET WEATHER will most likely ask for next.
+weather_prefetcher = WeatherPrefetcher(weather_executor, _fetch_weather, _fetch_location)
 
-    return converted_time.strftime(time_format)  # Return a string using the original format for UI display.
 
 def back_fore_ground(text_mode):
     """Swap in the correct background image and palette for the active time bucket + weather condition."""
 
-    global bg_bitmap, current_time_bucket, current_weather_condition, last_text_mode
+    global last_text_mode
     last_text_mode = text_mode  # Store mode so window resizes can reuse it.
+    # Typing and resize bursts fold into one repaint, and frames identical to the last one are skipped.
+    render_scheduler.request()
+
+
+def background_state():
+    """Everything that affects the drawn backdrop; identical states need no repaint."""
+    return (current_time_bucket, current_weather_condition, tuple(panel.GetClientSize()), last_text_mode)
+
 
-    # Step 1: look up which asset matches the active time bucket + weather tag.
-    key = (current_time_bucket, current_weather_condition)
-    img_path = BACKGROUND_IMAGES.get(key)
+def render_background():
+    """Paint the backdrop for the current state (called by the render scheduler)."""
+    with metrics.trace("render"):
+        _paint_background()
+    refresh_debug_overlay()
 
-    # Step 2: fall back to the clear-sky variant for that bucket if the combo is missing.
-    if img_path is None:
-        img_path = BACKGROUND_IMAGES.get((current_time_bucket, "clear"))
+
+def _paint_background():
+    # Step 1 + 2: look up the asset for the active time bucket + weather tag (clear-sky fallback).
+    img_path = background_image_for(current_time_bucket, current_weather_condition)
 
     # Step 3: load + scale the bitmap so it always spans the full window.
     if img_path and bg_bitmap is not None:
         try:
             w, h = panel.GetClientSize()  # Ask wx for the current drawable size.
 
-            img = wx.Image(img_path, wx.BITMAP_TYPE_ANY)
-            if w > 0 and h > 0:  # wx can report (0, 0) during startup.
-                img = img.Scale(w, h, wx.IMAGE_QUALITY_HIGH)
-
-            bmp = wx.Bitmap(img)
-            bg_bitmap.SetBitmap(bmp)
-            bg_bitmap.SetSize((w, h))
-            bg_bitmap.SetPosition((0, 0))
-            bg_bitmap.Lower()  # Keep the bitmap behind all interactive widgets.
-            panel.Refresh()
+            with metrics.span("render.bitmap"):
+                # Cached HQ bitmap if we have one; otherwise a nearby cached size or a fast scale now,
+                # with the HQ resample finishing on a worker once the size stops changing.
+                bmp, _final = background_cache.get_progressive(img_path, w, h, on_hq_background)
+            with metrics.span("render.apply"):
+                apply_background_bitmap(bmp, w, h)
         except Exception as e:
             print("Error loading image:", img_path, e)
 
@@ -135,28 +144,49 @@ def back_fore_ground(text_mode):
             pass
 
 
+def apply_background_bitmap(bmp, w, h):
+    """Show ``bmp`` as the full-panel backdrop."""
+    bg_bitmap.SetBitmap(bmp)
+    bg_bitmap.SetSize((w, h))
+    bg_bitmap.SetPosition((0, 0))
+    bg_bitmap.Lower()  # Keep the bitmap behind all interactive widgets.
+    panel.Refresh()
+
+
+def on_hq_background(path, w, h, bmp):
+    """Swap the preview for the finished high-quality bitmap if it still matches the window."""
+    if bg_bitmap is None:
+        return
+    current = background_image_for(current_time_bucket, current_weather_condition)
+    if path == current and tuple(panel.GetClientSize()) == (w, h):
+        metrics.inc("render.hq_swaps")
+        apply_background_bitmap(bmp, w, h)
+
+
+def refresh_debug_overlay():
+    """Show the latest weather + render stage timings when the overlay is visible."""
+    if debug_overlay is None or not debug_overlay.IsShown():
+        return
+    debug_overlay.SetLabel(f"{metrics.format_trace('weather')}\n\n{metrics.format_trace('render')}")
+    debug_overlay.Raise()
+
+
+def toggle_debug_overlay(event=None):
+    """F12: show/hide the stage breakdown (turning metrics on the first time)."""
+    metrics.enable()
+    debug_overlay.Show(not debug_overlay.IsShown())
+    refresh_debug_overlay()
+
+
+# Repaints go through the scheduler so only real visual changes reach the drawing code.
+render_scheduler = RenderScheduler(render_background, background_state)
+
+
 def set_time_bucket_from_time(t_obj):
     """Translate a datetime.time into one of the themed buckets, then refresh the background."""
     global current_time_bucket
 
-    if time(0, 0, 0) <= t_obj < time(4, 0, 0):
-        current_time_bucket = "pre_dawn"  # After midnight but before sunrise glow.
-        mode = "light"
-    elif time(4, 0, 0) <= t_obj < time(6, 0, 0):
-        current_time_bucket = "sunrise"  # Warm tones, sun just peeking out.
-        mode = "light"
-    elif time(6, 0, 0) <= t_obj < time(10, 0, 0):
-        current_time_bucket = "morning"  # Cooler daylight palette.
-        mode = "dark"
-    elif time(10, 0, 0) <= t_obj < time(17, 0, 0):
-        current_time_bucket = "day"  # Bright ambient midday art.
-        mode = "dark"
-    elif time(17, 0, 0) <= t_obj < time(20, 0, 0):
-        current_time_bucket = "evening"  # Sunset / twilight gradients.
-        mode = "dark"
-    else:
-        current_time_bucket = "night"  # Deep night sky.
-        mode = "light"
+    current_time_bucket, mode = time_bucket_for(t_obj)  # pre_dawn / sunrise / ... plus palette.
 
     back_fore_ground(mode)
 
@@ -201,9 +231,31 @@ def simple_frame(event=None, update_preview=True):
     to_tz = totz.GetStringSelection()
 
 
+def cancel_pending_weather():
+    """Supersede any in-flight weather lookup so its result is ignored when it lands."""
+    global weather_generation, pending_weather
+    weather_generation += 1  # Anything tagged with an older generation is now stale.
+    if pending_weather is not None:
+        pending_weather.cancel()  # Drops it outright if a worker has not picked it up yet.
+        pending_weather = None
+
+
+def on_target_tz_changed(event):
+    """Sync selections and discard weather that was requested for the previous target zone."""
+    simple_frame(event)
+    if pending_weather is not None:
+        cancel_pending_weather()
+        weather_output.SetLabel("")  # Clear the stale "fetching" hint.
+    weather_prefetcher.cancel()  # The converted result belongs to the previous target zone.
+    if to_tz:
+        weather_prefetcher.prefetch_location(to_tz)  # Geocode now; the weather needs a fresh conversion.
+
+
 def on_reset(event):
     """Clear all user inputs, reset theme state, and return the artwork to the current real-world bucket."""
     global result, current_weather_condition
+    cancel_pending_weather()  # A late answer must not repaint the freshly reset UI.
+    weather_prefetcher.cancel()
     inputdt.SetValue("")
     fromtz.SetSelection(wx.NOT_FOUND)
     totz.SetSelection(wx.NOT_FOUND)
@@ -214,9 +266,9 @@ def on_reset(event):
     set_time_bucket_from_time(datetime.now().time())  # Restore default artwork using the current time bucket.
         
 def on_weather(event):
-    """Fetch weather for the converted timestamp, then repaint the scene using that hour + condition."""
+    """Kick off a background weather lookup for the converted timestamp; the UI stays responsive."""
     simple_frame(update_preview=False)  # Refresh selections without repainting from raw input time.
-    global result, current_weather_condition
+    global pending_weather
 
     tz_name = totz.GetStringSelection()  # Target timezone drives the weather lookup.
     if not tz_name:
@@ -235,8 +287,32 @@ def on_weather(event):
         weather_output.SetLabel("Error: Converted datetime is invalid. Re-run the conversion.")
         return
 
+    cancel_pending_weather()  # A new click supersedes whatever was still loading.
+    generation = weather_generation
+    weather_output.SetLabel(f"⏳ Fetching weather for {tz_name} @ {dt_str_target} ...")  # In-progress state.
+
+    # Usually the conversion already started this lookup; otherwise delegate to a worker now.
+    # Either way the answer hops back to the UI thread with wx.CallAfter.
+    future = weather_prefetcher.take(dt_str_target, tz_name)
+    if future is None:
+        future = weather_executor.submit(_fetch_weather, dt_str_target, tz_name)
+    pending_weather = future
+    future.add_done_callback(
+        lambda f: None if f.cancelled() else wx.CallAfter(on_weather_done, f, generation, dt_str_target)
+    )
+
+
+def on_weather_done(future, generation, dt_str_target):
+    """Apply a finished lookup on the UI thread, unless a newer request has superseded it."""
+    global current_weather_condition, pending_weather
+
+    if generation != weather_generation:  # User clicked again, reset, or changed To TZ meanwhile.
+        return
+    pending_weather = None
+    refresh_debug_overlay()
+
     try:
-        weather = wa.get_weather_for_datetime(dt_str_target, tz_name)  # Delegate to Open-Meteo helper.
+        weather = future.result()
 
         current_weather_condition = weather.get("condition", "clear")
 
@@ -262,14 +338,39 @@ def on_convert(event):
     global result
 
     try:
-        result = time_zone_converter(time_str, from_tz, to_tz)
+        with metrics.span("ui.convert"):
+            result = time_zone_converter(time_str, from_tz, to_tz)
         output.SetLabel(f'📍 {from_tz} : {time_str} \n 🎯 {to_tz} : {result}')
         time_background_converter_output()
+        weather_prefetcher.prefetch(result, to_tz)  # Likely next click is GET WEATHER.
     except Exception:
         output.SetLabel("Error: Invalid input or timezone")
+def on_world_clock(event):
+    """Open (or raise) the world clock, pinned to the entered time when it parses, live otherwise."""
+    global world_clock_frame
+    from world_clock import instant_from_local  # Deferred with the rest of the world-clock code.
+    from world_clock_view import WorldClockFrame
+
+    simple_frame(update_preview=False)
+    try:
+        anchor = instant_from_local(time_str, from_tz) if time_str and from_tz else None
+    except Exception:
+        anchor = None  # Unparseable input: just show the live clock.
+
+    if world_clock_frame:  # False once the user closed (destroyed) the window.
+        world_clock_frame.set_anchor(anchor)
+    else:
+        zones = [z for z in (from_tz, to_tz) if z]  # The pair being converted goes on top.
+        zones += [z for z in WORLD_CLOCK_ZONES if z not in zones]
+        world_clock_frame = WorldClockFrame(frame, zones=zones, anchor_utc=anchor)
+    world_clock_frame.Show()
+    world_clock_frame.Raise()
+
+
 def on_resize(event):
     """Keep the bitmap scaled to the window whenever the frame size changes."""
-    back_fore_ground(last_text_mode)  # Rescale background art to the new panel dimensions.
+    # Coalesced repaint: shows a preview right away, the HQ rescale lands off-thread once the size settles.
+    back_fore_ground(last_text_mode)
     event.Skip()  # Allow default wx handling to continue.
 
 
@@ -295,131 +396,208 @@ RIGHT_MARGIN = 60
 BOTTOM_MARGIN = 60
 DISPLAY_WIDTH = 0
 
-# Preload all IANA zones so both dropdowns mirror the same dataset.
-timezones = pytz.all_timezones
-
-# Bootstrap the wx application + frame (fixed size to maintain background composition).
-app = wx.App(False)
-frame = wx.Frame(
-    None,
-    title="Time & Weather Tool",
-    size=(FRAME_WIDTH, FRAME_HEIGHT),
-    style=wx.DEFAULT_FRAME_STYLE
-          & ~( wx.MAXIMIZE_BOX | wx.RESIZE_BORDER)
-)
-panel = wx.Panel(frame, style=wx.SIMPLE_BORDER)
-panel.SetDoubleBuffered(True)
-bg_bitmap = wx.StaticBitmap(panel, -1, wx.Bitmap(1, 1), pos=(0, 0))
-bg_bitmap.Lower()  # Put it behind all other widgets
-panel.Bind(wx.EVT_SIZE, on_resize)
-
-# --- Time / Date controls -------------------------------------------------
-show1 = wx.StaticText(panel, label="ENTER DATE AND TIME", pos=(LEFT_MARGIN, 70))
-inputdt = wx.TextCtrl(panel, pos=(LEFT_MARGIN, 108), size=(CONTROL_WIDTH, CONTROL_HEIGHT), style=wx.SIMPLE_BORDER)
-inputdt.SetHint("YYYY-MM-DD HH:MM:SS")
-nowtime = wx.Button(
-    panel,
-    label="CURRENT LOCAL",
-    pos=(RIGHT_BUTTON_X, 106),
-    size=(BUTTON_WIDTH, BUTTON_HEIGHT),
-    style=wx.BORDER_RAISED,
-)
-
-# --- Timezone selectors ---------------------------------------------------
-show4 = wx.StaticText(panel, label="Select Source and Target", pos=(LEFT_MARGIN, 190))
-fromtz = wx.Choice(panel, choices=timezones, pos=(LEFT_MARGIN, 228), size=(CONTROL_WIDTH, 36), style=wx.BORDER_SUNKEN)
-totz = wx.Choice(panel, choices=timezones, pos=(LEFT_MARGIN, 278), size=(CONTROL_WIDTH, 36), style=wx.BORDER_SUNKEN)
-
-convert = wx.Button(
-    panel,
-    label="CONVERT TIME",
-    pos=(RIGHT_BUTTON_X, 276),
-    size=(BUTTON_WIDTH, BUTTON_HEIGHT),
-    style=wx.BORDER_RAISED,
-)
-reset_btn = wx.Button(
-    panel,
-    label="RESET",
-    pos=(FRAME_WIDTH - RIGHT_MARGIN - BUTTON_WIDTH, FRAME_HEIGHT - BOTTOM_MARGIN - BUTTON_HEIGHT),
-    size=(BUTTON_WIDTH, BUTTON_HEIGHT),
-    style=wx.BORDER_RAISED,
+WORLD_CLOCK_ZONES = (  # Default world-clock rows after the selected From/To zones.
+    "UTC",
+    "America/Los_Angeles",
+    "America/New_York",
+    "America/Sao_Paulo",
+    "Europe/London",
+    "Europe/Paris",
+    "Africa/Cairo",
+    "Asia/Dubai",
+    "Asia/Kolkata",
+    "Asia/Singapore",
+    "Asia/Tokyo",
+    "Australia/Sydney",
+    "Pacific/Auckland",
 )
-show5 = wx.StaticText(panel, label="RESULT ↓", pos=(LEFT_MARGIN, 352), style=wx.SIMPLE_BORDER)
-output = wx.StaticText(panel, label="", pos=(LEFT_MARGIN, 390), size=(DISPLAY_WIDTH, 0), style=wx.SIMPLE_BORDER)
-
-# --- Weather lookup UI ----------------------------------------------------
-show_weather = wx.StaticText(panel, label="WEATHER", pos=(LEFT_MARGIN, 476))
-weather_btn = wx.Button(
-    panel,
-    label="GET WEATHER",
-    pos=(RIGHT_BUTTON_X, 466),
-    size=(BUTTON_WIDTH, BUTTON_HEIGHT),
-    style=wx.BORDER_RAISED,
-)
-weather_output = wx.StaticText(panel, label="", pos=(LEFT_MARGIN, 516), size=(DISPLAY_WIDTH, 0), style=wx.SIMPLE_BORDER)
-
-
-# --- Event bindings -------------------------------------------------------
-inputdt.Bind(wx.EVT_TEXT, simple_frame)
-fromtz.Bind(wx.EVT_CHOICE, simple_frame)
-totz.Bind(wx.EVT_CHOICE, simple_frame)
-convert.Bind(wx.EVT_BUTTON, on_convert)
-reset_btn.Bind(wx.EVT_BUTTON, on_reset)
-nowtime.Bind(wx.EVT_BUTTON, on_now)
-weather_btn.Bind(wx.EVT_BUTTON, on_weather)
-
-# Widgets participating in theme swaps
-text_widgets = [  # Static labels + outputs that pivot between light/dark palettes.
-    show1,
-    show4,
-    show5,
-    output,
-    show_weather,
-    weather_output,
-]
-input_widgets = [  # Controls that accept user input (and need matching fonts/palettes).
-    inputdt,
-    fromtz,
-    totz,
-]
-button_widgets = [  # Action buttons that also flip colours together.
-    convert,
-    reset_btn,
-    nowtime,
-    weather_btn,
-]
-
-for widget in text_widgets:
-    apply_font(widget, size=12, weight=wx.FONTWEIGHT_MEDIUM)  # Keep labels readable while staying on-theme.
-
-for widget in input_widgets:
-    apply_font(widget, size=11)  # Keep inputs compact but on-theme.
-    
-for widget in button_widgets:
-    apply_font(widget, size=11, weight=wx.FONTWEIGHT_BOLD)  # Bold buttons for emphasis.
 
-apply_font(output, size=13, weight=wx.FONTWEIGHT_MEDIUM)  # Highlight the main conversion result.
-apply_font(weather_output, size=12)  # Weather summary uses slightly larger text.
+STARTUP_BUDGET_SECONDS = 1.5  # Target from process start to a painted window.
+STARTUP_REPORT_ENV = "PYTHONJACKFRUIT_STARTUP_REPORT"  # Set to 1 to always print the measurement.
+startup_seconds = None  # Filled in once the first frame has been shown.
 
 
-frame.Show()  # Display the fully configured window.
+def populate_timezones():
+    """Build the zone search index after the window is visible so it doesn't delay startup."""
+    fromtz.preload()  # Both pickers share the same lazily built index.
+    totz.preload()
 
-# Force initial background + text colours so buttons are visible
-set_time_bucket_from_time(datetime.now().time())  # Kick off theme logic using the current local time bucket.
-
-app.MainLoop()  # Enter the wxPython event loop.
 
+def report_startup():
+    """Record time-to-window and warn when it exceeds the startup budget."""
+    global startup_seconds
+    startup_seconds = perf_counter() - _STARTUP_T0
+    if startup_seconds > STARTUP_BUDGET_SECONDS or os.environ.get(STARTUP_REPORT_ENV):
+        print(
+            f"Startup took {startup_seconds:.3f}s (budget {STARTUP_BUDGET_SECONDS:.1f}s)",
+            file=sys.stderr,
+        )
 
-# # Simple user input (legacy CLI demo)
-# print("=== pytz Time Zone Converter ===")  # Display a heading when running via console.
-# print("Example: 2024-01-15 14:30:00")  # Show an example of the expected datetime format.
 
-# time_str = input("Enter time (YYYY-MM-DD HH:MM:SS): ")  # Prompt for the source datetime string.
-# from_tz = input("Enter source timezone (e.g., US/Eastern): ")  # Prompt for the source timezone name.
-# to_tz = input("Enter target timezone (e.g., Asia/Tokyo): ")  # Prompt for the destination timezone name.
+def report_prefetch():
+    """Print speculative-fetch effectiveness when PYTHONJACKFRUIT_PREFETCH_REPORT is set."""
+    if os.environ.get(PREFETCH_REPORT_ENV):
+        stats = weather_prefetcher.stats()
+        print(
+            f"Weather prefetch: {stats['hits']} hits / {stats['misses']} misses "
+            f"(hit rate {stats['hit_rate']:.0%}), {stats['wasted']} wasted, "
+            f"{stats['deduplicated']} deduplicated",
+            file=sys.stderr,
+        )
 
-# result = time_zone_converter(time_str, from_tz, to_tz)  # Perform the conversion using console input.
 
-# print(f"\n🔄 Conversion Result:")  # Label the output section for clarity.
-# print(f"📍 {from_tz}: {time_str}")  # Echo the original timezone and time.
-# print(f"🎯 {to_tz}: {result}")  # Echo the converted timezone and time.
+def report_metrics():
+    """Write the metrics snapshot to PYTHONJACKFRUIT_METRICS_FILE when recording was on."""
+    path = os.environ.get(METRICS_FILE_ENV)
+    if path and metrics.is_enabled():
+        metrics.dump(path)
+
+
+def build_ui():
+    """Create the frame, widgets and bindings (needs a running wx.App)."""
+    global frame, panel, bg_bitmap, show1, inputdt, nowtime, show4, fromtz, totz, convert, reset_btn, debug_overlay
+    global show5, output, show_weather, weather_btn, weather_output, text_widgets, input_widgets, button_widgets
+    global world_btn
+
+    # Bootstrap the frame (fixed size to maintain background composition).
+    frame = wx.Frame(
+        None,
+        title="Time & Weather Tool",
+        size=(FRAME_WIDTH, FRAME_HEIGHT),
+        style=wx.DEFAULT_FRAME_STYLE
+              & ~( wx.MAXIMIZE_BOX | wx.RESIZE_BORDER)
+    )
+    panel = wx.Panel(frame, style=wx.SIMPLE_BORDER)
+    panel.SetDoubleBuffered(True)
+    bg_bitmap = wx.StaticBitmap(panel, -1, wx.Bitmap(1, 1), pos=(0, 0))
+    bg_bitmap.Lower()  # Put it behind all other widgets
+    panel.Bind(wx.EVT_SIZE, on_resize)
+
+    # --- Time / Date controls -------------------------------------------------
+    show1 = wx.StaticText(panel, label="ENTER DATE AND TIME", pos=(LEFT_MARGIN, 70))
+    inputdt = wx.TextCtrl(panel, pos=(LEFT_MARGIN, 108), size=(CONTROL_WIDTH, CONTROL_HEIGHT), style=wx.SIMPLE_BORDER)
+    inputdt.SetHint("YYYY-MM-DD HH:MM:SS")
+    nowtime = wx.Button(
+        panel,
+        label="CURRENT LOCAL",
+        pos=(RIGHT_BUTTON_X, 106),
+        size=(BUTTON_WIDTH, BUTTON_HEIGHT),
+        style=wx.BORDER_RAISED,
+    )
+
+    # --- Timezone selectors ---------------------------------------------------
+    show4 = wx.StaticText(panel, label="Select Source and Target", pos=(LEFT_MARGIN, 190))
+    fromtz = ZonePicker(panel, pos=(LEFT_MARGIN, 228), size=(CONTROL_WIDTH, 36), style=wx.CB_DROPDOWN | wx.BORDER_SUNKEN)
+    totz = ZonePicker(panel, pos=(LEFT_MARGIN, 278), size=(CONTROL_WIDTH, 36), style=wx.CB_DROPDOWN | wx.BORDER_SUNKEN)
+
+    convert = wx.Button(
+        panel,
+        label="CONVERT TIME",
+        pos=(RIGHT_BUTTON_X, 276),
+        size=(BUTTON_WIDTH, BUTTON_HEIGHT),
+        style=wx.BORDER_RAISED,
+    )
+    world_btn = wx.Button(
+        panel,
+        label="WORLD CLOCK",
+        pos=(RIGHT_BUTTON_X, 226),
+        size=(BUTTON_WIDTH, BUTTON_HEIGHT),
+        style=wx.BORDER_RAISED,
+    )
+    reset_btn = wx.Button(
+        panel,
+        label="RESET",
+        pos=(FRAME_WIDTH - RIGHT_MARGIN - BUTTON_WIDTH, FRAME_HEIGHT - BOTTOM_MARGIN - BUTTON_HEIGHT),
+        size=(BUTTON_WIDTH, BUTTON_HEIGHT),
+        style=wx.BORDER_RAISED,
+    )
+    show5 = wx.StaticText(panel, label="RESULT ↓", pos=(LEFT_MARGIN, 352), style=wx.SIMPLE_BORDER)
+    output = wx.StaticText(panel, label="", pos=(LEFT_MARGIN, 390), size=(DISPLAY_WIDTH, 0), style=wx.SIMPLE_BORDER)
+
+    # --- Weather lookup UI ----------------------------------------------------
+    show_weather = wx.StaticText(panel, label="WEATHER", pos=(LEFT_MARGIN, 476))
+    weather_btn = wx.Button(
+        panel,
+        label="GET WEATHER",
+        pos=(RIGHT_BUTTON_X, 466),
+        size=(BUTTON_WIDTH, BUTTON_HEIGHT),
+        style=wx.BORDER_RAISED,
+    )
+    weather_output = wx.StaticText(panel, label="", pos=(LEFT_MARGIN, 516), size=(DISPLAY_WIDTH, 0), style=wx.SIMPLE_BORDER)
+
+    # --- Debug overlay (F12) --------------------------------------------------
+    debug_overlay = wx.StaticText(panel, label="", pos=(FRAME_WIDTH - RIGHT_MARGIN - 360, 20), style=wx.SIMPLE_BORDER)
+    debug_overlay.SetFont(wx.Font(9, wx.FONTFAMILY_TELETYPE, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL))
+    debug_overlay.SetBackgroundColour(wx.Colour(255, 255, 255))
+    debug_overlay.Hide()
+    overlay_id = wx.NewIdRef()
+    frame.Bind(wx.EVT_MENU, toggle_debug_overlay, id=overlay_id)
+    frame.SetAcceleratorTable(wx.AcceleratorTable([(wx.ACCEL_NORMAL, wx.WXK_F12, overlay_id)]))
+
+    # --- Event bindings -------------------------------------------------------
+    inputdt.Bind(wx.EVT_TEXT, simple_frame)
+    fromtz.Bind(EVT_ZONE_CHANGED, simple_frame)  # Typed or picked: fires whenever the resolved zone changes.
+    totz.Bind(EVT_ZONE_CHANGED, on_target_tz_changed)
+    convert.Bind(wx.EVT_BUTTON, on_convert)
+    reset_btn.Bind(wx.EVT_BUTTON, on_reset)
+    nowtime.Bind(wx.EVT_BUTTON, on_now)
+    weather_btn.Bind(wx.EVT_BUTTON, on_weather)
+    world_btn.Bind(wx.EVT_BUTTON, on_world_clock)
+
+    # Widgets participating in theme swaps
+    text_widgets = [  # Static labels + outputs that pivot between light/dark palettes.
+        show1,
+        show4,
+        show5,
+        output,
+        show_weather,
+        weather_output,
+    ]
+    input_widgets = [  # Controls that accept user input (and need matching fonts/palettes).
+        inputdt,
+        fromtz,
+        totz,
+    ]
+    button_widgets = [  # Action buttons that also flip colours together.
+        convert,
+        reset_btn,
+        nowtime,
+        weather_btn,
+        world_btn,
+    ]
+
+    for widget in text_widgets:
+        apply_font(widget, size=12, weight=wx.FONTWEIGHT_MEDIUM)  # Keep labels readable while staying on-theme.
+
+    for widget in input_widgets:
+        apply_font(widget, size=11)  # Keep inputs compact but on-theme.
+
+    for widget in button_widgets:
+        apply_font(widget, size=11, weight=wx.FONTWEIGHT_BOLD)  # Bold buttons for emphasis.
+
+    apply_font(output, size=13, weight=wx.FONTWEIGHT_MEDIUM)  # Highlight the main conversion result.
+    apply_font(weather_output, size=12)  # Weather summary uses slightly larger text.
+
+    return frame
+
+
+def main():
+    """Start the desktop app: build the window, show it, then enter the wx event loop."""
+    app = wx.App(False)
+    build_ui()
+    frame.Show()  # Display the fully configured window.
+
+    # Force initial background + text colours so buttons are visible
+    set_time_bucket_from_time(datetime.now().time())  # Kick off theme logic using the current local time bucket.
+    wx.CallAfter(populate_timezones)  # Zone index builds right after the first paint.
+    wx.CallAfter(report_startup)  # Runs once the loop is up, i.e. after the window appeared.
+    background_cache.warm_up(BACKGROUND_IMAGES.values(), size=tuple(panel.GetClientSize()))  # Pre-decode the rest off-thread.
+
+    app.MainLoop()  # Enter the wxPython event loop.
+    report_prefetch()
+    report_metrics()
+    weather_executor.shutdown(wait=False, cancel_futures=True)  # Don't keep queued lookups alive after close.
+
+
+if __name__ == "__main__":
+    main()
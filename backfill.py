@@ -0,0 +1,316 @@
+"""Resumable bulk backfill of hourly weather into a local SQLite store.
+
+Plans ``(zone, date range)`` work units, fetches them concurrently through
+``weather_api`` under one global rate limit, and commits each unit's rows
+together with its "done" mark, so an interrupted run resumes exactly where it
+stopped. Units that share a date range are fetched in one multi-coordinate
+request. Results land in a ``(zone, time)``-keyed table that later queries
+read locally. Units reaching today or later hold forecast data, so they are
+kept ``provisional`` and fetched again once their last day is in the past::
+
+    python backfill.py --zones Asia/Tokyo Europe/London --start 2020-01-01 --end 2023-12-31
+    python backfill.py --status
+"""
+
+import argparse  # Command line.
+import os  # Default store location.
+import sqlite3  # Local store + checkpoints.
+import sys  # Exit status / progress output.
+import time  # Progress rate + timestamps.
+from concurrent.futures import ThreadPoolExecutor, as_completed  # Concurrent unit fetches.
+from datetime import date, datetime, timedelta  # Planning date ranges.
+
+import weather_api  # Geocoding, multi-location range fetch, classification.
+from http_client import RateLimiter  # Global token bucket shared by every worker.
+from weather_cache import user_cache_dir  # Default store lives next to the geocode cache.
+
+DEFAULT_UNIT_DAYS = 31  # Days per work unit (and per request).
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 5.0  # Requests per second across all workers.
+MAX_ATTEMPTS = 3  # Failed units are retried on later runs up to this many times.
+
+# Store column -> Open-Meteo hourly variable.
+_VARIABLES = {
+    "temperature": "temperature_2m",
+    "humidity": "relative_humidity_2m",
+    "precipitation": "precipitation",
+    "weathercode": "weathercode",
+    "cloudcover": "cloudcover",
+}
+
+
+def default_store_path():
+    return os.path.join(user_cache_dir(), "backfill.sqlite3")
+
+
+class BackfillStore:
+    """SQLite file holding the planned units (checkpoints) and the fetched hourly rows."""
+
+    def __init__(self, path=None):
+        self.path = path or default_store_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode=WAL")  # Readers keep working while a backfill writes.
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS weather ("
+            " zone TEXT NOT NULL,"
+            " time TEXT NOT NULL,"  # Local wall time in the zone, Open-Meteo ISO format.
+            " temperature REAL, humidity REAL, precipitation REAL, weathercode INTEGER, cloudcover REAL,"
+            " condition TEXT,"
+            " PRIMARY KEY (zone, time)) WITHOUT ROWID;"
+            "CREATE TABLE IF NOT EXISTS units ("
+            " zone TEXT NOT NULL,"
+            " start TEXT NOT NULL,"
+            " end TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending',"  # pending | done | provisional | failed
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " error TEXT,"
+            " updated_at REAL,"
+            " refresh_after REAL,"  # provisional units: re-fetch from the archive after this time
+            " PRIMARY KEY (zone, start));"
+            "CREATE INDEX IF NOT EXISTS units_status ON units (status);"
+        )
+        self.db.commit()
+
+    # --- Planning / checkpoints -------------------------------------------
+    def plan(self, zones, start, end, unit_days=DEFAULT_UNIT_DAYS):
+        """Record units covering ``start..end`` for each zone (existing units are kept); returns how many are new."""
+        before = self.db.total_changes
+        rows = [(zone, s.isoformat(), e.isoformat()) for zone in zones for s, e in plan_ranges(start, end, unit_days)]
+        with self.db:
+            self.db.executemany("INSERT OR IGNORE INTO units (zone, start, end) VALUES (?, ?, ?)", rows)
+        return self.db.total_changes - before
+
+    def pending(self, max_attempts=MAX_ATTEMPTS, now=None):
+        """Units still to do: never fetched, failed fewer than ``max_attempts`` times, or provisional and due."""
+        return self.db.execute(
+            "SELECT zone, start, end FROM units"
+            " WHERE status = 'pending' OR (status = 'failed' AND attempts < ?)"
+            " OR (status = 'provisional' AND refresh_after <= ?)"
+            " ORDER BY start, zone",
+            (max_attempts, time.time() if now is None else now),
+        ).fetchall()
+
+    def complete(self, units, rows):
+        """Store ``rows`` and checkpoint ``units`` in one transaction.
+
+        Units whose range is entirely in the past are ``done`` for good; the rest
+        hold forecast rows and become ``provisional`` until the day after their
+        last date, when the next run replaces them with archive data. Success
+        resets ``attempts``, so only consecutive failures count towards
+        ``max_attempts``.
+        """
+        now = time.time()
+        today = date.today()
+        marks = []
+        for zone, start, end in units:
+            last = date.fromisoformat(end)
+            if last < today:
+                marks.append(("done", None, now, zone, start))
+            else:
+                refresh = datetime.combine(last + timedelta(days=1), datetime.min.time()).timestamp()
+                marks.append(("provisional", refresh, now, zone, start))
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO weather VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.db.executemany(
+                "UPDATE units SET status = ?, refresh_after = ?, attempts = 0, error = NULL,"
+                " updated_at = ? WHERE zone = ? AND start = ?",
+                marks,
+            )
+
+    def fail(self, units, error):
+        with self.db:
+            self.db.executemany(
+                "UPDATE units SET status = 'failed', attempts = attempts + 1, error = ?, updated_at = ?"
+                " WHERE zone = ? AND start = ?",
+                [(str(error), time.time(), zone, start) for zone, start, _ in units],
+            )
+
+    def status(self):
+        """Unit counts by status plus the number of stored hourly rows."""
+        counts = dict(self.db.execute("SELECT status, COUNT(*) FROM units GROUP BY status").fetchall())
+        counts["rows"] = self.db.execute("SELECT COUNT(*) FROM weather").fetchone()[0]
+        return counts
+
+    # --- Local queries ------------------------------------------------------
+    def lookup(self, zone, dt_str):
+        """Stored hour for ``zone`` at ``dt_str`` (``YYYY-MM-DD HH:MM:SS``, minutes ignored), or ``None``."""
+        dt = datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S").replace(minute=0, second=0)
+        row = self.db.execute(
+            "SELECT * FROM weather WHERE zone = ? AND time = ?", (zone, dt.strftime("%Y-%m-%dT%H:%M"))
+        ).fetchone()
+        return None if row is None else dict(zip(_COLUMNS, row))
+
+    def query(self, zone, start, end):
+        """Stored rows for ``zone`` between two local times/dates (inclusive), oldest first."""
+        lo = _as_iso(start, end=False)
+        hi = _as_iso(end, end=True)
+        rows = self.db.execute(
+            "SELECT * FROM weather WHERE zone = ? AND time BETWEEN ? AND ? ORDER BY time", (zone, lo, hi)
+        ).fetchall()
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def close(self):
+        self.db.close()
+
+
+_COLUMNS = ("zone", "time", "temperature", "humidity", "precipitation", "weathercode", "cloudcover", "condition")
+
+
+def _as_iso(value, end):
+    if isinstance(value, str) and len(value) == 10:
+        value = date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%dT%H:%M")
+    if isinstance(value, date):
+        return value.isoformat() + ("T23:59" if end else "T00:00")
+    return str(value).replace(" ", "T")[:16]
+
+
+def plan_ranges(start, end, unit_days=DEFAULT_UNIT_DAYS):
+    """Split ``start..end`` into ranges of at most ``unit_days`` that never straddle archive/forecast."""
+    start = date.fromisoformat(start) if isinstance(start, str) else start
+    end = date.fromisoformat(end) if isinstance(end, str) else end
+    if end < start:
+        raise ValueError("Backfill end date must not be before the start date.")
+    today = date.today()
+    ranges = []
+    day = start
+    while day <= end:
+        limit = end if day >= today else min(end, today - timedelta(days=1))
+        last = min(limit, day + timedelta(days=unit_days - 1))
+        ranges.append((day, last))
+        day = last + timedelta(days=1)
+    return ranges
+
+
+def _rows_for(zone, hourly):
+    """Flatten one location's hourly block into store rows (conditions classified in bulk)."""
+    times = hourly.get("time", [])
+    columns = [hourly.get(var, [None] * len(times)) for var in _VARIABLES.values()]
+    codes, precs, clouds = columns[3], columns[2], columns[4]
+    labels = weather_api.classify_conditions(codes, precs, clouds)
+    labels = labels.tolist() if hasattr(labels, "tolist") else labels
+    return [(zone, t, *values, label) for t, *values, label in zip(times, *columns, labels)]
+
+
+class Backfill:
+    """Run the pending units of a ``BackfillStore`` concurrently under a global rate limit."""
+
+    def __init__(self, store, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, max_attempts=MAX_ATTEMPTS, progress=None):
+        self.store = store
+        self.workers = workers
+        self.limiter = RateLimiter(rate)  # One bucket for the whole job, whatever the host.
+        self.max_attempts = max_attempts
+        self.progress = progress  # Callable(done_units, total_units, rows) or None.
+
+    def _batches(self, units):
+        """Group units sharing a date range into multi-coordinate requests."""
+        by_range = {}
+        for zone, start, end in units:
+            by_range.setdefault((start, end), []).append((zone, start, end))
+        for (start, end), group in by_range.items():
+            for i in range(0, len(group), weather_api.MAX_COORDINATES_PER_REQUEST):
+                yield start, end, group[i:i + weather_api.MAX_COORDINATES_PER_REQUEST]
+
+    def _fetch(self, start, end, batch, locations):
+        self.limiter.acquire("backfill")
+        coords = [(locations[zone][0], locations[zone][1], zone) for zone, _, _ in batch]
+        # A provisional unit refreshed after today moved on may now straddle archive/forecast; this splits it.
+        blocks = weather_api.get_hourly_for_locations(coords, start, end)
+        rows = []
+        for (zone, _, _), hourly in zip(batch, blocks):
+            rows.extend(_rows_for(zone, hourly))
+        return rows
+
+    def run(self):
+        """Fetch every pending unit; returns ``{"units", "failed", "rows", "seconds"}``."""
+        units = self.store.pending(self.max_attempts)
+        started = time.perf_counter()
+        summary = {"units": 0, "failed": 0, "rows": 0, "seconds": 0.0}
+        if not units:
+            return summary
+
+        # Geocode each zone once (offline table for nearly all zones, geocode_cache for the rest).
+        locations = {}
+        for zone in sorted({u[0] for u in units}):
+            try:
+                locations[zone] = weather_api.get_location_from_timezone(zone)
+            except Exception as e:
+                unresolved = [u for u in units if u[0] == zone]
+                self.store.fail(unresolved, e)
+                summary["failed"] += len(unresolved)
+        units = [u for u in units if u[0] in locations]
+        total = len(units)
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backfill") as pool:
+            futures = {
+                pool.submit(self._fetch, start, end, batch, locations): batch
+                for start, end, batch in self._batches(units)
+            }
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    self.store.fail(batch, e)  # Retried on the next run (up to max_attempts).
+                    summary["failed"] += len(batch)
+                    continue
+                self.store.complete(batch, rows)  # Only the main thread writes to SQLite.
+                summary["units"] += len(batch)
+                summary["rows"] += len(rows)
+                if self.progress:
+                    self.progress(summary["units"] + summary["failed"], total, summary["rows"])
+
+        summary["seconds"] = time.perf_counter() - started
+        return summary
+
+
+def _print_progress(done, total, rows):
+    print(f"\r{done}/{total} units, {rows} rows", end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill historical hourly weather into a local SQLite store.")
+    parser.add_argument("--zones", nargs="*", default=[], help="IANA zones to backfill.")
+    parser.add_argument("--zones-file", help="File with one zone per line.")
+    parser.add_argument("--start", help="First local date (YYYY-MM-DD).")
+    parser.add_argument("--end", help="Last local date (YYYY-MM-DD).")
+    parser.add_argument("--db", default=None, help="SQLite store path (default: user cache dir).")
+    parser.add_argument("--unit-days", type=int, default=DEFAULT_UNIT_DAYS)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Requests per second across all workers.")
+    parser.add_argument("--status", action="store_true", help="Only print progress of the store.")
+    args = parser.parse_args(argv)
+
+    store = BackfillStore(args.db)
+    try:
+        zones = list(args.zones)
+        if args.zones_file:
+            with open(args.zones_file, encoding="utf-8") as fh:
+                zones += [line.strip() for line in fh if line.strip() and not line.startswith("#")]
+
+        if not args.status:
+            if zones:
+                if not (args.start and args.end):
+                    parser.error("--start and --end are required when planning zones")
+                added = store.plan(zones, args.start, args.end, args.unit_days)
+                print(f"Planned {added} new unit(s).", file=sys.stderr)
+            summary = Backfill(store, args.workers, args.rate, progress=_print_progress).run()
+            if summary["units"] or summary["failed"]:
+                print(file=sys.stderr)
+            rate = summary["rows"] / summary["seconds"] if summary["seconds"] else 0.0
+            print(
+                f"Fetched {summary['units']} unit(s), {summary['rows']} rows in {summary['seconds']:.1f}s "
+                f"({rate:,.0f} rows/s); {summary['failed']} failed.",
+                file=sys.stderr,
+            )
+        print(store.status())
+        return 0
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Benchmark suite for the converter, weather helpers and background art (``python -m benchmarks``)."""
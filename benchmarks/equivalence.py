@@ -0,0 +1,106 @@
+"""Check that the fast conversion paths give the same output as the original pytz converter.
+
+``tz_engine`` (and ``time_zone_converter`` on top of it) must produce the same
+strings, and raise the same errors, as plain ``localize``/``astimezone``/
+``strftime`` for every format. That includes formats the seconds-based codec
+hands back to pytz (``%f``, ``%z``, ``%Z``)::
+
+    python -m benchmarks.equivalence            # exits 1 on any mismatch
+"""
+
+import random  # Sub-second parts for %f inputs.
+import sys  # Exit status.
+from datetime import datetime, timedelta
+
+import pytz
+
+import tz_engine
+from tzpy_core import time_zone_converter
+
+ZONE_PAIRS = (
+    ("US/Eastern", "Asia/Tokyo"),
+    ("Europe/London", "America/Los_Angeles"),
+    ("Australia/Sydney", "Europe/Berlin"),
+    ("Asia/Kolkata", "America/St_Johns"),
+    ("UTC", "Pacific/Chatham"),
+)
+
+FORMATS = (
+    tz_engine.DEFAULT_FORMAT,
+    "%d/%m/%Y %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%d %H:%M %Z",
+    "%Y-%m-%d %H:%M:%S%z",  # Aware input: both paths must reject it the same way.
+    "%a %d %b %Y %I:%M %p",
+)
+
+
+def reference(time_str, from_tz, to_tz, time_format):
+    """The converter as originally written in ``Tzpy.py``."""
+    naive = datetime.strptime(time_str, time_format)
+    localized = pytz.timezone(from_tz).localize(naive)
+    return localized.astimezone(pytz.timezone(to_tz)).strftime(time_format)
+
+
+class _Raised(tuple):
+    """Marks an outcome that was an exception (compared by type: messages may legitimately differ)."""
+
+
+def _outcome(fn, *args):
+    try:
+        return fn(*args)
+    except Exception as e:
+        return _Raised((type(e).__name__,))
+
+
+def sample_times(seed=7):
+    """Wall times across three years plus half-hour sweeps over the common DST switch dates."""
+    rng = random.Random(seed)
+    times = []
+    t = datetime(2023, 1, 1)
+    while t < datetime(2026, 1, 1):
+        times.append(t.replace(microsecond=rng.randrange(1_000_000)))
+        t += timedelta(hours=7, minutes=37)
+    for day in ("2024-03-10", "2024-03-31", "2024-04-07", "2024-10-06", "2024-10-27", "2024-11-03"):
+        start = datetime.fromisoformat(day)
+        times.extend(start + timedelta(minutes=30 * k) for k in range(48))
+    return times
+
+
+def run_checks(verbose=True):
+    """Compare scalar and bulk conversion with ``reference``; returns the list of mismatches."""
+    mismatches = []
+    times = sample_times()
+    for time_format in FORMATS:
+        # Render inputs as UTC-aware values so %Z/%z have something to print ("UTC", "+0000").
+        inputs = [t.replace(tzinfo=pytz.utc).strftime(time_format) for t in times]
+        for from_tz, to_tz in ZONE_PAIRS:
+            expected = [_outcome(reference, text, from_tz, to_tz, time_format) for text in inputs]
+            scalar = [_outcome(time_zone_converter, text, from_tz, to_tz, time_format) for text in inputs]
+            for text, want, got in zip(inputs, expected, scalar):
+                if got != want:
+                    mismatches.append((time_format, from_tz, to_tz, text, want, got))
+
+            bulk = _outcome(tz_engine.convert_many, inputs, from_tz, to_tz, time_format)
+            errors = {e for e in expected if isinstance(e, _Raised)}
+            if isinstance(bulk, list):
+                if bulk != expected:
+                    mismatches.append((time_format, from_tz, to_tz, "convert_many", "reference output", "different list"))
+            elif bulk not in errors:  # A batch may only fail with an error the reference raised for some row.
+                mismatches.append((time_format, from_tz, to_tz, "convert_many", sorted(errors), bulk[0]))
+        if verbose:
+            print(f"{time_format!r:28} {len(inputs) * len(ZONE_PAIRS):>7,} conversions checked")
+    return mismatches
+
+
+def main():
+    mismatches = run_checks()
+    for time_format, from_tz, to_tz, text, want, got in mismatches[:20]:
+        print(f"MISMATCH {time_format!r} {from_tz} -> {to_tz}: {text!r}: expected {want!r}, got {got!r}")
+    print(f"{len(mismatches)} mismatch(es)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,395 @@
+"""Run the benchmark suite, write JSON results, and flag regressions against a baseline.
+
+Usage (from the repository root)::
+
+    python -m benchmarks                          # run everything, print a table
+    python -m benchmarks --output results.json    # also save the raw numbers
+    python -m benchmarks --save-baseline          # store this run as benchmarks/baseline.json
+    python -m benchmarks --latency 0.05 --only weather
+
+Network benchmarks talk to the local ``StubServer`` only; nothing leaves the machine.
+The exit status is 1 when any benchmark is slower than its baseline by more than ``--threshold``.
+"""
+
+import argparse  # Command line.
+import json  # Result and baseline files.
+import os  # Temp cache dir / paths.
+import platform  # Result metadata.
+import statistics  # Median / min across rounds.
+import sys  # Exit status.
+import tempfile  # Isolated cache directory for the run.
+import time  # perf_counter timing.
+from datetime import datetime, timedelta, timezone
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.20  # Flag anything more than 20% slower than the baseline.
+
+BENCHMARKS = []  # (name, group, rounds, setup) in registration order.
+
+
+def benchmark(name, group, rounds=7):
+    """Register ``setup(ctx) -> (callable, items)``; the callable processes ``items`` items per call.
+
+    A setup may raise ``Skip`` when an optional dependency or asset is missing.
+    """
+
+    def register(setup):
+        BENCHMARKS.append((name, group, rounds, setup))
+        return setup
+
+    return register
+
+
+class Skip(Exception):
+    """Raised by a benchmark setup that cannot run in this environment."""
+
+
+def measure(fn, items, rounds, min_time=0.05):
+    """Time ``fn`` for ``rounds`` rounds (each at least ``min_time`` s) and return per-item stats."""
+    fn()  # Warm-up: imports, plan/LRU caches, first connection.
+    calls = 1
+    while True:  # Calibrate calls per round so short operations are not lost in timer noise.
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or calls >= 1_000_000:
+            break
+        calls *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    samples = [elapsed / (calls * items)]
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        samples.append((time.perf_counter() - start) / (calls * items))
+    median = statistics.median(samples)
+    return {
+        "per_item_us": median * 1e6,
+        "min_us": min(samples) * 1e6,
+        "items_per_sec": 1.0 / median if median else None,
+        "items": items,
+        "calls_per_round": calls,
+        "rounds": rounds,
+    }
+
+
+# --- Timezone conversion ---------------------------------------------------
+
+def _timestamps(count, start=datetime(2024, 1, 1), step=timedelta(minutes=37)):
+    return [(start + step * i).strftime("%Y-%m-%d %H:%M:%S") for i in range(count)]
+
+
+@benchmark("tz.convert_scalar", "tz")
+def _tz_scalar(ctx):
+    from tzpy_core import time_zone_converter
+
+    values = _timestamps(1000)
+
+    def run():
+        for value in values:
+            time_zone_converter(value, "America/New_York", "Asia/Tokyo")
+
+    return run, len(values)
+
+
+@benchmark("tz.convert_bulk", "tz")
+def _tz_bulk(ctx):
+    import tz_engine
+
+    values = _timestamps(50_000)
+    if tz_engine.np is not None:  # Exercise the vectorised path the way bulk callers use it.
+        values = tz_engine.np.array([v.replace(" ", "T") for v in values], dtype="datetime64[s]")
+
+    def run():
+        tz_engine.convert_many(values, "America/New_York", "Asia/Tokyo")
+
+    return run, len(values)
+
+
+# --- Condition classification ----------------------------------------------
+
+def _hours(count):
+    recorded = _fixture_day()["hourly"]
+    reps = count // len(recorded["time"]) + 1
+    return tuple(recorded[k] * reps for k in ("weathercode", "precipitation", "cloudcover"))
+
+
+def _fixture_day():
+    from benchmarks.stub_server import load_fixture
+
+    return load_fixture("hourly_day.json")
+
+
+@benchmark("weather.classify_scalar", "classify")
+def _classify_scalar(ctx):
+    import weather_api as wa
+
+    codes, precs, clouds = _hours(24 * 365)
+
+    def run():
+        for code, prec, cloud in zip(codes, precs, clouds):
+            wa.classify_condition(code, prec, cloud)
+
+    return run, len(codes)
+
+
+@benchmark("weather.classify_vector", "classify")
+def _classify_vector(ctx):
+    import weather_api as wa
+
+    codes, precs, clouds = _hours(24 * 365)
+    if wa.np is not None:
+        codes, precs, clouds = (wa.np.asarray(c) for c in (codes, precs, clouds))
+
+    def run():
+        wa.classify_conditions(codes, precs, clouds)
+
+    return run, len(codes)
+
+
+# --- Hourly row lookup / weather -------------------------------------------
+
+@benchmark("weather.hour_lookup", "weather")
+def _hour_lookup(ctx):
+    import weather_api as wa
+
+    times = _fixture_day()["hourly"]["time"]
+    base = datetime.fromisoformat(times[0])
+    wanted = [base + timedelta(hours=h) for h in range(len(times))]
+
+    def run():
+        for dt in wanted:
+            wa._hour_index(times, dt)
+
+    return run, len(wanted)
+
+
+@benchmark("weather.for_datetime_warm", "weather")
+def _weather_warm(ctx):
+    import weather_api as wa
+
+    ctx.connect()
+    dt_str = "2024-01-15 13:00:00"
+
+    def run():
+        wa.get_weather_for_datetime(dt_str, "Asia/Tokyo")  # Day cache + zone table hits.
+
+    return run, 1
+
+
+@benchmark("weather.for_datetime_cold", "weather", rounds=3)
+def _weather_cold(ctx):
+    import weather_api as wa
+
+    ctx.connect()
+    dt_str = "2024-01-15 13:00:00"
+
+    def run():
+        wa.configure_day_cache()  # Fresh cache: every call is a full round trip to the stub.
+        wa.get_weather_for_datetime(dt_str, "Asia/Tokyo")
+
+    return run, 1
+
+
+@benchmark("weather.for_datetime_minimal", "weather", rounds=3)
+def _weather_minimal(ctx):
+    import weather_api as wa
+
+    ctx.connect()
+    dt_str = "2024-01-15 13:00:00"
+
+    def run():
+        wa.configure_day_cache()  # Cold like the full-day case, but one hour and two fields on the wire.
+        wa.configure_hour_cache()
+        wa.get_weather_for_datetime(dt_str, "Asia/Tokyo", fields=("temperature", "condition"), minimal=True)
+
+    return run, 1
+
+
+# --- Geocoding ---------------------------------------------------------------
+
+@benchmark("geocode.zone_table", "geocode")
+def _geocode_table(ctx):
+    import weather_api as wa
+
+    zones = ["Asia/Tokyo", "America/New_York", "Europe/London", "Asia/Kolkata", "Australia/Sydney"]
+
+    def run():
+        for zone in zones:
+            wa.get_location_from_timezone(zone)
+
+    return run, len(zones)
+
+
+@benchmark("geocode.network_cold", "geocode", rounds=3)
+def _geocode_network(ctx):
+    import weather_api as wa
+
+    ctx.connect()
+
+    def run():
+        wa.geocode_cache.clear()  # Force the geocoder round trip (zone not in the offline table).
+        wa.get_location_from_timezone("Etc/Greenwich")
+
+    return run, 1
+
+
+# --- Background art ----------------------------------------------------------
+
+@benchmark("background.load_and_scale", "background", rounds=3)
+def _background_cold(ctx):
+    cache, path = ctx.bitmap_cache()
+
+    def run():
+        cache.clear()  # Decode from disk + high-quality resample.
+        cache.get(path, 1280, 800)
+
+    return run, 1
+
+
+@benchmark("background.cached", "background")
+def _background_warm(ctx):
+    cache, path = ctx.bitmap_cache()
+
+    def run():
+        cache.get(path, 1280, 800)  # Theme swap back to a known size: pointer lookup.
+
+    return run, 1
+
+
+# --- Runner ------------------------------------------------------------------
+
+class Context:
+    """Shared, lazily started resources for the benchmarks (stub server, wx app)."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.stub = None
+        self._app = None
+        self._image = None
+
+    def connect(self):
+        """Start the stub server and route weather_api through it."""
+        if self.stub is None:
+            import weather_api as wa
+            from benchmarks.stub_server import StubServer
+
+            self.stub = StubServer(latency=self.latency).start()
+            wa.configure_client(base_url_overrides=self.stub.overrides(), rate_per_host=0)
+            wa.configure_geocode_cache(persistent=False)
+
+    def bitmap_cache(self):
+        try:
+            import wx
+        except ImportError:
+            raise Skip("wxPython is not installed")
+        from bitmap_cache import BitmapCache
+        from tzpy_core import BACKGROUND_IMAGES
+
+        if self._app is None:
+            self._app = wx.App(False)
+        if self._image is None:
+            self._image = next((p for p in BACKGROUND_IMAGES.values() if os.path.exists(p)), None)
+            if self._image is None:  # No art checked out: use a synthetic full-HD PNG.
+                self._image = os.path.join(tempfile.mkdtemp(), "synthetic.png")
+                wx.Image(1920, 1080).SaveFile(self._image, wx.BITMAP_TYPE_PNG)
+        return BitmapCache(), self._image
+
+    def close(self):
+        if self.stub is not None:
+            self.stub.stop()
+
+
+def compare(results, baseline, threshold):
+    """Annotate ``results`` with the baseline ratio; return the names that regressed."""
+    regressions = []
+    for name, entry in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "per_item_us" not in entry or not base.get("per_item_us"):
+            continue
+        ratio = entry["per_item_us"] / base["per_item_us"]
+        entry["baseline_ratio"] = ratio
+        if ratio > 1 + threshold:
+            entry["regression"] = True
+            regressions.append(name)
+    return regressions
+
+
+def _format_row(name, entry):
+    if "skipped" in entry:
+        return f"{name:<30} skipped: {entry['skipped']}"
+    line = f"{name:<30} {entry['per_item_us']:>12.3f} us/item  {entry['items_per_sec']:>14,.0f} items/s"
+    if "baseline_ratio" in entry:
+        line += f"  x{entry['baseline_ratio']:.2f} vs baseline" + ("  REGRESSION" if entry.get("regression") else "")
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the timezone converter and weather helpers.")
+    parser.add_argument("--only", action="append", default=[], help="Run benchmarks whose name contains this text.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub server latency per request, in seconds.")
+    parser.add_argument("--output", help="Write the JSON results to this file.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (0.2 = 20%%).")
+    parser.add_argument("--quick", action="store_true", help="Fewer rounds, for a fast smoke run.")
+    args = parser.parse_args(argv)
+
+    # Keep the user's real geocode cache untouched.
+    os.environ.setdefault("PYTHONJACKFRUIT_CACHE_DIR", tempfile.mkdtemp(prefix="jackfruit-bench-"))
+
+    ctx = Context(latency=args.latency)
+    results = {}
+    try:
+        for name, group, rounds, setup in BENCHMARKS:
+            if args.only and not any(term in name for term in args.only):
+                continue
+            try:
+                fn, items = setup(ctx)
+                results[name] = measure(fn, items, 3 if args.quick else rounds)
+            except Skip as e:
+                results[name] = {"skipped": str(e)}
+            results[name]["group"] = group
+    finally:
+        ctx.close()
+
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": numpy_version,
+            "stub_latency": args.latency,
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as fh:
+            regressions = compare(results, json.load(fh), args.threshold)
+    report["regressions"] = regressions
+
+    for name, entry in results.items():
+        print(_format_row(name, entry))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
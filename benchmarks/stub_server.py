@@ -0,0 +1,192 @@
+"""Local Open-Meteo stand-in that replays recorded responses with configurable latency.
+
+Serves ``/v1/search`` (geocoding), ``/v1/forecast`` and ``/v1/archive`` from
+the JSON fixtures next to this file. Hourly endpoints replay the recorded day
+for every requested date and coordinate, so ranges, ``start_hour``/``end_hour``
+windows and multi-coordinate batches get correctly shaped answers. Bodies are
+gzipped when the client accepts it, like the real API. Point ``weather_api``
+at it with::
+
+    with StubServer(latency=0.05) as stub:
+        weather_api.configure_client(base_url_overrides=stub.overrides(), rate_per_host=0)
+"""
+
+import copy  # Fixture payloads are templates; every answer gets its own copy.
+import gzip  # Content-Encoding negotiation.
+import json  # Fixture loading + response bodies.
+import os  # Fixture paths.
+import random  # Latency jitter.
+import threading  # Server runs on a background thread.
+import time  # Injected latency.
+from datetime import date, timedelta  # Replaying the recorded day across a range.
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Real hosts the stub replaces (see weather_api.GEOCODING_URL / FORECAST_URL / ARCHIVE_URL).
+OPEN_METEO_HOSTS = (
+    "https://geocoding-api.open-meteo.com",
+    "https://api.open-meteo.com",
+    "https://archive-api.open-meteo.com",
+)
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API behind the pooled client.
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes; don't stall on delayed ACKs.
+
+    def log_message(self, fmt, *args):  # Silence per-request logging during benchmarks.
+        pass
+
+    def do_GET(self):
+        stub = self.server.stub
+        parts = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        stub.requests += 1
+        self._gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        stub.sleep()
+
+        if parts.path == "/v1/search":
+            body = stub.geocode(query.get("name", ""))
+        elif parts.path in ("/v1/forecast", "/v1/archive"):
+            try:
+                body = stub.hourly(query)
+            except (KeyError, ValueError) as e:
+                return self._send(400, {"error": True, "reason": f"Invalid request: {e}"})
+        else:
+            return self._send(404, {"error": True, "reason": "Not found"})
+        self._send(200, body)
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.server.stub.bytes_raw += len(data)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if self._gzip:
+            data = gzip.compress(data, compresslevel=6)
+            self.send_header("Content-Encoding", "gzip")
+        self.server.stub.bytes_sent += len(data)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubServer:
+    """Threaded HTTP server on localhost serving recorded Open-Meteo answers.
+
+    ``latency`` (seconds) is added to every request, plus up to ``jitter``
+    seconds of random extra delay, to mimic a real round trip.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0  # Requests served, for "how many round trips did that take" checks.
+        self.bytes_raw = 0  # Response JSON bytes before compression.
+        self.bytes_sent = 0  # Response body bytes on the wire.
+        self._geocoding = load_fixture("geocoding.json")
+        self._day = load_fixture("hourly_day.json")
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def overrides(self):
+        """``base_url_overrides`` mapping for ``HttpClient`` / ``weather_api.configure_client``."""
+        return {host: self.url for host in OPEN_METEO_HOSTS}
+
+    def sleep(self):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    # --- Responses -------------------------------------------------------
+    def geocode(self, name):
+        """Recorded answer for ``name``; unknown cities get the first record renamed."""
+        if name in self._geocoding:
+            return self._geocoding[name]
+        template = next(iter(self._geocoding.values()))
+        body = copy.deepcopy(template)
+        body["results"][0]["name"] = name
+        return body
+
+    def hourly(self, query):
+        """Replay the recorded day for each date and coordinate in the request."""
+        first_hour, last_hour = query.get("start_hour"), query.get("end_hour")
+        if first_hour or last_hour:  # Hour window (inclusive) instead of whole days.
+            start, end = date.fromisoformat(first_hour[:10]), date.fromisoformat(last_hour[:10])
+        else:
+            start = date.fromisoformat(query["start_date"])
+            end = date.fromisoformat(query["end_date"])
+        if end < start:
+            raise ValueError("end is before start")
+        days = [(start + timedelta(days=n)).isoformat() for n in range((end - start).days + 1)]
+        variables = query.get("hourly", "").split(",")
+        recorded = self._day["hourly"]
+        clock = [t[10:] for t in recorded["time"]]  # "THH:MM" suffixes.
+
+        times = [day + hh for day in days for hh in clock]
+        keep = slice(None)
+        if first_hour:
+            lo = next((i for i, t in enumerate(times) if t >= first_hour), len(times))
+            hi = next((i for i, t in enumerate(times) if t > last_hour), len(times))
+            keep = slice(lo, hi)
+        hourly = {"time": times[keep]}
+        for var in variables:
+            if var in recorded:
+                hourly[var] = (recorded[var] * len(days))[keep]
+
+        lats = query["latitude"].split(",")
+        lons = query["longitude"].split(",")
+        zones = query.get("timezone", "GMT").split(",")
+        answers = []
+        for i, (lat, lon) in enumerate(zip(lats, lons)):
+            body = {key: value for key, value in self._day.items() if key != "hourly"}
+            body.update(latitude=float(lat), longitude=float(lon), timezone=zones[min(i, len(zones) - 1)])
+            body["hourly_units"] = {k: v for k, v in self._day["hourly_units"].items() if k in hourly}
+            body["hourly"] = hourly  # Shared read-only lists; serialised per request.
+            answers.append(body)
+        return answers[0] if len(answers) == 1 else answers
+
+    # --- Lifecycle -------------------------------------------------------
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="open-meteo-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve recorded Open-Meteo responses locally.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay, up to this many seconds.")
+    args = parser.parse_args()
+    server = StubServer(latency=args.latency, jitter=args.jitter, port=args.port)
+    print(f"Open-Meteo stub listening on {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
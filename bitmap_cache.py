@@ -0,0 +1,239 @@
+"""Decoded + pre-scaled background bitmaps so theme swaps never touch the disk twice."""
+
+import os  # Skip missing assets during warm-up.
+import threading  # Warm-up and high-quality rescale run off the UI thread.
+import time  # Settle delay for progressive rescale.
+from collections import OrderedDict  # LRU ordering for both cache layers.
+
+import wx  # wxPython image/bitmap types.
+
+
+class BitmapCache:
+    """LRU cache of background art under a single memory budget.
+
+    Two layers share the budget: decoded source images keyed by path (so a new
+    window size only costs a resample, not a disk read + decode) and ready-to-
+    blit bitmaps keyed by (path, width, height) (so returning to a known size
+    and theme is just a pointer swap). Least recently used entries go first.
+    """
+
+    def __init__(self, budget_bytes=192 * 1024 * 1024, quality=wx.IMAGE_QUALITY_HIGH,
+                 preview_quality=wx.IMAGE_QUALITY_NORMAL, settle_ms=150, reuse_tolerance=0.1):
+        self.budget_bytes = budget_bytes
+        self.quality = quality  # Resample quality for final bitmaps.
+        self.preview_quality = preview_quality  # Fast scale shown while a size is still changing.
+        self.settle_ms = settle_ms  # Size must stay put this long before the HQ resample starts.
+        self.reuse_tolerance = reuse_tolerance  # Max relative size error for showing a cached bitmap as-is.
+        self._entries = OrderedDict()  # key -> (object, size_in_bytes)
+        self._used = 0
+        self._lock = threading.Lock()  # Warm-up thread inserts decoded images concurrently.
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Progressive rescale: one worker, latest request wins.
+        self._job_cond = threading.Condition()
+        self._job = None  # (generation, path, width, height, on_ready, requested_at) awaiting the worker
+        self._generation = 0  # Bumped per request; older results are dropped.
+        self._worker = None
+        self.previews = 0
+        self.hq_jobs = 0
+        self.hq_dropped = 0
+
+    # --- Budget bookkeeping ----------------------------------------------
+    @staticmethod
+    def _image_bytes(img):
+        size = img.GetWidth() * img.GetHeight()
+        return size * (4 if img.HasAlpha() else 3)  # RGB plus optional alpha plane.
+
+    @staticmethod
+    def _bitmap_bytes(bmp):
+        return bmp.GetWidth() * bmp.GetHeight() * 4  # Platform bitmaps are 32bpp in practice.
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def _store(self, key, obj, nbytes):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._used -= old[1]
+            self._entries[key] = (obj, nbytes)
+            self._used += nbytes
+            while self._used > self.budget_bytes and len(self._entries) > 1:
+                _, (_, freed) = self._entries.popitem(last=False)  # Evict least recently used.
+                self._used -= freed
+                self.evictions += 1
+
+    # --- Public API -------------------------------------------------------
+    def source(self, path):
+        """Return the decoded full-size ``wx.Image`` for ``path``, reading the file at most once."""
+        img = self._lookup(("src", path))
+        if img is None:
+            img = wx.Image(path, wx.BITMAP_TYPE_ANY)
+            if not img.IsOk():
+                raise IOError(f"Could not decode image: {path}")
+            self._store(("src", path), img, self._image_bytes(img))
+        return img
+
+    def get(self, path, width, height):
+        """Return a ``wx.Bitmap`` of ``path`` scaled to ``width`` x ``height`` (UI thread only)."""
+        key = ("bmp", path, width, height)
+        bmp = self._lookup(key)
+        if bmp is not None:
+            self.hits += 1
+            return bmp
+
+        self.misses += 1
+        img = self.source(path)
+        if width > 0 and height > 0:  # wx can report (0, 0) during startup.
+            img = img.Scale(width, height, self.quality)
+        bmp = wx.Bitmap(img)
+        self._store(key, bmp, self._bitmap_bytes(bmp))
+        return bmp
+
+    def _nearest(self, path, width, height):
+        """Cached HQ bitmap of ``path`` whose size is within ``reuse_tolerance`` of the target, if any."""
+        best, best_err = None, self.reuse_tolerance
+        with self._lock:
+            for key, (obj, _) in self._entries.items():
+                if key[0] != "bmp" or key[1] != path or not key[2] or not key[3]:
+                    continue
+                err = max(abs(key[2] - width) / width, abs(key[3] - height) / height)
+                if err <= best_err:
+                    best, best_err = obj, err
+        return best
+
+    def get_progressive(self, path, width, height, on_ready):
+        """Return ``(bitmap, is_final)`` immediately; schedule the HQ version if this is a preview.
+
+        The preview is a cached bitmap of a nearby size when one exists,
+        otherwise a fast low-quality scale. The high-quality resample runs on
+        a worker once the size has been stable for ``settle_ms``; newer
+        requests supersede older ones, and ``on_ready(path, width, height,
+        bitmap)`` is called on the UI thread only for the latest request.
+        """
+        key = ("bmp", path, width, height)
+        bmp = self._lookup(key)
+        if bmp is not None or width <= 0 or height <= 0:
+            self._cancel_job()
+            if bmp is None:
+                return self.get(path, width, height), True
+            self.hits += 1
+            return bmp, True
+
+        self.previews += 1
+        preview = self._nearest(path, width, height)
+        if preview is None:
+            preview = wx.Bitmap(self.source(path).Scale(width, height, self.preview_quality))
+        self._submit(path, width, height, on_ready)
+        return preview, False
+
+    # --- Progressive worker -------------------------------------------------
+    def _cancel_job(self):
+        with self._job_cond:
+            self._generation += 1
+            if self._job is not None:
+                self._job = None
+                self.hq_dropped += 1
+
+    def _submit(self, path, width, height, on_ready):
+        with self._job_cond:
+            self._generation += 1
+            if self._job is not None:  # Not started yet: the newer size simply replaces it.
+                self.hq_dropped += 1
+            self._job = (self._generation, path, width, height, on_ready, time.monotonic())
+            self._job_cond.notify()
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run_jobs, name="bitmap-rescale", daemon=True)
+                self._worker.start()
+
+    def _run_jobs(self):
+        while True:
+            with self._job_cond:
+                while True:  # Wait for a job whose size has settled.
+                    if self._job is None:
+                        self._job_cond.wait()
+                        continue
+                    remaining = self._job[5] + self.settle_ms / 1000.0 - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._job_cond.wait(remaining)
+                job, self._job = self._job, None
+            generation, path, width, height, on_ready, _ = job
+            try:
+                scaled = self.source(path).Scale(width, height, self.quality)
+            except Exception:
+                continue  # The preview stays up; a broken asset is reported by get().
+            if generation != self._generation:  # A newer size arrived while we were resampling.
+                self.hq_dropped += 1
+                continue
+            self.hq_jobs += 1
+            wx.CallAfter(self._finish_job, generation, path, width, height, scaled, on_ready)
+
+    def _finish_job(self, generation, path, width, height, scaled, on_ready):
+        # UI thread: wx.Bitmap creation must happen here.
+        key = ("bmp", path, width, height)
+        bmp = self._lookup(key)
+        if bmp is None:
+            bmp = wx.Bitmap(scaled)
+            self._store(key, bmp, self._bitmap_bytes(bmp))
+        if generation != self._generation:
+            self.hq_dropped += 1  # Still cached for later, but not shown.
+            return
+        on_ready(path, width, height, bmp)
+
+    def warm_up(self, paths, size=None, background=True):
+        """Pre-decode every asset (and pre-scale to ``size``) so first use is instant.
+
+        Decoding and resampling run on a worker thread when ``background`` is
+        true; only the final ``wx.Bitmap`` creation hops back to the UI thread.
+        """
+        paths = [p for p in dict.fromkeys(paths) if p and os.path.exists(p)]  # De-duplicate, skip missing.
+
+        def install(path, width, height, img):
+            key = ("bmp", path, width, height)
+            if self._lookup(key) is None:
+                bmp = wx.Bitmap(img)
+                self._store(key, bmp, self._bitmap_bytes(bmp))
+
+        def work():
+            for path in paths:
+                try:
+                    img = self.source(path)
+                    if size and size[0] > 0 and size[1] > 0:
+                        scaled = img.Scale(size[0], size[1], self.quality)
+                        if background:
+                            wx.CallAfter(install, path, size[0], size[1], scaled)
+                        else:
+                            install(path, size[0], size[1], scaled)
+                except Exception:
+                    continue  # A broken asset must not stop the rest from warming.
+
+        if background:
+            threading.Thread(target=work, name="bitmap-warmup", daemon=True).start()
+        else:
+            work()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._used = 0
+
+    def stats(self):
+        """Hit/miss counters plus current memory use."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "previews": self.previews,
+            "hq_jobs": self.hq_jobs,
+            "hq_dropped": self.hq_dropped,
+            "entries": len(self._entries),
+            "bytes_used": self._used,
+            "budget_bytes": self.budget_bytes,
+        }
@@ -0,0 +1,144 @@
+"""Managed HTTP layer for Open-Meteo calls: pooled keep-alive session, retries, rate limiting."""
+
+import json  # Fallback JSON decoder.
+import random  # Jitter for retry backoff.
+import threading  # Limiter state is shared between GUI workers.
+import time  # Token bucket clock and retry sleeps.
+from urllib.parse import urlsplit  # Host extraction for per-host limits.
+
+import requests  # Session + exception types.
+from requests.adapters import HTTPAdapter  # Default pooled transport.
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)  # Transient server answers worth another try.
+ACCEPT_ENCODING = "gzip, deflate"  # Open-Meteo compresses hourly JSON several-fold.
+
+try:  # Optional faster decoders; both parse the raw bytes without a str round trip.
+    import orjson
+
+    _loads, JSON_DECODER = orjson.loads, "orjson"
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        import ujson
+
+        _loads, JSON_DECODER = ujson.loads, "ujson"
+    except ImportError:
+        _loads, JSON_DECODER = json.loads, "json"
+
+
+def decode_json(resp):
+    """Decode a response body with the fastest available JSON parser.
+
+    Replaces ``resp.json()``, which always uses the stdlib parser and first guesses
+    the text encoding. Every decoder's errors are ``ValueError`` subclasses, like ``resp.json()``.
+    """
+    return _loads(resp.content)
+
+
+class RateLimiter:
+    """Per-host token bucket: at most ``rate`` requests per second with bursts up to ``burst``."""
+
+    def __init__(self, rate=10.0, burst=None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._buckets = {}  # host -> [tokens, last_refill]
+        self._lock = threading.Lock()
+
+    def acquire(self, host):
+        """Block until ``host`` has a token available, then consume it."""
+        if not self.rate:  # 0/None disables limiting entirely.
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, last = self._buckets.get(host, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - last) * self.rate)  # Refill since last call.
+                if tokens >= 1.0:
+                    self._buckets[host] = (tokens - 1.0, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                wait = (1.0 - tokens) / self.rate
+            time.sleep(wait)  # Sleep outside the lock so other hosts keep flowing.
+
+
+class HttpClient:
+    """Shared ``requests.Session`` with connection pooling, bounded retries and rate limiting.
+
+    ``transport`` may be any ``requests`` adapter (e.g. one that talks to a local
+    stub), and ``base_url_overrides`` rewrites URL prefixes so a stub server can
+    stand in for Open-Meteo without touching the calling code.
+    """
+
+    def __init__(
+        self,
+        pool_size=10,
+        retries=3,
+        backoff_base=0.5,
+        backoff_max=8.0,
+        rate_per_host=10.0,
+        burst=None,
+        transport=None,
+        session=None,
+        base_url_overrides=None,
+        retry_statuses=RETRY_STATUSES,
+    ):
+        self.retries = retries  # Extra attempts after the first one.
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.base_url_overrides = dict(base_url_overrides or {})
+        self.limiter = RateLimiter(rate_per_host, burst)
+
+        self.session = session or requests.Session()
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING  # requests transparently inflates the body.
+        adapter = transport or HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _resolve(self, url):
+        """Apply any configured base URL override (longest prefix wins)."""
+        for prefix in sorted(self.base_url_overrides, key=len, reverse=True):
+            if url.startswith(prefix):
+                return self.base_url_overrides[prefix] + url[len(prefix):]
+        return url
+
+    def _backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, respecting a server-provided Retry-After."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after:
+            try:
+                delay = max(delay, min(self.backoff_max, float(retry_after)))
+            except ValueError:
+                pass  # HTTP-date form; the jittered delay is good enough.
+        return delay
+
+    def get(self, url, params=None, timeout=10, **kwargs):
+        """GET with retries on connection errors, timeouts and transient statuses.
+
+        Returns the final ``requests.Response``; callers still call
+        ``raise_for_status()`` so non-retryable errors surface unchanged.
+        """
+        url = self._resolve(url)
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            self.limiter.acquire(host)
+            try:
+                resp = self.session.get(url, params=params, timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self.retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            if resp.status_code in self.retry_statuses and attempt < self.retries:
+                retry_after = resp.headers.get("Retry-After")
+                resp.close()  # Hand the connection back to the pool before sleeping.
+                time.sleep(self._backoff(attempt, retry_after))
+                attempt += 1
+                continue
+            return resp
+
+    def close(self):
+        """Release pooled connections."""
+        self.session.close()
@@ -0,0 +1,229 @@
+"""Lightweight timing spans, counters and histograms for the weather and rendering hot paths.
+
+Disabled by default: ``span()``/``trace()`` then return a shared no-op object
+and ``inc()`` returns immediately, so instrumented code costs one flag check.
+Enable with ``PYTHONJACKFRUIT_METRICS=1`` or ``metrics.enable()``.
+
+``span(name)`` times one stage into the ``name`` histogram. ``trace(name)``
+groups the spans that run inside it on the same thread into a per-request
+stage breakdown, kept as ``last_trace(name)`` for the debug overlay. Export
+with ``to_json()`` or ``to_prometheus()``.
+"""
+
+import json  # Snapshot export.
+import os  # Enable flag from the environment.
+import re  # Prometheus metric-name sanitising.
+import threading  # Thread-local traces + registry lock.
+import time  # perf_counter spans, wall-clock trace stamps.
+
+ENV_VAR = "PYTHONJACKFRUIT_METRICS"
+# Latency buckets in seconds: sub-millisecond cache hits up to slow network calls.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_enabled = os.environ.get(ENV_VAR, "") not in ("", "0")
+_lock = threading.Lock()
+_local = threading.local()  # .trace -> the _Trace collecting spans on this thread.
+_counters = {}  # name -> int
+_histograms = {}  # name -> Histogram
+_last_traces = {}  # trace name -> breakdown dict
+
+
+class Histogram:
+    """Cumulative bucket counts plus sum/count, Prometheus style."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf.
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self):
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            cumulative["+Inf" if bound == float("inf") else repr(bound)] = running
+        return {"count": self.count, "sum": self.sum, "buckets": cumulative}
+
+
+class _Noop:
+    """Returned while disabled: entering and leaving it does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _Noop()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        observe(self.name, elapsed)
+        current = getattr(_local, "trace", None)
+        if current is not None:
+            current.stages.append((self.name, elapsed))
+        return False
+
+
+class _Trace:
+    __slots__ = ("name", "start", "stages", "parent")
+
+    def __init__(self, name):
+        self.name = name
+        self.stages = []
+
+    def __enter__(self):
+        self.parent = getattr(_local, "trace", None)
+        _local.trace = self
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        total = time.perf_counter() - self.start
+        _local.trace = self.parent
+        observe(self.name, total)
+        with _lock:
+            _last_traces[self.name] = {
+                "total": total,
+                "stages": list(self.stages),
+                "error": exc_type.__name__ if exc_type else None,
+                "finished_at": time.time(),
+            }
+        return False
+
+
+# --- Recording ------------------------------------------------------------
+
+def enable(on=True):
+    """Turn recording on (or off with ``enable(False)``)."""
+    global _enabled
+    _enabled = bool(on)
+
+
+def is_enabled():
+    return _enabled
+
+
+def span(name):
+    """Time the ``with`` block into histogram ``name`` (and the current trace, if any)."""
+    if not _enabled:
+        return _NOOP
+    return _Span(name)
+
+
+def trace(name):
+    """Collect the spans of one request (e.g. a GET WEATHER click) into ``last_trace(name)``."""
+    if not _enabled:
+        return _NOOP
+    return _Trace(name)
+
+
+def inc(name, amount=1):
+    """Add ``amount`` to counter ``name``."""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def observe(name, seconds):
+    """Record one duration in histogram ``name``."""
+    if not _enabled:
+        return
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.observe(seconds)
+
+
+def reset():
+    """Forget every counter, histogram and trace."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+        _last_traces.clear()
+
+
+# --- Export ---------------------------------------------------------------
+
+def last_trace(name):
+    """Stage breakdown of the most recent ``trace(name)``, or ``None``."""
+    with _lock:
+        return _last_traces.get(name)
+
+
+def snapshot():
+    """JSON-ready copy of everything recorded so far."""
+    with _lock:
+        return {
+            "enabled": _enabled,
+            "counters": dict(_counters),
+            "histograms": {name: hist.snapshot() for name, hist in _histograms.items()},
+            "last_traces": {name: dict(t, stages=[list(s) for s in t["stages"]]) for name, t in _last_traces.items()},
+        }
+
+
+def to_json(indent=None):
+    return json.dumps(snapshot(), indent=indent)
+
+
+def _prom_name(prefix, name):
+    return prefix + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def to_prometheus(prefix="pythonjackfruit_"):
+    """Counters and histograms in the Prometheus text exposition format."""
+    snap = snapshot()
+    lines = []
+    for name, value in sorted(snap["counters"].items()):
+        metric = _prom_name(prefix, name) + "_total"
+        lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+    for name, hist in sorted(snap["histograms"].items()):
+        metric = _prom_name(prefix, name) + "_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        for bound, count in hist["buckets"].items():
+            lines.append(f'{metric}_bucket{{le="{bound}"}} {count}')
+        lines += [f"{metric}_sum {hist['sum']}", f"{metric}_count {hist['count']}"]
+    return "\n".join(lines) + "\n"
+
+
+def dump(path):
+    """Write a snapshot to ``path`` (Prometheus text for ``.prom``, JSON otherwise)."""
+    text = to_prometheus() if path.endswith(".prom") else to_json(indent=2)
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(text)
+
+
+def format_trace(name):
+    """Multi-line "stage  12.3 ms" summary of ``last_trace(name)`` for on-screen display."""
+    t = last_trace(name)
+    if t is None:
+        return f"{name}: no data"
+    lines = [f"{name}: {t['total'] * 1000:.1f} ms" + (f" ({t['error']})" if t["error"] else "")]
+    lines += [f"  {stage:<22} {seconds * 1000:8.1f} ms" for stage, seconds in t["stages"]]
+    return "\n".join(lines)
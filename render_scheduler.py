@@ -0,0 +1,59 @@
+"""Coalesced, change-detecting repaint scheduling for the Tzpy backdrop."""
+
+import wx  # wx.CallLater drives the coalescing window.
+
+
+class RenderScheduler:
+    """Batch bursts of repaint requests into one render, and skip renders that change nothing.
+
+    ``state`` returns a hashable snapshot of everything that affects the frame
+    (e.g. time bucket, weather condition, panel size, text mode). A render only
+    runs when that snapshot differs from the one last drawn; requests that land
+    while a render is already scheduled are folded into it.
+    """
+
+    def __init__(self, render, state, delay_ms=30):
+        self.render = render  # Callable that performs the actual repaint.
+        self.state = state  # Callable returning the current visual state.
+        self.delay_ms = delay_ms  # Coalescing window for typing/resize bursts.
+        self._pending = None  # wx.CallLater for the scheduled flush, if any.
+        self._last_state = None  # State of the last frame actually drawn.
+        self.requested = 0
+        self.coalesced = 0
+        self.executed = 0
+        self.skipped = 0
+
+    def request(self):
+        """Ask for a repaint; it runs after the coalescing window."""
+        self.requested += 1
+        if self._pending is not None:  # A flush is already queued; it will see the latest state.
+            self.coalesced += 1
+            return
+        self._pending = wx.CallLater(self.delay_ms, self.flush)
+
+    def flush(self):
+        """Render now if the visual state changed since the last drawn frame."""
+        self._pending = None
+        state = self.state()
+        if state == self._last_state:
+            self.skipped += 1
+            return False
+        self.render()
+        self._last_state = state
+        self.executed += 1
+        return True
+
+    def cancel(self):
+        """Drop a queued flush (e.g. when the window closes)."""
+        if self._pending is not None:
+            self._pending.Stop()
+            self._pending = None
+
+    def stats(self):
+        """Counters comparing skipped and coalesced requests with renders actually executed."""
+        return {
+            "requested": self.requested,
+            "coalesced": self.coalesced,
+            "executed": self.executed,
+            "skipped": self.skipped,
+        }
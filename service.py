@@ -0,0 +1,300 @@
+"""Headless asyncio HTTP service for conversion and weather (no wx, stdlib only).
+
+Endpoints (JSON unless noted)::
+
+    GET  /convert?time=2024-01-15 14:30:00&from=US/Eastern&to=Asia/Tokyo
+    POST /convert/batch   {"from": ..., "to": ..., "times": [...]}  or  {"items": [{"time", "from", "to"}, ...]}
+    GET  /weather?time=2024-01-15 14:00:00&tz=Asia/Tokyo[&fields=temperature,condition][&minimal=1]
+    GET  /metrics         Prometheus text (latency histograms, counters)
+    GET  /metrics.json
+    GET  /healthz
+
+Blocking upstream work (``requests`` inside ``weather_api``) runs on a bounded
+thread pool behind an ``asyncio.Semaphore``, so the event loop never blocks
+and at most ``concurrency`` lookups hit Open-Meteo at once. Identical weather
+queries that arrive while one is in flight share that single upstream fetch.
+
+    python service.py --port 8080 --concurrency 8
+"""
+
+import argparse  # Command line.
+import asyncio  # Event loop, streams, semaphore.
+import json  # Request/response bodies.
+import time  # Request latency.
+from concurrent.futures import ThreadPoolExecutor  # Runs blocking upstream calls.
+from datetime import datetime  # Normalising weather keys to the hour.
+from functools import partial  # Keyword arguments through run_in_executor.
+from urllib.parse import parse_qs, urlsplit
+
+import metrics  # Latency histograms + counters (enabled for the service).
+from tzpy_core import DEFAULT_FORMAT, time_zone_converter
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 16 * 1024 * 1024
+BATCH_INLINE_LIMIT = 1000  # Larger batches are converted on the pool so the loop stays responsive.
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 502: "Bad Gateway"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ConversionService:
+    """Request handlers plus the shared pool, concurrency bound and in-flight weather table."""
+
+    def __init__(self, concurrency=8):
+        self.concurrency = concurrency
+        self.pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="service")
+        self.limit = asyncio.Semaphore(concurrency)
+        self.inflight = {}  # (tz_name, hour, fields, minimal) -> asyncio.Task shared by identical weather queries
+        self._weather_api = None
+        metrics.enable()
+
+    # --- Upstream helpers ---------------------------------------------------
+    async def run_blocking(self, fn, *args):
+        """Run ``fn`` on the pool, holding one of ``concurrency`` slots."""
+        async with self.limit:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, fn, *args)
+
+    def weather_api(self):
+        if self._weather_api is None:
+            import weather_api  # Deferred: /convert-only deployments never load requests + caches.
+            self._weather_api = weather_api
+        return self._weather_api
+
+    # --- Handlers -----------------------------------------------------------
+    async def convert(self, query, body):
+        time_str, from_tz, to_tz = _require(query, "time", "from", "to")
+        fmt = query.get("format", DEFAULT_FORMAT)
+        try:
+            result = time_zone_converter(time_str, from_tz, to_tz, fmt)  # Cached plan: microseconds.
+        except (ValueError, KeyError) as e:
+            raise HttpError(400, f"Invalid time or timezone: {e}")
+        return {"time": time_str, "from": from_tz, "to": to_tz, "result": result}
+
+    async def convert_batch(self, query, body):
+        payload = _json_body(body)
+        if "times" in payload:
+            if not isinstance(payload["times"], list):
+                raise HttpError(400, '"times" must be a list of time strings.')
+            items = [{"time": t, "from": payload.get("from"), "to": payload.get("to")} for t in payload["times"]]
+        else:
+            items = payload.get("items")
+        if not isinstance(items, list):
+            raise HttpError(400, 'Expected "times" with "from"/"to", or an "items" list.')
+        fmt = payload.get("format", DEFAULT_FORMAT)
+        if not isinstance(fmt, str):
+            raise HttpError(400, '"format" must be a string.')
+        if len(items) > BATCH_INLINE_LIMIT:
+            results = await self.run_blocking(_convert_items, items, fmt)
+        else:
+            results = _convert_items(items, fmt)
+        return {"count": len(results), "results": results}
+
+    async def weather(self, query, body):
+        time_str, tz_name = _require(query, "time", "tz")
+        try:
+            hour = datetime.strptime(time_str, "%Y-%m-%d %H:%M:%S").replace(minute=0, second=0)
+        except ValueError:
+            raise HttpError(400, "time must look like YYYY-MM-DD HH:MM:SS")
+        fields = tuple(query["fields"].split(",")) if query.get("fields") else None
+        minimal = query.get("minimal", "").lower() in ("1", "true", "yes")  # One-hour, selected-variable fetch.
+        key = (tz_name, hour, fields, minimal)
+
+        task = self.inflight.get(key)
+        if task is None:
+            metrics.inc("service.weather.upstream")
+            dt_str = hour.strftime("%Y-%m-%d %H:%M:%S")
+            fetch = partial(self.weather_api().get_weather_for_datetime, fields=fields, minimal=minimal)
+            task = asyncio.ensure_future(self.run_blocking(fetch, dt_str, tz_name))
+            self.inflight[key] = task
+            task.add_done_callback(lambda _t, k=key: self.inflight.pop(k, None))
+        else:
+            metrics.inc("service.weather.coalesced")
+
+        try:
+            return await asyncio.shield(task)  # One client disconnecting must not cancel the shared fetch.
+        except ValueError as e:
+            raise HttpError(400, str(e))
+        except RuntimeError as e:  # weather_api wraps network failures in RuntimeError.
+            raise HttpError(502, str(e))
+
+    async def metrics_text(self, query, body):
+        return metrics.to_prometheus(), "text/plain; version=0.0.4"
+
+    async def metrics_json(self, query, body):
+        return metrics.snapshot()
+
+    async def healthz(self, query, body):
+        return {"status": "ok", "inflight_weather": len(self.inflight)}
+
+    def routes(self):
+        return {
+            ("GET", "/convert"): self.convert,
+            ("POST", "/convert/batch"): self.convert_batch,
+            ("GET", "/weather"): self.weather,
+            ("GET", "/metrics"): self.metrics_text,
+            ("GET", "/metrics.json"): self.metrics_json,
+            ("GET", "/healthz"): self.healthz,
+        }
+
+    # --- HTTP plumbing --------------------------------------------------------
+    async def handle_connection(self, reader, writer):
+        routes = self.routes()
+        try:
+            while True:  # HTTP/1.1 keep-alive loop.
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await _respond(writer, 413, {"error": "Headers too large"}, keep_alive=False)
+                    return
+                started = time.perf_counter()
+                method, target, headers = _parse_head(head)
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:  # The body boundary is unknowable, so the connection cannot be reused.
+                    await _respond(writer, 400, {"error": "Invalid Content-Length"}, keep_alive=False)
+                    return
+                if length > MAX_BODY_BYTES:
+                    await _respond(writer, 413, {"error": "Body too large"}, keep_alive=False)
+                    return
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                parts = urlsplit(target)
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                handler = routes.get((method, parts.path))
+                name = parts.path.strip("/").replace("/", "_") or "root"
+                try:
+                    if handler is None:
+                        known = any(path == parts.path for _, path in routes)
+                        raise HttpError(405 if known else 404, f"No route for {method} {parts.path}")
+                    result = await handler(query, body)
+                    status = 200
+                except HttpError as e:
+                    status, result = e.status, {"error": str(e)}
+                except Exception as e:  # Never let one request take the connection loop down.
+                    status, result = 500, {"error": f"{type(e).__name__}: {e}"}
+                metrics.observe(f"service.{name}", time.perf_counter() - started)
+                metrics.inc(f"service.status.{status}")
+                await _respond(writer, status, result, keep_alive)
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+        return server
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _require(query, *names):
+    missing = [n for n in names if not query.get(n)]
+    if missing:
+        raise HttpError(400, f"Missing query parameter(s): {', '.join(missing)}")
+    return [query[n] for n in names]
+
+
+def _json_body(body):
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError as e:
+        raise HttpError(400, f"Invalid JSON body: {e}")
+    if not isinstance(payload, dict):
+        raise HttpError(400, "JSON body must be an object.")
+    return payload
+
+
+def _convert_items(items, fmt):
+    """Convert mixed-pair items, using one bulk ``convert_many`` per (from, to) pair."""
+    import tz_engine  # Deferred with the rest of the zone data.
+
+    results = [None] * len(items)
+    by_pair = {}
+    for i, item in enumerate(items):
+        if not isinstance(item, dict) or not all(item.get(k) and isinstance(item[k], str) for k in ("time", "from", "to")):
+            results[i] = {"error": 'Each item needs "time", "from" and "to" strings.'}
+            continue
+        by_pair.setdefault((item["from"], item["to"]), []).append(i)
+    for (from_tz, to_tz), indexes in by_pair.items():
+        times = [items[i]["time"] for i in indexes]
+        try:
+            converted = tz_engine.convert_many(times, from_tz, to_tz, fmt)
+        except (ValueError, KeyError):  # One bad row (or zone): fall back to per-item errors.
+            converted = []
+            for t in times:
+                try:
+                    converted.append(time_zone_converter(t, from_tz, to_tz, fmt))
+                except (ValueError, KeyError) as e:
+                    converted.append(e)
+        for i, value in zip(indexes, converted):
+            results[i] = {"error": f"Invalid time or timezone: {value}"} if isinstance(value, Exception) else {"result": value}
+    return results
+
+
+def _parse_head(head):
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _version = lines[0].split(" ", 2)
+    except ValueError:
+        method, target = "GET", "/"  # Malformed request line: answered with 404.
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return method.upper(), target, headers
+
+
+async def _respond(writer, status, result, keep_alive=True):
+    if isinstance(result, tuple):  # (text, content_type)
+        data, content_type = result[0].encode("utf-8"), result[1]
+    else:
+        data, content_type = json.dumps(result).encode("utf-8"), "application/json"
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    ).encode("latin-1")
+    writer.write(head + data)
+    await writer.drain()
+
+
+async def _main(host, port, concurrency):
+    service = ConversionService(concurrency)
+    server = await service.serve(host, port)
+    print(f"Serving on http://{host}:{port} (concurrency {concurrency})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve timezone conversion and weather over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--concurrency", type=int, default=8, help="Max simultaneous upstream weather lookups.")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_main(args.host, args.port, args.concurrency))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,473 @@
+"""Bulk timezone conversion that works straight off pytz's transition tables.
+
+``time_zone_converter`` in ``tzpy_core.py`` handles one string at a time through
+``localize``/``astimezone``. The helpers here convert whole sequences (or
+NumPy ``datetime64`` arrays) by binary-searching each zone's UTC offset table,
+so no per-element ``datetime`` or tzinfo objects are created. With the default
+policies the results match the scalar path exactly.
+"""
+
+import bisect  # Pure-Python binary search when NumPy is unavailable.
+from datetime import datetime  # Epoch reference + strptime fallback.
+from functools import lru_cache  # Transition tables are immutable per zone.
+
+import pytz  # Timezone database and DST exceptions.
+
+try:  # NumPy is optional: it powers the vectorised path when installed.
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+DEFAULT_FORMAT = "%Y-%m-%d %H:%M:%S"  # Same default as time_zone_converter.
+
+# How to resolve local times that occur twice (DST fall-back):
+#   "standard" - pytz's default (is_dst=False); matches time_zone_converter.
+#   "dst"      - pytz's is_dst=True choice.
+#   "earliest" / "latest" - the earlier / later of the two UTC instants.
+#   "raise"    - pytz.AmbiguousTimeError.
+AMBIGUOUS_POLICIES = ("standard", "dst", "earliest", "latest", "raise")
+
+# How to resolve local times that never occur (DST spring-forward gap):
+#   "standard" - offset in force before the gap (pytz is_dst=False); matches time_zone_converter.
+#   "dst"      - offset in force after the gap (pytz is_dst=True).
+#   "raise"    - pytz.NonExistentTimeError.
+NONEXISTENT_POLICIES = ("standard", "dst", "raise")
+
+_EPOCH = datetime(1970, 1, 1)  # Naive epoch; all arithmetic is in whole seconds.
+_SECONDS_PER_DAY = 86400
+
+
+class TransitionTable:
+    """UTC transition instants of one zone plus the offset/DST flag in force from each.
+
+    ``utc[i]`` is the first UTC second of period ``i``; ``local[i]`` is that same
+    instant on the period's own wall clock, which is what local-time lookups
+    binary-search against.
+    """
+
+    def __init__(self, zone_name):
+        tz = pytz.timezone(zone_name)
+        self.zone = zone_name
+        if hasattr(tz, "_utc_transition_times"):  # DstTzInfo: zones with a history of changes.
+            self.utc = [int((t - _EPOCH).total_seconds()) for t in tz._utc_transition_times]
+            self.offsets = [int(info[0].total_seconds()) for info in tz._transition_info]
+            self.dst = [bool(info[1]) for info in tz._transition_info]
+        else:  # StaticTzInfo / UTC: a single fixed offset.
+            self.utc = [int((datetime.min - _EPOCH).total_seconds())]
+            self.offsets = [int(tz.utcoffset(datetime(2000, 1, 1)).total_seconds())]
+            self.dst = [False]
+        self.local = [t + o for t, o in zip(self.utc, self.offsets)]
+        self.size = len(self.utc)
+
+        if np is not None:  # Contiguous copies for searchsorted/fancy indexing.
+            self.utc_arr = np.array(self.utc, dtype=np.int64)
+            self.local_arr = np.array(self.local, dtype=np.int64)
+            self.offset_arr = np.array(self.offsets, dtype=np.int64)
+            self.dst_arr = np.array(self.dst, dtype=bool)
+
+    # --- Scalar helpers (also the pure-Python bulk path) ------------------
+    def offset_at_utc(self, utc_seconds):
+        """Offset (seconds) in force at a UTC instant."""
+        i = max(0, bisect.bisect_right(self.utc, utc_seconds) - 1)
+        return self.offsets[i]
+
+    def utc_from_local(self, local_seconds, ambiguous="standard", nonexistent="standard"):
+        """Map a wall-clock time (seconds since the naive epoch) to UTC seconds."""
+        j = max(0, bisect.bisect_right(self.local, local_seconds) - 1)
+        last = self.size - 1
+        valid_j = j == last or local_seconds < self.utc[j + 1] + self.offsets[j]
+        valid_prev = j >= 1 and local_seconds < self.utc[j] + self.offsets[j - 1]
+
+        if valid_j and not valid_prev:  # The common case: exactly one reading.
+            return local_seconds - self.offsets[j]
+        if valid_prev and not valid_j:
+            return local_seconds - self.offsets[j - 1]
+        if valid_j and valid_prev:  # Fall-back overlap: periods j-1 and j both match.
+            offset = _pick_ambiguous(
+                self.offsets[j - 1], self.dst[j - 1], self.offsets[j], self.dst[j], ambiguous, self, local_seconds
+            )
+            return local_seconds - offset
+        # Spring-forward gap between periods j and j+1.
+        if nonexistent == "raise":
+            raise pytz.NonExistentTimeError(_describe(self, local_seconds))
+        offset = self.offsets[j + 1] if nonexistent == "dst" else self.offsets[j]
+        return local_seconds - offset
+
+
+def _describe(table, local_seconds):
+    """Readable label for DST errors."""
+    return f"{timestamp_codec(DEFAULT_FORMAT).format(local_seconds)} in {table.zone}"
+
+
+def _pick_ambiguous(off_a, dst_a, off_b, dst_b, policy, table, local_seconds):
+    """Choose between two valid offsets exactly the way pytz's ``localize`` would."""
+    if policy == "raise":
+        raise pytz.AmbiguousTimeError(_describe(table, local_seconds))
+    if policy == "earliest":  # Earlier UTC instant <=> larger offset.
+        return max(off_a, off_b)
+    if policy == "latest":
+        return min(off_a, off_b)
+    is_dst = policy == "dst"
+    matches = [off for off, flag in ((off_a, dst_a), (off_b, dst_b)) if flag == is_dst]
+    if len(matches) == 1:
+        return matches[0]
+    # pytz falls back to the earliest UTC for is_dst=True and the latest otherwise.
+    return max(off_a, off_b) if is_dst else min(off_a, off_b)
+
+
+@lru_cache(maxsize=None)
+def transition_table(zone_name):
+    """Return the (cached) transition table for ``zone_name``."""
+    return TransitionTable(zone_name)
+
+
+def _check_policies(ambiguous, nonexistent):
+    if ambiguous not in AMBIGUOUS_POLICIES:
+        raise ValueError(f"ambiguous must be one of {AMBIGUOUS_POLICIES}, got {ambiguous!r}")
+    if nonexistent not in NONEXISTENT_POLICIES:
+        raise ValueError(f"nonexistent must be one of {NONEXISTENT_POLICIES}, got {nonexistent!r}")
+
+
+# --- Calendar arithmetic (no datetime objects) ------------------------------
+
+def _days_from_civil(y, m, d):
+    """Days since 1970-01-01 for a proleptic Gregorian date (H. Hinnant's algorithm)."""
+    y -= m <= 2
+    era = (y if y >= 0 else y - 399) // 400
+    yoe = y - era * 400
+    doy = (153 * (m + (-3 if m > 2 else 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _civil_from_days(z):
+    """Inverse of ``_days_from_civil``: (year, month, day)."""
+    z += 719468
+    era = (z if z >= 0 else z - 146096) // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    y = yoe + era * 400
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    d = doy - (153 * mp + 2) // 5 + 1
+    m = mp + (3 if mp < 10 else -9)
+    return y + (m <= 2), m, d
+
+
+def _days_in_month(y, m):
+    if m == 2:
+        return 29 if (y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)) else 28
+    return 30 if m in (4, 6, 9, 11) else 31
+
+
+_FIELD_WIDTHS = {"Y": 4, "m": 2, "d": 2, "H": 2, "M": 2, "S": 2}  # Fixed-width strptime directives.
+_FIELD_NAMES = {"Y": "year", "m": "month", "d": "day", "H": "hour", "M": "minute", "S": "second"}
+
+
+class TimestampCodec:
+    """Fixed-width parser/formatter compiled once per format string.
+
+    Formats built only from ``%Y %m %d %H %M %S`` and literal text are handled
+    by slicing and ``int()``; zero-padded input takes that fast path and
+    anything else (other directives, unpadded fields, bad values) goes through
+    ``strptime``/``strftime`` so behaviour and errors match the scalar path.
+    """
+
+    def __init__(self, time_format):
+        self.time_format = time_format
+        self.layout = self._compile(time_format)  # [(start, end, field_or_None, literal)] or None
+        if self.layout is not None:
+            self.width = self.layout[-1][1] if self.layout else 0
+            self.fields = [(start, end, field) for start, end, field, _ in self.layout if field]
+            self.literals = [(start, end, lit) for start, end, field, lit in self.layout if not field]
+
+    @staticmethod
+    def _compile(time_format):
+        layout, pos, i, seen = [], 0, 0, set()
+        while i < len(time_format):
+            ch = time_format[i]
+            if ch == "%":
+                directive = time_format[i + 1:i + 2]
+                if directive == "%":  # Escaped percent sign is just a literal.
+                    layout.append((pos, pos + 1, None, "%"))
+                    pos, i = pos + 1, i + 2
+                    continue
+                if directive not in _FIELD_WIDTHS or directive in seen:
+                    return None  # Variable-width or unsupported directive: strptime only.
+                seen.add(directive)
+                width = _FIELD_WIDTHS[directive]
+                layout.append((pos, pos + width, directive, None))
+                pos, i = pos + width, i + 2
+            else:  # Literals must match exactly; looser spellings fall back to strptime.
+                layout.append((pos, pos + 1, None, ch))
+                pos, i = pos + 1, i + 1
+        return layout
+
+    def parse(self, text):
+        """Return naive epoch seconds for ``text``."""
+        if self.layout is not None and len(text) == self.width:
+            values = {"Y": 1900, "m": 1, "d": 1, "H": 0, "M": 0, "S": 0}  # strptime's defaults.
+            ok = all(text[start:end] == lit for start, end, lit in self.literals)
+            if ok:
+                for start, end, field in self.fields:
+                    chunk = text[start:end]
+                    if not (chunk.isascii() and chunk.isdigit()):
+                        ok = False
+                        break
+                    values[field] = int(chunk)
+            if ok:
+                y, mo, d = values["Y"], values["m"], values["d"]
+                h, mi, sec = values["H"], values["M"], values["S"]
+                if y >= 1 and 1 <= mo <= 12 and 1 <= d <= _days_in_month(y, mo) and h < 24 and mi < 60 and sec < 60:
+                    return _days_from_civil(y, mo, d) * _SECONDS_PER_DAY + h * 3600 + mi * 60 + sec
+        # Anything unusual goes through strptime so error messages and leniency match the scalar path.
+        dt = datetime.strptime(text, self.time_format)
+        return _days_from_civil(dt.year, dt.month, dt.day) * _SECONDS_PER_DAY + dt.hour * 3600 + dt.minute * 60 + dt.second
+
+    def format(self, seconds):
+        """Format naive epoch seconds back into ``time_format``."""
+        days, rem = divmod(seconds, _SECONDS_PER_DAY)
+        y, m, d = _civil_from_days(days)
+        h, rem = divmod(rem, 3600)
+        mi, s = divmod(rem, 60)
+        if self.layout is not None and 1000 <= y <= 9999:
+            values = {"Y": y, "m": m, "d": d, "H": h, "M": mi, "S": s}
+            return "".join(
+                lit if field is None else f"{values[field]:0{end - start}d}"
+                for start, end, field, lit in self.layout
+            )
+        return datetime(y, m, d, h, mi, s).strftime(self.time_format)
+
+
+_AWARE_DIRECTIVES = frozenset("fzZ")  # Need sub-second precision or tzinfo that epoch seconds cannot carry.
+
+
+def needs_aware_path(time_format):
+    """True when ``time_format`` uses ``%f``, ``%z`` or ``%Z``, which the seconds-based codec cannot represent."""
+    i = 0
+    while i < len(time_format) - 1:
+        if time_format[i] == "%":
+            directive = time_format[i + 1]
+            if directive == ":" and i + 2 < len(time_format):  # Python 3.12+ ``%:z``.
+                directive = time_format[i + 2]
+            if directive in _AWARE_DIRECTIVES:
+                return True
+            i += 2
+        else:
+            i += 1
+    return False
+
+
+def _localize(tz, naive, ambiguous, nonexistent):
+    """pytz ``localize`` with the same ambiguous/nonexistent policies as ``TransitionTable.utc_from_local``."""
+    if ambiguous == "standard" and nonexistent == "standard":
+        return tz.localize(naive)  # Exactly the original scalar path.
+    try:
+        return tz.localize(naive, is_dst=None)
+    except pytz.AmbiguousTimeError:
+        if ambiguous == "raise":
+            raise
+        if ambiguous in ("earliest", "latest"):
+            options = sorted((tz.localize(naive, is_dst=flag) for flag in (True, False)), key=lambda d: d.astimezone(pytz.utc))
+            return options[0] if ambiguous == "earliest" else options[-1]
+        return tz.localize(naive, is_dst=ambiguous == "dst")
+    except pytz.NonExistentTimeError:
+        if nonexistent == "raise":
+            raise
+        return tz.localize(naive, is_dst=nonexistent == "dst")
+
+
+@lru_cache(maxsize=64)
+def timestamp_codec(time_format):
+    """Return the (cached) codec for ``time_format``."""
+    return TimestampCodec(time_format)
+
+
+# --- Bulk conversion --------------------------------------------------------
+
+def _utc_from_local_array(table, local, ambiguous, nonexistent):
+    """Vectorised ``TransitionTable.utc_from_local`` over an int64 array."""
+    last = table.size - 1
+    j = np.searchsorted(table.local_arr, local, side="right") - 1
+    np.clip(j, 0, last, out=j)
+    nxt = np.minimum(j + 1, last)
+    prev = np.maximum(j - 1, 0)
+
+    off_j = table.offset_arr[j]
+    off_prev = table.offset_arr[prev]
+    valid_j = (j == last) | (local < table.utc_arr[nxt] + off_j)
+    valid_prev = (j >= 1) & (local < table.utc_arr[j] + off_prev)
+
+    offset = np.where(valid_j, off_j, off_prev)  # Unique readings (and the rare "prev only" case).
+
+    overlap = valid_j & valid_prev
+    if overlap.any():
+        if ambiguous == "raise":
+            first = int(local[overlap][0])
+            raise pytz.AmbiguousTimeError(_describe(table, first))
+        dst_j, dst_prev = table.dst_arr[j], table.dst_arr[prev]
+        earliest = np.maximum(off_j, off_prev)
+        latest = np.minimum(off_j, off_prev)
+        if ambiguous == "earliest":
+            chosen = earliest
+        elif ambiguous == "latest":
+            chosen = latest
+        else:  # Mirror pytz: prefer the single reading whose DST flag matches is_dst.
+            is_dst = ambiguous == "dst"
+            match_j = dst_j == is_dst
+            match_prev = dst_prev == is_dst
+            fallback = earliest if is_dst else latest
+            chosen = np.where(match_j & ~match_prev, off_j, np.where(match_prev & ~match_j, off_prev, fallback))
+        offset = np.where(overlap, chosen, offset)
+
+    gap = ~valid_j & ~valid_prev
+    if gap.any():
+        if nonexistent == "raise":
+            first = int(local[gap][0])
+            raise pytz.NonExistentTimeError(_describe(table, first))
+        gap_offset = table.offset_arr[nxt] if nonexistent == "dst" else off_j
+        offset = np.where(gap, gap_offset, offset)
+
+    return local - offset
+
+
+def _local_from_utc_array(table, utc):
+    """Vectorised UTC -> wall clock for ``table``'s zone."""
+    k = np.searchsorted(table.utc_arr, utc, side="right") - 1
+    np.clip(k, 0, table.size - 1, out=k)
+    return utc + table.offset_arr[k]
+
+
+class ConversionPlan:
+    """Everything needed to convert between one (from_tz, to_tz, format) triple, resolved once.
+
+    Holds both zones' transition tables and the compiled timestamp codec, so a
+    conversion is a parse, two binary searches and a format. Build plans with
+    ``get_conversion_plan`` to share them through a bounded LRU.
+    """
+
+    def __init__(self, from_tz, to_tz, time_format=DEFAULT_FORMAT):
+        self.from_tz = from_tz
+        self.to_tz = to_tz
+        self.time_format = time_format
+        self.source = transition_table(from_tz)  # Raises pytz.UnknownTimeZoneError for bad names.
+        self.target = transition_table(to_tz)
+        self.codec = timestamp_codec(time_format)
+        # %f / %z / %Z: the codec would drop microseconds or zone names, so strings go through pytz instead.
+        self.aware = needs_aware_path(time_format)
+        # Merged, de-duplicated UTC instants where either side changes offset.
+        self.transitions = sorted(set(self.source.utc[1:]) | set(self.target.utc[1:]))
+
+    def convert(self, time_str, ambiguous="standard", nonexistent="standard"):
+        """Scalar conversion; identical output to ``time_zone_converter`` with default policies."""
+        _check_policies(ambiguous, nonexistent)
+        if self.aware:
+            return self._convert_aware(time_str, ambiguous, nonexistent)
+        utc = self.source.utc_from_local(self.codec.parse(time_str), ambiguous, nonexistent)
+        return self.codec.format(utc + self.target.offset_at_utc(utc))
+
+    def _convert_aware(self, time_str, ambiguous, nonexistent):
+        """The original ``localize``/``astimezone``/``strftime`` path, for formats the codec cannot represent."""
+        naive = datetime.strptime(time_str, self.time_format)  # %z input is aware, so localize rejects it as before.
+        localized = _localize(pytz.timezone(self.from_tz), naive, ambiguous, nonexistent)
+        return localized.astimezone(pytz.timezone(self.to_tz)).strftime(self.time_format)
+
+    def convert_seconds(self, local_seconds, ambiguous="standard", nonexistent="standard"):
+        """Wall-clock epoch seconds in ``from_tz`` -> wall-clock epoch seconds in ``to_tz``.
+
+        Accepts an int64 NumPy array (vectorised) or any iterable of ints (returns a list).
+        """
+        _check_policies(ambiguous, nonexistent)
+        src, dst = self.source, self.target
+
+        if np is not None and isinstance(local_seconds, np.ndarray):
+            utc = _utc_from_local_array(src, local_seconds.astype(np.int64, copy=False), ambiguous, nonexistent)
+            return _local_from_utc_array(dst, utc)
+
+        out = []
+        for value in local_seconds:
+            utc = src.utc_from_local(value, ambiguous, nonexistent)
+            out.append(utc + dst.offset_at_utc(utc))
+        return out
+
+    def convert_many(self, values, ambiguous="standard", nonexistent="standard"):
+        """Bulk conversion; see the module-level ``convert_many`` for accepted inputs."""
+        _check_policies(ambiguous, nonexistent)
+
+        if np is not None and isinstance(values, np.ndarray) and np.issubdtype(values.dtype, np.datetime64):
+            secs = values.astype("datetime64[s]")
+            nat = np.isnat(secs)
+            raw = secs.astype(np.int64)
+            raw[nat] = 0  # Placeholder so NaT rows never trip the DST policies.
+            converted = self.convert_seconds(raw, ambiguous, nonexistent).astype("datetime64[s]")
+            converted[nat] = np.datetime64("NaT")
+            return converted
+
+        if self.aware:
+            return [self._convert_aware(text, ambiguous, nonexistent) for text in values]
+        if np is not None and self.time_format == DEFAULT_FORMAT:
+            return self._convert_strings_numpy(values, ambiguous, nonexistent)
+
+        parse, fmt = self.codec.parse, self.codec.format
+        seconds = [parse(text) for text in values]
+        return [fmt(s) for s in self.convert_seconds(seconds, ambiguous, nonexistent)]
+
+    def _convert_strings_numpy(self, values, ambiguous, nonexistent):
+        """Default-format strings: NumPy parses and formats in C, the codec only checks odd rows."""
+        text = np.asarray(values, dtype=str)
+        if text.size == 0:
+            return []
+        try:
+            parsed = text.astype("datetime64[s]")
+            # NumPy is more lenient than strptime (e.g. bare dates); round-trip to spot those rows.
+            canonical = np.char.replace(np.datetime_as_string(parsed, unit="s"), "T", " ")
+            odd = canonical != text
+        except ValueError:
+            parsed = np.zeros(text.shape, dtype="datetime64[s]")
+            odd = np.ones(text.shape, dtype=bool)
+
+        raw = parsed.astype(np.int64)
+        for i in np.flatnonzero(odd):  # strptime raises for genuinely bad rows, like the scalar path.
+            raw[i] = self.codec.parse(str(text[i]))
+
+        converted = self.convert_seconds(raw, ambiguous, nonexistent).astype("datetime64[s]")
+        out = np.char.replace(np.datetime_as_string(converted, unit="s"), "T", " ")
+        return out.tolist()
+
+    def offset(self, utc_seconds):
+        """Seconds to add to a ``from_tz`` wall time to get the ``to_tz`` wall time at this instant."""
+        return self.target.offset_at_utc(utc_seconds) - self.source.offset_at_utc(utc_seconds)
+
+    def next_transition(self, utc_seconds):
+        """First UTC instant after ``utc_seconds`` where either zone changes offset, or ``None``.
+
+        ``offset(utc_seconds)`` stays valid for every instant before that boundary,
+        so callers converting a stream of nearby times can reuse it until then.
+        """
+        i = bisect.bisect_right(self.transitions, utc_seconds)
+        return self.transitions[i] if i < len(self.transitions) else None
+
+
+@lru_cache(maxsize=128)
+def get_conversion_plan(from_tz, to_tz, time_format=DEFAULT_FORMAT):
+    """Return the shared ``ConversionPlan`` for this triple (bounded LRU, built on first use)."""
+    return ConversionPlan(from_tz, to_tz, time_format)
+
+
+def convert_seconds(local_seconds, from_tz, to_tz, ambiguous="standard", nonexistent="standard"):
+    """Convert naive wall-clock epoch seconds in ``from_tz`` to wall-clock seconds in ``to_tz``.
+
+    Accepts an int64 NumPy array (vectorised) or any iterable of ints (returns a list).
+    """
+    return get_conversion_plan(from_tz, to_tz).convert_seconds(local_seconds, ambiguous, nonexistent)
+
+
+def convert_many(values, from_tz, to_tz, time_format=DEFAULT_FORMAT, ambiguous="standard", nonexistent="standard"):
+    """Bulk counterpart of ``time_zone_converter``.
+
+    ``values`` may be a NumPy ``datetime64`` array (naive wall times in
+    ``from_tz``; returns ``datetime64[s]`` wall times in ``to_tz``, NaT kept as
+    NaT) or a sequence of strings in ``time_format`` (returns a list of
+    strings). Parse errors raise ``ValueError`` just like the scalar function.
+    """
+    return get_conversion_plan(from_tz, to_tz, time_format).convert_many(values, ambiguous, nonexistent)
@@ -0,0 +1,243 @@
+"""Prebuilt typeahead index over IANA zone names, cities, countries and common aliases."""
+
+import bisect  # Prefix ranges over the sorted key list.
+import unicodedata  # Accent folding ("São Paulo" -> "sao paulo").
+from functools import lru_cache  # One shared default index per process.
+
+# Colloquial names and abbreviations people actually type, mapped to a canonical zone.
+ALIASES = {
+    "ist": "Asia/Kolkata",
+    "india": "Asia/Kolkata",
+    "calcutta": "Asia/Kolkata",
+    "bombay": "Asia/Kolkata",
+    "mumbai": "Asia/Kolkata",
+    "delhi": "Asia/Kolkata",
+    "new delhi": "Asia/Kolkata",
+    "bangalore": "Asia/Kolkata",
+    "bengaluru": "Asia/Kolkata",
+    "est": "America/New_York",
+    "edt": "America/New_York",
+    "eastern": "America/New_York",
+    "nyc": "America/New_York",
+    "cst": "America/Chicago",
+    "cdt": "America/Chicago",
+    "central": "America/Chicago",
+    "mst": "America/Denver",
+    "mdt": "America/Denver",
+    "mountain": "America/Denver",
+    "pst": "America/Los_Angeles",
+    "pdt": "America/Los_Angeles",
+    "pacific": "America/Los_Angeles",
+    "la": "America/Los_Angeles",
+    "san francisco": "America/Los_Angeles",
+    "sf": "America/Los_Angeles",
+    "seattle": "America/Los_Angeles",
+    "akst": "America/Anchorage",
+    "hst": "Pacific/Honolulu",
+    "hawaii": "Pacific/Honolulu",
+    "gmt": "Etc/GMT",
+    "utc": "UTC",
+    "zulu": "UTC",
+    "bst": "Europe/London",
+    "uk": "Europe/London",
+    "cet": "Europe/Paris",
+    "cest": "Europe/Paris",
+    "eet": "Europe/Athens",
+    "msk": "Europe/Moscow",
+    "jst": "Asia/Tokyo",
+    "kst": "Asia/Seoul",
+    "hkt": "Asia/Hong_Kong",
+    "sgt": "Asia/Singapore",
+    "beijing": "Asia/Shanghai",
+    "peking": "Asia/Shanghai",
+    "china": "Asia/Shanghai",
+    "saigon": "Asia/Ho_Chi_Minh",
+    "ho chi minh city": "Asia/Ho_Chi_Minh",
+    "aest": "Australia/Sydney",
+    "aedt": "Australia/Sydney",
+    "acst": "Australia/Adelaide",
+    "awst": "Australia/Perth",
+    "nzst": "Pacific/Auckland",
+    "nzdt": "Pacific/Auckland",
+    "wellington": "Pacific/Auckland",
+    "sao paulo": "America/Sao_Paulo",
+    "brt": "America/Sao_Paulo",
+    "dubai": "Asia/Dubai",
+    "gst": "Asia/Dubai",
+}
+
+# Shown when the query is empty so the dropdown never has to render all ~600 zones.
+POPULAR_ZONES = (
+    "UTC",
+    "America/New_York",
+    "America/Chicago",
+    "America/Denver",
+    "America/Los_Angeles",
+    "America/Sao_Paulo",
+    "Europe/London",
+    "Europe/Paris",
+    "Europe/Berlin",
+    "Europe/Moscow",
+    "Africa/Cairo",
+    "Africa/Johannesburg",
+    "Asia/Dubai",
+    "Asia/Kolkata",
+    "Asia/Singapore",
+    "Asia/Shanghai",
+    "Asia/Tokyo",
+    "Australia/Sydney",
+    "Pacific/Auckland",
+)
+
+# Lower rank sorts first.
+_RANK_EXACT = 0  # Whole zone name, alias, or city typed exactly.
+_RANK_COUNTRY = 1  # Country code or name typed exactly ("us" -> the US zones).
+_RANK_CITY_PREFIX = 2  # Start of the city/alias ("kolk" -> Kolkata).
+_RANK_PREFIX = 3  # Start of the zone name or of any word in it.
+_RANK_FUZZY = 4  # Typo-tolerant trigram match.
+
+
+def normalize(text):
+    """Lower-case, strip accents, and turn ``/ _ -`` into spaces for matching."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    for sep in "/_-":
+        text = text.replace(sep, " ")
+    return " ".join(text.lower().split())
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ZoneSearchIndex:
+    """Prefix + fuzzy search over zone names and everything people call them.
+
+    Keys are the normalised zone name, its city segment (same rule as
+    ``weather_api.city_name_from_timezone``), every individual word, country
+    codes and names, and ``ALIASES``. Prefix queries are a binary search over
+    the sorted keys; fuzzy queries score trigram overlap on city/alias keys.
+    ``links`` maps backward-compatible names (``Asia/Calcutta``) to their
+    canonical zone so duplicates collapse when resolving typed text.
+    """
+
+    def __init__(self, zones, country_zones=None, country_names=None, aliases=None, links=None):
+        self.zones = list(zones)
+        zone_set = set(self.zones)
+        self._canonical = {z.lower(): z for z in self.zones}  # Case-insensitive exact lookup.
+        self._links = {link: zone for link, zone in (links or {}).items() if zone in zone_set}
+        self._aliases = {  # Typed alias -> zone; beats a same-named fixed-offset zone such as "EST".
+            normalize(alias): zone
+            for alias, zone in (aliases if aliases is not None else ALIASES).items()
+            if zone in zone_set
+        }
+        entries = {}  # (key, zone) -> best rank for that pair
+
+        def add(key, zone, rank):
+            if key and zone in zone_set:
+                pair = (key, zone)
+                entries[pair] = min(rank, entries.get(pair, rank))
+
+        for zone in self.zones:
+            add(normalize(zone), zone, _RANK_EXACT)
+            parts = zone.split("/")
+            if len(parts) >= 2:
+                add(normalize(parts[-1]), zone, _RANK_EXACT)  # City segment, e.g. "new york".
+            for word in normalize(zone).split():
+                add(word, zone, _RANK_PREFIX)
+
+        for code, cc_zones in (country_zones or {}).items():
+            name = normalize((country_names or {}).get(code, ""))
+            for zone in cc_zones:
+                add(code.lower(), zone, _RANK_COUNTRY)
+                add(name, zone, _RANK_COUNTRY)
+
+        for alias, zone in self._aliases.items():
+            add(alias, zone, _RANK_EXACT)
+
+        self._keys = sorted((key, rank, zone) for (key, zone), rank in entries.items())
+        self._key_strings = [k for k, _, _ in self._keys]
+        self._names = {}  # Zone/city/alias keys -> zones; these also feed the fuzzy index.
+        for key, rank, zone in self._keys:
+            if rank == _RANK_EXACT:
+                self._names.setdefault(key, []).append(zone)
+        self._trigram_index = {}
+        self._trigram_counts = {key: len(_trigrams(key)) for key in self._names}
+        for key in self._names:
+            for tri in _trigrams(key):
+                self._trigram_index.setdefault(tri, []).append(key)
+
+    def canonical(self, zone):
+        """The zone a backward-compatible link points at (``zone`` itself otherwise)."""
+        return self._links.get(zone, zone)
+
+    def resolve(self, text):
+        """Zone that ``text`` names outright, or ``None`` (partial or ambiguous text).
+
+        An alias wins first (so "EST" means New York, as in the dropdown), then an
+        exact zone name, then a city whose zones are all links to one canonical
+        zone ("calcutta", "Buenos Aires"). Prefixes and typos are only suggestions
+        in ``search``; they never pick a zone the user did not name.
+        """
+        key = normalize(text or "")
+        if not key:
+            return None
+        if key in self._aliases:
+            return self._aliases[key]
+        zone = self._canonical.get(text.strip().lower())
+        if zone:
+            return zone
+        hits = {self.canonical(z) for z in self._names.get(key, ())}
+        return hits.pop() if len(hits) == 1 else None
+
+    def search(self, query, limit=50, fuzzy=True):
+        """Zones matching ``query`` best-first: exact, city prefix, word prefix, then fuzzy."""
+        q = normalize(query)
+        if not q:
+            return [z for z in POPULAR_ZONES if z.lower() in self._canonical][:limit]
+
+        best = {}  # zone -> (rank, tiebreak)
+
+        def offer(zone, rank, tiebreak):
+            score = (rank, tiebreak)
+            if zone not in best or score < best[zone]:
+                best[zone] = score
+
+        lo = bisect.bisect_left(self._key_strings, q)
+        hi = bisect.bisect_left(self._key_strings, q + "\uffff")
+        for key, rank, zone in self._keys[lo:hi]:
+            if key == q:  # Whole-name/alias hits first (the alias itself on top); an exact word keeps prefix rank.
+                offer(zone, rank, -1 if self._aliases.get(q) == zone else 0)
+            else:
+                offer(zone, _RANK_CITY_PREFIX if rank == _RANK_EXACT else _RANK_PREFIX, len(key))
+
+        if fuzzy and not best and len(q) >= 3:  # Typo fallback only when nothing matched directly.
+            query_tris = _trigrams(q)
+            overlap = {}
+            for tri in query_tris:
+                for key in self._trigram_index.get(tri, ()):
+                    overlap[key] = overlap.get(key, 0) + 1
+            for key, shared in overlap.items():
+                similarity = shared / (len(query_tris) + self._trigram_counts[key] - shared)  # Jaccard.
+                if similarity >= 0.3:
+                    for zone in self._names[key]:
+                        offer(zone, _RANK_FUZZY, -similarity)
+
+        ranked = sorted(best, key=lambda z: (best[z], z))
+        return ranked[:limit]
+
+
+@lru_cache(maxsize=1)
+def default_index():
+    """Index over every pytz zone with pytz's country tables (built once, on first use)."""
+    import pytz  # Deferred with the rest of the zone data.
+
+    import zone_table  # tzdata.zi link lines, shared with the offline coordinate table.
+
+    return ZoneSearchIndex(
+        pytz.all_timezones,
+        country_zones={cc: pytz.country_timezones[cc] for cc in pytz.country_timezones},
+        country_names=dict(pytz.country_names),
+        links=zone_table.read_links(pytz),
+    )
@@ -0,0 +1,294 @@
+"""Streaming command-line converter (the console mode of Tzpy, without wx).
+
+Reads newline-delimited timestamps or CSV/TSV rows from files or stdin and
+writes converted values to stdout, in constant memory: records flow through a
+generator pipeline in fixed-size text chunks, and each chunk is parsed,
+converted with one ``tz_engine.convert_many`` call per (from, to) zone pair,
+and formatted back to text. ``--jobs N`` hands chunks to a process pool as
+plain strings (cheap to pickle) while keeping output order; it only pays off
+on multi-core machines, where parsing and formatting dominate::
+
+    python tzpy_cli.py --from US/Eastern --to Asia/Tokyo times.txt
+    python tzpy_cli.py --format csv --time-column ts --from-column src_tz --to Asia/Tokyo logs.csv > out.csv
+    zcat huge.log.gz | python tzpy_cli.py --from UTC --to Europe/Paris --jobs 4 > local.txt
+
+Run without arguments at a terminal for the interactive prompt.
+"""
+
+import argparse  # Command line.
+import csv  # CSV/TSV streaming.
+import io  # Text wrappers for stdin/stdout.
+import os  # Extension-based format detection.
+import sys  # Streams + exit status.
+import time  # rows/sec report.
+from collections import deque  # Bounded window of in-flight pool batches.
+from concurrent.futures import ProcessPoolExecutor  # --jobs
+
+from tzpy_core import DEFAULT_FORMAT, time_zone_converter
+
+DEFAULT_BATCH_ROWS = 10_000  # Records per chunk (and per pool task).
+FORMATS = ("lines", "csv", "tsv")
+
+
+# --- Pipeline stages ---------------------------------------------------------
+
+def read_records(paths, fmt):
+    """Yield raw newline-terminated records from each path (``-`` = stdin) without loading whole files.
+
+    A CSV/TSV record continues onto the next line while a quoted field is open
+    (odd number of ``"`` so far), so chunk boundaries never split a row.
+    """
+    for path in paths or ["-"]:
+        if path == "-":
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+            close = False
+        else:
+            stream = open(path, encoding="utf-8", newline="")
+            close = True
+        try:
+            pending, quotes = "", 0
+            for line in stream:
+                if fmt == "lines":
+                    if line.rstrip("\r\n"):
+                        yield line if line.endswith("\n") else line + "\n"
+                    continue
+                pending += line
+                quotes += line.count('"')
+                if quotes % 2 == 0:
+                    yield pending if pending.endswith("\n") else pending + "\n"
+                    pending, quotes = "", 0
+            if pending:  # Unterminated quote at EOF: let the csv module report it as it sees fit.
+                yield pending if pending.endswith("\n") else pending + "\n"
+        finally:
+            if close:
+                stream.close()
+
+
+def chunked(records, size):
+    """Join an iterator of records into text chunks of at most ``size`` records."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def parse_chunk(text, fmt):
+    """Rows (lists of fields) of one text chunk."""
+    if fmt == "lines":
+        return [[line.rstrip("\r")] for line in text.split("\n") if line.rstrip("\r")]
+    return list(csv.reader(io.StringIO(text, newline=""), delimiter="\t" if fmt == "tsv" else ","))
+
+
+def convert_batch(batch, spec):
+    """Convert one batch; returns ``(values, errors)`` with ``None`` for rows that failed.
+
+    ``spec`` is ``(time_idx, from_idx, to_idx, default_from, default_to, time_format)``;
+    a ``None`` index means the default zone applies to every row. Module-level so
+    process-pool workers can run it.
+    """
+    import tz_engine  # Deferred: keeps --help and the interactive prompt instant.
+
+    time_idx, from_idx, to_idx, default_from, default_to, time_format = spec
+    values = [None] * len(batch)
+    groups = {}  # (from_tz, to_tz) -> row positions
+    for i, row in enumerate(batch):
+        try:
+            from_tz = row[from_idx] if from_idx is not None else default_from
+            to_tz = row[to_idx] if to_idx is not None else default_to
+            row[time_idx]
+        except IndexError:
+            continue  # Short row: reported as an error.
+        groups.setdefault((from_tz, to_tz), []).append(i)
+
+    for (from_tz, to_tz), positions in groups.items():
+        times = [batch[i][time_idx].strip() for i in positions]
+        try:
+            converted = tz_engine.convert_many(times, from_tz, to_tz, time_format)
+        except (ValueError, KeyError):  # A bad value or zone in this group: isolate it row by row.
+            converted = []
+            for t in times:
+                try:
+                    converted.append(time_zone_converter(t, from_tz, to_tz, time_format))
+                except (ValueError, KeyError):
+                    converted.append(None)
+        for i, value in zip(positions, converted):
+            values[i] = value
+    return values, sum(v is None for v in values)
+
+
+def convert_chunk(text, spec, fmt, on_error):
+    """Parse, convert and format one text chunk; returns ``(output_text, rows, errors, first_bad)``.
+
+    Text in and text out keeps pool traffic to two strings per chunk.
+    ``first_bad`` is ``(index, row)`` of the first unconvertible row, or ``None``.
+    """
+    rows = parse_chunk(text, fmt)
+    values, errors = convert_batch(rows, spec)
+    first_bad = None
+    if errors:
+        bad = next(i for i, v in enumerate(values) if v is None)
+        first_bad = (bad, rows[bad])
+    keep_empty = on_error == "empty"
+    if fmt == "lines":
+        out = "".join(f"{v}\n" if v is not None else "\n" for v in values if v is not None or keep_empty)
+    else:
+        buffer = io.StringIO()
+        csv.writer(buffer, delimiter="\t" if fmt == "tsv" else ",", lineterminator="\n").writerows(
+            row + [v if v is not None else ""] for row, v in zip(rows, values) if v is not None or keep_empty
+        )
+        out = buffer.getvalue()
+    return out, len(rows), errors, first_bad
+
+
+def _converted_chunks(chunks, spec, fmt, on_error, jobs):
+    """Yield ``convert_chunk`` results in input order, optionally via a process pool."""
+    if jobs <= 1:
+        for text in chunks:
+            yield convert_chunk(text, spec, fmt, on_error)
+        return
+
+    window = deque()  # At most 2 * jobs chunks in flight keeps memory flat for any input size.
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for text in chunks:
+            window.append(pool.submit(convert_chunk, text, spec, fmt, on_error))
+            if len(window) >= 2 * jobs:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+
+# --- Column handling ---------------------------------------------------------
+
+def _column_index(header, column, option):
+    """Resolve a column given by name (needs a header) or 0-based index."""
+    if column is None:
+        return None
+    if column.isdigit():
+        return int(column)
+    if header is None:
+        raise SystemExit(f"{option} {column!r} needs a header row (or use a 0-based index).")
+    try:
+        return header.index(column)
+    except ValueError:
+        raise SystemExit(f"{option} {column!r} is not in the header: {', '.join(header)}")
+
+
+def detect_format(paths, requested):
+    if requested:
+        return requested
+    ext = os.path.splitext(paths[0])[1].lower() if paths and paths[0] != "-" else ""
+    return {".csv": "csv", ".tsv": "tsv", ".tab": "tsv"}.get(ext, "lines")
+
+
+# --- Entry points --------------------------------------------------------------
+
+def run(args, out=None):
+    """Stream the conversion described by parsed ``args``; returns ``(rows, errors, seconds)``."""
+    out = out or sys.stdout
+    fmt = detect_format(args.inputs, args.format)
+    records = read_records(args.inputs, fmt)
+    started = time.perf_counter()
+
+    header = None
+    if fmt != "lines" and not args.no_header:
+        first = next(records, None)
+        if first is None:
+            return 0, 0, 0.0
+        header = parse_chunk(first, fmt)[0]
+    if fmt == "lines":
+        time_idx, from_idx, to_idx = 0, None, None
+    else:
+        time_idx = _column_index(header, args.time_column, "--time-column")
+        if time_idx is None:
+            time_idx = header.index("time") if header and "time" in header else 0
+        from_idx = _column_index(header, args.from_column, "--from-column")
+        to_idx = _column_index(header, args.to_column, "--to-column")
+    if from_idx is None and not args.from_tz:
+        raise SystemExit("Give --from (or --from-column for per-row source zones).")
+    if to_idx is None and not args.to_tz:
+        raise SystemExit("Give --to (or --to-column for per-row target zones).")
+    spec = (time_idx, from_idx, to_idx, args.from_tz, args.to_tz, args.time_format)
+
+    if header is not None:
+        csv.writer(out, delimiter="\t" if fmt == "tsv" else ",", lineterminator="\n").writerow(
+            header + [args.output_column]
+        )
+
+    total = errors = 0
+    chunks = chunked(records, args.batch_rows)
+    for text, rows, chunk_errors, first_bad in _converted_chunks(chunks, spec, fmt, args.on_error, args.jobs):
+        if first_bad is not None and args.on_error == "fail":
+            bad, row = first_bad
+            raise SystemExit(f"Row {total + bad + 1}: cannot convert {row!r}")
+        total += rows
+        errors += chunk_errors
+        out.write(text)
+    return total, errors, time.perf_counter() - started
+
+
+def interactive():
+    """The original console demo: prompt for one time and two zones, print the conversion."""
+    print("=== pytz Time Zone Converter ===")  # Display a heading when running via console.
+    print("Example: 2024-01-15 14:30:00")  # Show an example of the expected datetime format.
+
+    time_str = input("Enter time (YYYY-MM-DD HH:MM:SS): ")  # Prompt for the source datetime string.
+    from_tz = input("Enter source timezone (e.g., US/Eastern): ")  # Prompt for the source timezone name.
+    to_tz = input("Enter target timezone (e.g., Asia/Tokyo): ")  # Prompt for the destination timezone name.
+
+    try:
+        result = time_zone_converter(time_str, from_tz, to_tz)  # Perform the conversion using console input.
+    except (ValueError, KeyError) as e:
+        print(f"\n❌ Invalid time or timezone: {e}")
+        return 1
+
+    print(f"\n🔄 Conversion Result:")  # Label the output section for clarity.
+    print(f"📍 {from_tz}: {time_str}")  # Echo the original timezone and time.
+    print(f"🎯 {to_tz}: {result}")  # Echo the converted timezone and time.
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Convert timestamps between timezones in bulk (streaming).")
+    parser.add_argument("inputs", nargs="*", help="Input files ('-' or nothing for stdin).")
+    parser.add_argument("--from", dest="from_tz", help="Source zone for every row.")
+    parser.add_argument("--to", dest="to_tz", help="Target zone for every row.")
+    parser.add_argument("--format", choices=FORMATS, help="Input format (default: from extension, else lines).")
+    parser.add_argument("--time-column", help="CSV/TSV column with the timestamp (name or 0-based index).")
+    parser.add_argument("--from-column", help="CSV/TSV column holding a per-row source zone.")
+    parser.add_argument("--to-column", help="CSV/TSV column holding a per-row target zone.")
+    parser.add_argument("--output-column", default="converted", help="Header for the appended CSV/TSV column.")
+    parser.add_argument("--no-header", action="store_true", help="CSV/TSV input has no header row.")
+    parser.add_argument("--time-format", default=DEFAULT_FORMAT, help="strptime/strftime format of the timestamps.")
+    parser.add_argument("--on-error", choices=("empty", "skip", "fail"), default="empty",
+                        help="Unconvertible rows: write an empty value (default), drop them, or stop.")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes (default 1 = this process). Only worth it on multi-core machines "
+                             "with large inputs; compare the rows/s summary.")
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS, help="Records per chunk.")
+    parser.add_argument("--quiet", action="store_true", help="Do not print the rows/sec summary to stderr.")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv and sys.stdin.isatty():
+        return interactive()
+
+    args = build_parser().parse_args(argv)
+    try:
+        total, errors, seconds = run(args)
+    except BrokenPipeError:  # e.g. piped into `head`.
+        sys.stderr.close()
+        return 0
+    if not args.quiet:
+        rate = total / seconds if seconds else 0.0
+        print(f"{total:,} rows in {seconds:.2f}s ({rate:,.0f} rows/s), {errors:,} errors", file=sys.stderr)
+    return 1 if errors and args.on_error == "fail" else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""GUI-free core of Tzpy: conversion, time-of-day bucketing, and background theme lookup.
+
+Importing this module has no side effects and pulls in no GUI toolkit; the
+timezone database is only loaded on first use. ``Tzpy.py`` builds the wx
+window on top of these helpers, and services/tests can use them directly.
+"""
+
+from datetime import time  # Bucket boundaries.
+
+DEFAULT_FORMAT = "%Y-%m-%d %H:%M:%S"  # Format used by every input/output field in the app.
+
+# Catalog mapping (time_bucket, condition) to the art asset used for the backdrop.
+# Keeping it as one dictionary lets back_fore_ground perform a single lookup per refresh.
+BACKGROUND_IMAGES = {
+    # PRE-DAWN / NIGHT BEFORE SUNRISE
+    ("pre_dawn", "clear"):  "images/pre_dawn_clear.png",
+    ("pre_dawn", "cloudy"): "images/pre_dawn_cloudy.png",
+    ("pre_dawn", "rain"):   "images/pre_dawn_rain.png",
+    ("pre_dawn", "snow"):   "images/pre_dawn_snow.png",
+    ("pre_dawn", "storm"):  "images/pre_dawn_storm.png",
+    # SUNRISE
+    ("sunrise", "clear"):   "images/morning_clear.png",
+    ("sunrise", "cloudy"):  "images/morning_cloudy.png",
+    ("sunrise", "rain"):    "images/morning_rain.png",
+    ("sunrise", "snow"):    "images/morning_snow.png",
+    ("sunrise", "storm"):   "images/morning_storm.png",
+
+    # MORNING – AFTER SUNRISE
+    ("morning", "clear"):   "images/after_morning_clear.png",
+    ("morning", "cloudy"):  "images/after_morning_cloudy.png",
+    ("morning", "rain"):    "images/after_morning_rain.png",
+    ("morning", "snow"):    "images/after_morning_snow.png",
+    ("morning", "storm"):   "images/after_morning_storm.png",
+    # DAYTIME
+    ("day", "clear"):       "images/day_clear.png",
+    ("day", "cloudy"):      "images/day_cloudy.png",
+    ("day", "rain"):        "images/day_rain.png",
+    ("day", "snow"):        "images/day_snow.png",
+    ("day", "storm"):       "images/day_storm.png",
+
+    # EVENING / SUNSET
+    ("evening", "clear"):   "images/evening_clear.png",
+    ("evening", "cloudy"):  "images/evening_cloudy.png",
+    ("evening", "rain"):    "images/evening_rain.png",
+    ("evening", "snow"):    "images/evening_snow.png",
+    ("evening", "storm"):   "images/evening_storm.png",
+
+    # NIGHT TIME
+    ("night", "clear"):     "images/night_clear.png",
+    ("night", "cloudy"):    "images/night_cloudy.png",
+    ("night", "rain"):      "images/night_rain.png",
+    ("night", "snow"):      "images/night_snow.png",
+    ("night", "storm"):     "images/night_storm.png",
+}
+
+
+def time_zone_converter(time_str, from_tz, to_tz, time_format=DEFAULT_FORMAT):
+    """Localize the provided datetime to `from_tz`, convert it into `to_tz`, and return a formatted string."""
+    import tz_engine  # Deferred so importing the core stays cheap.
+
+    # The plan for this (from, to, format) triple is built once and reused from an LRU, so repeat
+    # conversions skip zone lookups and format parsing; DST handling matches pytz's localize().
+    plan = tz_engine.get_conversion_plan(from_tz, to_tz, time_format)
+    return plan.convert(time_str)  # Return a string using the original format for UI display.
+
+
+def time_bucket_for(t_obj):
+    """Translate a datetime.time into ``(time_bucket, text_mode)`` for the themed backgrounds."""
+    if time(0, 0, 0) <= t_obj < time(4, 0, 0):
+        return "pre_dawn", "light"  # After midnight but before sunrise glow.
+    if time(4, 0, 0) <= t_obj < time(6, 0, 0):
+        return "sunrise", "light"  # Warm tones, sun just peeking out.
+    if time(6, 0, 0) <= t_obj < time(10, 0, 0):
+        return "morning", "dark"  # Cooler daylight palette.
+    if time(10, 0, 0) <= t_obj < time(17, 0, 0):
+        return "day", "dark"  # Bright ambient midday art.
+    if time(17, 0, 0) <= t_obj < time(20, 0, 0):
+        return "evening", "dark"  # Sunset / twilight gradients.
+    return "night", "light"  # Deep night sky.
+
+
+def background_image_for(time_bucket, condition):
+    """Asset path for a (bucket, condition) pair, falling back to the clear-sky variant."""
+    img_path = BACKGROUND_IMAGES.get((time_bucket, condition))
+    if img_path is None:
+        img_path = BACKGROUND_IMAGES.get((time_bucket, "clear"))
+    return img_path
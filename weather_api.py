@@ -1,7 +1,85 @@
 """Helper module that owns every network call for weather + basic condition tagging."""
 
 import requests  # Open-Meteo and geocoding HTTP client.
-from datetime import datetime, date  # Parsing helpers and "today" reference.
+from array import array  # Compact typed columns when NumPy is unavailable.
+from datetime import datetime, date, timedelta  # Parsing helpers and "today" reference.
+
+try:  # NumPy is optional: series results use datetime64/typed ndarrays when it is installed.
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+import metrics  # Stage timings (no-ops unless enabled).
+from http_client import HttpClient, decode_json  # Pooled session with retries + per-host rate limiting.
+from weather_cache import DayPayloadCache, GeocodeCache  # Geocode + day payload caches.
+import zone_table  # Offline coordinates from the tz database (zone.tab / zone1970.tab).
+
+GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"  # Open-Meteo geocoder.
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"  # Present/future hourly data.
+ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"  # Historical hourly data.
+HOURLY_VARIABLES = "temperature_2m,relative_humidity_2m,precipitation,weathercode,cloudcover"
+
+# Row field -> Open-Meteo hourly variables it needs (minimal fetches request only these).
+ROW_FIELDS = {
+    "temperature": ("temperature_2m",),
+    "humidity": ("relative_humidity_2m",),
+    "precipitation": ("precipitation",),
+    "weathercode": ("weathercode",),
+    "cloudcover": ("cloudcover",),
+    "condition": ("weathercode", "precipitation", "cloudcover"),
+}
+
+# Shared geocode cache; swap it with configure_geocode_cache() to change TTLs or limits.
+geocode_cache = GeocodeCache()
+
+# Decoded hourly day payloads so browsing hour-to-hour never re-downloads the same day.
+day_cache = DayPayloadCache()
+
+# One-hour "minimal" payloads, kept apart so bursts of single-hour lookups never evict whole days.
+hour_cache = DayPayloadCache(maxsize=64)
+
+_client = None  # Shared HttpClient, created on first use.
+
+
+def get_client():
+    """Return the shared HTTP client, creating the default pooled client on first use."""
+    global _client
+    if _client is None:
+        _client = HttpClient()
+    return _client
+
+
+def configure_client(client=None, **options):
+    """Install ``client`` (or a new ``HttpClient(**options)``) for every call in this module.
+
+    Pass ``transport=`` or ``base_url_overrides=`` to point the module at a local stub server.
+    """
+    global _client
+    if _client is not None and _client is not client:
+        _client.close()
+    _client = client if client is not None else HttpClient(**options)
+    return _client
+
+
+def configure_geocode_cache(**options):
+    """Replace the shared geocode cache (e.g. new TTL, size limits, path, or ``persistent=False``)."""
+    global geocode_cache
+    geocode_cache = GeocodeCache(**options)
+    return geocode_cache
+
+
+def configure_day_cache(**options):
+    """Replace the shared day payload cache (e.g. a different forecast TTL or stale window)."""
+    global day_cache
+    day_cache = DayPayloadCache(**options)
+    return day_cache
+
+
+def configure_hour_cache(**options):
+    """Replace the shared one-hour payload cache used by minimal lookups."""
+    global hour_cache
+    hour_cache = DayPayloadCache(**options)
+    return hour_cache
 
 
 def classify_condition(weathercode, precip, cloudcover):
@@ -37,6 +115,117 @@ def classify_condition(weathercode, precip, cloudcover):
     # --- Default ---
     return "clear"
 
+
+# --- Batch classification ---------------------------------------------------
+
+CONDITION_LABELS = ("clear", "cloudy", "rain", "snow", "storm")  # Index = precedence in classify_condition.
+_RANK = {label: rank for rank, label in enumerate(CONDITION_LABELS)}
+# WMO code -> label index, derived from the scalar rules so both paths can never drift apart.
+CODE_RANKS = tuple(_RANK[classify_condition(code, 0, 0)] for code in range(100))
+
+
+def _code_rank(code):
+    """Scalar LUT lookup; missing or out-of-range codes carry no code-based label."""
+    if code is None or code != code or not 0 <= code < 100 or code != int(code):  # None/NaN/-1/fractional.
+        return 0
+    return CODE_RANKS[int(code)]
+
+
+def _numeric(values):
+    """Column as a numeric ndarray; object input (e.g. lists holding None) becomes float64 with NaN."""
+    arr = np.asarray(values)
+    return arr if arr.dtype.kind in "fiu" else arr.astype(np.float64)
+
+
+def classify_condition_ranks(weathercodes, precip, cloudcover):
+    """Label indexes into ``CONDITION_LABELS`` for whole columns at once.
+
+    Storm and snow codes win outright; otherwise the most severe of the code's
+    own label, rain (``precip > 0.1``) and cloudy (``cloudcover >= 60``) is
+    kept, which is exactly the precedence of ``classify_condition``. Missing
+    values (None/NaN, code -1) simply fail their threshold. Returns a uint8
+    ndarray with NumPy, otherwise a list of ints.
+    """
+
+    if np is not None:
+        codes = np.asarray(weathercodes, dtype=np.float64)
+        valid = (codes >= 0) & (codes < 100) & (codes == np.floor(codes))  # NaN compares False.
+        ranks = np.where(valid, np.asarray(CODE_RANKS, dtype=np.uint8)[np.where(valid, codes, 0).astype(np.intp)], 0)
+        with np.errstate(invalid="ignore"):  # Compare in the column's own dtype, as the scalar path would.
+            wet = _numeric(precip) > 0.1
+            cloudy = _numeric(cloudcover) >= 60
+        weather = np.maximum(np.where(wet, _RANK["rain"], 0), np.where(cloudy, _RANK["cloudy"], 0))
+        return np.where(ranks >= _RANK["snow"], ranks, np.maximum(ranks, weather)).astype(np.uint8)
+
+    ranks = []
+    for code, p, c in zip(weathercodes, precip, cloudcover):
+        rank = _code_rank(code)
+        if rank < _RANK["snow"]:
+            if p is not None and p > 0.1:
+                rank = max(rank, _RANK["rain"])
+            if c is not None and c >= 60:
+                rank = max(rank, _RANK["cloudy"])
+        ranks.append(rank)
+    return ranks
+
+
+def classify_conditions(weathercodes, precip, cloudcover):
+    """Vectorised ``classify_condition``: one label per hour (string ndarray or list)."""
+    ranks = classify_condition_ranks(weathercodes, precip, cloudcover)
+    if np is not None:
+        return np.asarray(CONDITION_LABELS)[ranks]
+    return [CONDITION_LABELS[r] for r in ranks]
+
+
+def _day_key(stamp):
+    """Calendar day of a series timestamp (ISO string, datetime, or local epoch seconds)."""
+    if isinstance(stamp, str):
+        return stamp[:10]
+    if isinstance(stamp, int):
+        return (date(1970, 1, 1) + timedelta(days=stamp // 86400)).isoformat()
+    return stamp.date().isoformat()
+
+
+def summarize_conditions(times, weathercodes, precip, cloudcover):
+    """Classify hourly columns and aggregate them in the same pass.
+
+    Returns ``labels`` (per hour), ``histogram`` (label -> hour count) and
+    ``daily`` (``YYYY-MM-DD`` -> dominant label, ties going to the more severe
+    condition). Accepts the columns of ``get_weather_series`` directly.
+    """
+
+    ranks = classify_condition_ranks(weathercodes, precip, cloudcover)
+    n = len(CONDITION_LABELS)
+
+    if np is not None and isinstance(ranks, np.ndarray):
+        counts = np.bincount(ranks, minlength=n)
+        stamps = np.asarray(times)
+        if stamps.dtype.kind == "M":
+            days = stamps.astype("datetime64[D]")
+        elif stamps.dtype.kind in "iu":  # Local epoch seconds from the array fallback.
+            days = (stamps // 86400).astype("datetime64[D]")
+        else:
+            days = np.array([_day_key(t) for t in stamps.tolist()], dtype="datetime64[D]")
+        unique_days, day_index = np.unique(days, return_inverse=True)
+        per_day = np.bincount(day_index * n + ranks, minlength=len(unique_days) * n).reshape(-1, n)
+        dominant = n - 1 - per_day[:, ::-1].argmax(axis=1)  # Reversed so ties pick the most severe.
+        return {
+            "labels": np.asarray(CONDITION_LABELS)[ranks],
+            "histogram": dict(zip(CONDITION_LABELS, counts.tolist())),
+            "daily": {str(d): CONDITION_LABELS[r] for d, r in zip(unique_days, dominant.tolist())},
+        }
+
+    counts = [0] * n
+    per_day = {}
+    for stamp, rank in zip(times, ranks):
+        counts[rank] += 1
+        per_day.setdefault(_day_key(stamp), [0] * n)[rank] += 1
+    return {
+        "labels": [CONDITION_LABELS[r] for r in ranks],
+        "histogram": dict(zip(CONDITION_LABELS, counts)),
+        "daily": {day: CONDITION_LABELS[max(range(n), key=lambda r: (c[r], r))] for day, c in per_day.items()},
+    }
+
 def city_name_from_timezone(tz_name): # Helper for extracting the city portion.
     """Return the city component of a Continent/City timezone."""
 
@@ -47,107 +236,545 @@ def city_name_from_timezone(tz_name): # Helper for extracting the city portion.
 
 
 def get_location_from_timezone(tz_name):  # Resolve geocoding metadata for a timezone.
-    """Geocode the timezone-derived city and return lat/lon plus display info."""
+    """Resolve lat/lon plus display info from the offline zone table, geocoding the city as a fallback."""
+
+    location = zone_table.lookup(tz_name)  # O(1), no HTTP: covers every canonical zone + common links.
+    if location is not None:
+        metrics.inc("geocode.zone_table")
+        return location
 
     city = city_name_from_timezone(tz_name)  # Derive the lookup keyword from the timezone string.
 
-    url = "https://geocoding-api.open-meteo.com/v1/search"  # Base geocoding endpoint.
+    found, cached = geocode_cache.get(tz_name)  # Memory LRU first, then the on-disk store.
+    if found:
+        metrics.inc("geocode.cache_hit")
+        if cached is None:  # Cached negative result: the geocoder had no match last time.
+            raise ValueError(f"Could not find location for city derived from timezone: {tz_name}")
+        return cached
+
+    url = GEOCODING_URL  # Base geocoding endpoint.
 
     params = {"name": city, "count": 1}  # Ask for the best match only.
 
+    metrics.inc("geocode.network")
     try:  # Attempt the HTTP request.
-        resp = requests.get(url, params=params, timeout=10)  # Call Open-Meteo's geocoder.
+        with metrics.span("geocode.http"):
+            resp = get_client().get(url, params=params, timeout=10)  # Call Open-Meteo's geocoder.
         resp.raise_for_status()  # Raise if the response indicates failure.
     except requests.exceptions.RequestException as e:
         raise RuntimeError(f"Network/API error while geocoding: {e}")  # Repackage network issues.
 
-    data = resp.json()  # Decode JSON body.
+    with metrics.span("geocode.decode"):
+        data = decode_json(resp)  # Decode JSON body (orjson/ujson when installed).
 
     if "results" not in data or not data["results"]:
+        geocode_cache.put_negative(tz_name)  # Remember the miss so repeat clicks stay offline.
         raise ValueError(f"Could not find location for city derived from timezone: {tz_name}")  # Fail if no hits.
 
     r = data["results"][0]  # Take the top hit returned by the service.
 
-    return (
+    location = (
         r["latitude"],  # Latitude that drives weather queries.
         r["longitude"],  # Longitude that drives weather queries.
         r.get("name", city),  # Display name for UI output (fallback to derived city).
         r.get("country_code", "")  # ISO country code if provided.
     )
+    geocode_cache.put(tz_name, location)  # Network errors above are never cached, only real answers.
+    return location
 
 
-def get_weather_for_datetime(dt_str: str, tz_name: str):
-    """Fetch the hourly weather slice that matches the provided datetime + timezone."""
+def endpoint_for_date(day):
+    """Pick the archive endpoint for past days and the forecast endpoint otherwise."""
+    return ARCHIVE_URL if day < date.today() else FORECAST_URL
 
-    # Parse once and clamp minutes/seconds because Open-Meteo only exposes full hours.
-    dt_requested = datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S").replace(minute=0, second=0)
 
-    # Timezone → best-guess city → geocoded coordinates.
-    lat, lon, city_name, country_code = get_location_from_timezone(tz_name)
+def _fetch_hourly_day(url, lat, lon, date_str, tz_name):
+    """Download one day of hourly variables and return the decoded ``hourly`` block."""
+    return _fetch_hourly_range(url, lat, lon, date_str, date_str, tz_name)
 
-    date_str = dt_requested.strftime("%Y-%m-%d")  # Common date string for both APIs.
 
-    url = (
-        "https://archive-api.open-meteo.com/v1/archive"  # Historical endpoint.
-        if dt_requested.date() < date.today()  # Use archive for past dates.
-        else "https://api.open-meteo.com/v1/forecast"  # Forecast endpoint for present/future.
-    )  # Choose the endpoint based on whether the datetime is past or present/future.
+def _fetch_hourly_range(url, lat, lon, start_str, end_str, tz_name):
+    """Download hourly variables for an inclusive local date range and return the ``hourly`` block."""
+    return _fetch_hourly(url, {
+        "latitude": lat,
+        "longitude": lon,
+        "hourly": HOURLY_VARIABLES,
+        "timezone": tz_name,
+        "start_date": start_str,
+        "end_date": end_str,
+    })
 
-    params = {
+
+def _fetch_hourly_window(url, lat, lon, start_hour, end_hour, tz_name, variables):
+    """Download only ``variables`` for local hours ``start_hour..end_hour`` (``YYYY-MM-DDTHH:MM``, inclusive).
+
+    Open-Meteo's ``start_hour``/``end_hour`` replace the date range, so a
+    single-hour lookup transfers and decodes one row instead of 24.
+    """
+    return _fetch_hourly(url, {
         "latitude": lat,
         "longitude": lon,
-        "hourly": "temperature_2m,relative_humidity_2m,precipitation,weathercode,cloudcover",
+        "hourly": ",".join(variables),
         "timezone": tz_name,
-        "start_date": date_str,
-        "end_date": date_str,
-    }
+        "start_hour": start_hour,
+        "end_hour": end_hour,
+    })
 
+
+def _fetch_hourly(url, params):
+    """Run one hourly request and return the decoded ``hourly`` block."""
+
+    stage = "archive" if url == ARCHIVE_URL else "forecast"
     try:  # Execute the weather call and ensure success.
-        resp = requests.get(url, params=params, timeout=10)  # Execute the actual weather call.
+        with metrics.span(f"weather.http.{stage}"):
+            resp = get_client().get(url, params=params, timeout=10)  # Execute the actual weather call.
         resp.raise_for_status()  # Surface HTTP failures.
     except requests.exceptions.RequestException as e:
         raise RuntimeError(f"Network/API error while fetching weather: {e}")
 
-    data = resp.json()  # Parse the returned JSON content.
+    with metrics.span("weather.decode"):
+        data = decode_json(resp)  # Parse the returned JSON content.
+    return data.get("hourly", {})
 
-    hourly = data.get("hourly", {})
-    times  = hourly.get("time", [])
-    temps  = hourly.get("temperature_2m", [])
-    hums   = hourly.get("relative_humidity_2m", [])
-    precs  = hourly.get("precipitation", [])
-    codes  = hourly.get("weathercode", [])
-    clouds = hourly.get("cloudcover", [])
+
+def get_hourly_day(lat, lon, date_str, tz_name):
+    """Return the decoded hourly payload for one local day, reusing cached days when possible."""
+
+    url = endpoint_for_date(date.fromisoformat(date_str))  # Archive vs forecast.
+    key = (lat, lon, date_str, tz_name, url)
+    return day_cache.get_or_fetch(
+        key,
+        lambda: _fetch_hourly_day(url, lat, lon, date_str, tz_name),
+        immutable=(url == ARCHIVE_URL),  # Archived days never change once published.
+    )
+
+
+def _fields_and_variables(fields):
+    """Validate requested row fields and return ``(fields, hourly variables they need)``."""
+    fields = tuple(ROW_FIELDS) if fields is None else tuple(fields)
+    unknown = [f for f in fields if f not in ROW_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown weather field(s): {', '.join(unknown)} (choose from {', '.join(ROW_FIELDS)})")
+    variables = []
+    for field in fields:
+        variables.extend(v for v in ROW_FIELDS[field] if v not in variables)
+    return fields, variables
 
 
+def get_weather_for_datetime(dt_str: str, tz_name: str, fields=None, minimal=False):
+    """Fetch the hourly weather slice that matches the provided datetime + timezone.
+
+    ``fields`` limits the returned row to those ``ROW_FIELDS`` keys (location
+    and time are always included). ``minimal=True`` skips the full-day
+    download: unless the day is already cached, only the requested hour and
+    the variables behind ``fields`` are fetched (cached per hour). That suits
+    one-off lookups; hour-by-hour browsing is cheaper with whole cached days.
+    """
+    fields, variables = _fields_and_variables(fields)
+
+    # Parse once and clamp minutes/seconds because Open-Meteo only exposes full hours.
+    dt_requested = datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S").replace(minute=0, second=0)
+
+    metrics.inc("weather.requests")
+    # Timezone → best-guess city → geocoded coordinates.
+    with metrics.span("weather.geocode"):
+        location = get_location_from_timezone(tz_name)
+    lat, lon = location[0], location[1]
+
+    date_str = dt_requested.strftime("%Y-%m-%d")  # Common date string for both APIs.
+
+    if minimal:
+        with metrics.span("weather.hour"):  # Includes the HTTP call + decode on a cache miss.
+            hourly = get_hourly_window(lat, lon, dt_requested, tz_name, variables)
+    else:
+        with metrics.span("weather.day"):  # Includes the HTTP call + decode on a day cache miss.
+            hourly = get_hourly_day(lat, lon, date_str, tz_name)  # Served from day_cache when possible.
+    with metrics.span("weather.row"):
+        return _weather_row(hourly, dt_requested, location, fields)
+
+
+def get_hourly_window(lat, lon, dt_requested, tz_name, variables):
+    """Hourly block covering ``dt_requested``: a cached full day if there is one, else a one-hour fetch."""
+
+    day = dt_requested.date()
+    url = endpoint_for_date(day)
+    hourly = day_cache.peek((lat, lon, day.isoformat(), tz_name, url))
+    if hourly is not None:  # Already paid for the whole day; no request at all.
+        return hourly
+
+    hour = dt_requested.strftime("%Y-%m-%dT%H:%M")
+    metrics.inc("weather.minimal_fetch")
+    return hour_cache.get_or_fetch(
+        (lat, lon, hour, tz_name, url, tuple(variables)),
+        lambda: _fetch_hourly_window(url, lat, lon, hour, hour, tz_name, variables),
+        immutable=(url == ARCHIVE_URL),
+    )
+
+
+def _weather_row(hourly, dt_requested, location, fields=None):
+    """Pick the hour matching ``dt_requested`` out of a decoded hourly block (only ``fields`` if given)."""
+
+    lat, lon, city_name, country_code = location
+
+    times  = hourly.get("time", [])
 
     if not times:  # No hourly results were returned.
         raise ValueError("No hourly weather data returned for that date (out of range?).")  # Notify caller.
 
-    index = None  # Placeholder for the matching hour index.
-
-    for i, t in enumerate(times):  # Scan each timestamp.
-        if datetime.fromisoformat(t) == dt_requested:  # Find exact hour match (minutes already zeroed).
-            index = i
-            break
+    index = _hour_index(times, dt_requested)  # O(1) offset from the first timestamp.
 
     if index is None:  # API did not include the exact hour requested.
         raise ValueError("No weather exactly at that hour (set minutes to 00).")  # Suggest corrective action.
-    condition = classify_condition(
-        weathercode=codes[index],
-        precip=precs[index],
-        cloudcover=clouds[index],
-    )
 
-    return {
-        "city": city_name,
-        "country": country_code,
-        "time": times[index],
-        "temperature": temps[index],
-        "humidity": hums[index],
-        "precipitation": precs[index],
-        "weathercode": codes[index],
-        "cloudcover": clouds[index],
-        "condition": condition,   # ← NEW: clear / cloudy / rain / snow / storm
-        "latitude": lat,
-        "longitude": lon,
+    row = {"city": city_name, "country": country_code, "time": times[index]}
+    for field in ROW_FIELDS if fields is None else fields:
+        if field == "condition":  # clear / cloudy / rain / snow / storm
+            row[field] = classify_condition(
+                weathercode=hourly.get("weathercode", [])[index],
+                precip=hourly.get("precipitation", [])[index],
+                cloudcover=hourly.get("cloudcover", [])[index],
+            )
+        else:
+            row[field] = hourly.get(ROW_FIELDS[field][0], [])[index]
+    row["latitude"] = lat
+    row["longitude"] = lon
+    return row
+
+
+def _hour_index(times, dt_requested):
+    """Index of ``dt_requested`` in an hourly ``time`` column, or ``None`` if absent.
+
+    Rows are one hour apart, so the index is plain arithmetic from the first
+    timestamp; a linear scan is only the fallback for irregular payloads.
+    """
+
+    wanted = dt_requested.strftime("%Y-%m-%dT%H:%M")  # Open-Meteo's ISO minute format.
+    guess = int((dt_requested - datetime.fromisoformat(times[0])).total_seconds() // 3600)
+    if 0 <= guess < len(times) and times[guess] == wanted:
+        return guess
+
+    for i, t in enumerate(times):  # Irregular spacing (e.g. DST quirks): fall back to scanning.
+        if datetime.fromisoformat(t) == dt_requested:  # Find exact hour match (minutes already zeroed).
+            return i
+    return None
+
+
+# --- Batched lookups -------------------------------------------------------
+
+MAX_COORDINATES_PER_REQUEST = 50  # Keeps multi-coordinate URLs comfortably short.
+MAX_BATCH_DAYS = 14  # Widest date range a shared multi-location request may cover.
+
+
+def _date_runs(days):
+    """Split sorted dates into (start, end) runs of consecutive days on the same endpoint."""
+
+    runs = []
+    for day in sorted(days):
+        url = endpoint_for_date(day)
+        if runs and runs[-1][2] == url and (day - runs[-1][1]).days == 1:
+            runs[-1][1] = day  # Extend the current contiguous run.
+        else:
+            runs.append([day, day, url])
+    return [tuple(run) for run in runs]
+
+
+def _fetch_hourly_multi(url, locations, start, end):
+    """Fetch one date range for several (lat, lon, tz) locations in a single request.
+
+    Open-Meteo accepts comma-separated coordinates (and timezones) and answers
+    with a list of per-location structures in the same order.
+    """
+
+    params = {
+        "latitude": ",".join(str(loc[0]) for loc in locations),
+        "longitude": ",".join(str(loc[1]) for loc in locations),
+        "hourly": HOURLY_VARIABLES,
+        "timezone": ",".join(loc[2] for loc in locations),
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
     }
+
+    try:  # One round trip for every location sharing this date range.
+        with metrics.span("weather.http.batch"):
+            resp = get_client().get(url, params=params, timeout=10)
+        resp.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        raise RuntimeError(f"Network/API error while fetching weather: {e}")
+
+    with metrics.span("weather.decode"):
+        data = decode_json(resp)
+    if isinstance(data, dict):  # A single coordinate comes back as one object, not a list.
+        data = [data]
+    if len(data) != len(locations):
+        raise RuntimeError("Weather API returned a different number of locations than requested.")
+    return [entry.get("hourly", {}) for entry in data]
+
+
+def get_hourly_for_locations(locations, start, end):
+    """Hourly blocks for several ``(lat, lon, tz_name)`` locations over one local date range.
+
+    The multi-location counterpart of a single range fetch: the range is split
+    where archive data ends and forecast data begins, locations go out
+    ``MAX_COORDINATES_PER_REQUEST`` per request, and the pieces are joined so
+    each returned block (aligned with ``locations``) covers ``start..end``.
+    Nothing is cached here; bulk jobs such as ``backfill`` store the rows themselves.
+    """
+
+    start = date.fromisoformat(start) if isinstance(start, str) else start
+    end = date.fromisoformat(end) if isinstance(end, str) else end
+    if end < start:
+        raise ValueError("End date must not be before the start date.")
+    locations = list(locations)
+    blocks = [{} for _ in locations]
+    today = date.today()
+    for first, last in ((start, min(end, today - timedelta(days=1))), (max(start, today), end)):
+        if first > last:  # Range lies entirely on the other side of today.
+            continue
+        url = endpoint_for_date(first)
+        for i in range(0, len(locations), MAX_COORDINATES_PER_REQUEST):
+            chunk = locations[i:i + MAX_COORDINATES_PER_REQUEST]
+            for block, hourly in zip(blocks[i:i + len(chunk)], _fetch_hourly_multi(url, chunk, first, last)):
+                for key, values in hourly.items():
+                    block.setdefault(key, []).extend(values)
+    return blocks
+
+
+def _split_days(hourly):
+    """Slice a multi-day hourly block into per-day blocks keyed by ISO date."""
+
+    days = {}
+    for i, t in enumerate(hourly.get("time", [])):
+        block = days.setdefault(t[:10], {key: [] for key in hourly})
+        for key, values in hourly.items():
+            block[key].append(values[i])
+    return days
+
+
+def get_weather_for_many(pairs):
+    """Fetch weather for many ``(dt_str, tz_name)`` pairs with as few HTTP requests as possible.
+
+    Pairs are grouped by geocoded location and contiguous date range; locations
+    whose ranges sit close together are collapsed into one multi-coordinate
+    Open-Meteo request. Fetched days land in ``day_cache`` for later lookups.
+    Results keep the input order. Each item is either the same dict that
+    ``get_weather_for_datetime`` returns or the exception raised for that item,
+    so one bad pair never aborts the whole batch.
+    """
+
+    results = [None] * len(pairs)
+    parsed = {}  # index -> (dt_requested, location, tz_name)
+
+    # Step 1: validate inputs and geocode each distinct zone once (geocode_cache absorbs repeats).
+    locations = {}
+    for i, (dt_str, tz_name) in enumerate(pairs):
+        try:
+            dt_requested = datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S").replace(minute=0, second=0)
+            if tz_name not in locations:
+                try:
+                    locations[tz_name] = get_location_from_timezone(tz_name)
+                except Exception as e:
+                    locations[tz_name] = e
+            location = locations[tz_name]
+            if isinstance(location, Exception):
+                raise location
+            parsed[i] = (dt_requested, location, tz_name)
+        except Exception as e:
+            results[i] = e
+
+    # Step 2: work out which days are still missing from day_cache, per location.
+    wanted = {}  # (lat, lon, tz) -> set of dates
+    for dt_requested, location, tz_name in parsed.values():
+        loc_key = (location[0], location[1], tz_name)
+        day = dt_requested.date()
+        if day_cache.peek((loc_key[0], loc_key[1], day.isoformat(), tz_name, endpoint_for_date(day))) is None:
+            wanted.setdefault(loc_key, set()).add(day)
+
+    # Step 3: cluster runs per endpoint so locations with nearby dates share one request.
+    # Fetching a few extra days for some locations is far cheaper than another round trip.
+    runs_by_url = {}
+    for loc_key, days in wanted.items():
+        for start, end, url in _date_runs(days):
+            runs_by_url.setdefault(url, []).append((start, end, loc_key))
+
+    groups = []  # (url, start, end, [loc_key, ...])
+    for url, runs in runs_by_url.items():
+        runs.sort()
+        for start, end, loc_key in runs:
+            if groups and groups[-1][0] == url:
+                g_url, g_start, g_end, members = groups[-1]
+                if (max(g_end, end) - g_start).days < MAX_BATCH_DAYS:  # Still a compact range.
+                    if loc_key not in members:
+                        members.append(loc_key)
+                    groups[-1] = (g_url, g_start, max(g_end, end), members)
+                    continue
+            groups.append((url, start, end, [loc_key]))
+
+    failures = {}  # (loc_key, date) -> exception from its group request
+    for url, start, end, group in groups:
+        for offset in range(0, len(group), MAX_COORDINATES_PER_REQUEST):
+            chunk = group[offset:offset + MAX_COORDINATES_PER_REQUEST]
+            try:
+                blocks = _fetch_hourly_multi(url, chunk, start, end)
+            except Exception as e:
+                for loc_key in chunk:
+                    for day in wanted[loc_key]:
+                        if start <= day <= end:
+                            failures[(loc_key, day)] = e
+                continue
+            for loc_key, hourly in zip(chunk, blocks):
+                for date_str, block in _split_days(hourly).items():
+                    day_cache.put(
+                        (loc_key[0], loc_key[1], date_str, loc_key[2], url),
+                        block,
+                        immutable=(url == ARCHIVE_URL),
+                    )
+
+    # Step 4: answer every parsed pair from the (now warm) day cache, in input order.
+    for i, (dt_requested, location, tz_name) in parsed.items():
+        loc_key = (location[0], location[1], tz_name)
+        day = dt_requested.date()
+        if (loc_key, day) in failures:
+            results[i] = failures[(loc_key, day)]
+            continue
+        try:
+            hourly = day_cache.peek((loc_key[0], loc_key[1], day.isoformat(), tz_name, endpoint_for_date(day)))
+            if hourly is None:  # Range fetched fine but the API left this day out.
+                hourly = get_hourly_day(loc_key[0], loc_key[1], day.isoformat(), tz_name)
+            results[i] = _weather_row(hourly, dt_requested, location)
+        except Exception as e:
+            results[i] = e
+
+    return results
+
+
+# --- Time series -----------------------------------------------------------
+
+SERIES_CHUNK_DAYS = 92  # Days per request when streaming long ranges (bounds memory per chunk).
+SERIES_COLUMNS = ("temperature", "humidity", "precipitation", "weathercode", "cloudcover")
+_SERIES_SOURCES = {  # Series column -> Open-Meteo hourly variable.
+    "temperature": "temperature_2m",
+    "humidity": "relative_humidity_2m",
+    "precipitation": "precipitation",
+    "weathercode": "weathercode",
+    "cloudcover": "cloudcover",
+}
+
+
+def _as_datetime(value, end=False):
+    """Accept a date, datetime or ISO string; bare dates cover the whole day."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value) if len(value) > 10 else date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.replace(minute=0, second=0, microsecond=0)
+    return datetime.combine(value, datetime.min.time()) + (timedelta(hours=23) if end else timedelta())
+
+
+def _series_chunks(start_day, end_day, chunk_days):
+    """Yield (url, first_day, last_day) request windows, split at today and every ``chunk_days``."""
+    today = date.today()
+    day = start_day
+    while day <= end_day:
+        url = endpoint_for_date(day)
+        limit = end_day if url == FORECAST_URL else min(end_day, today - timedelta(days=1))
+        last = min(limit, day + timedelta(days=chunk_days - 1))
+        yield url, day, last
+        day = last + timedelta(days=1)
+
+
+def _series_columns(hourly, start_dt, end_dt):
+    """Turn one decoded hourly block into typed columns, trimmed to ``[start_dt, end_dt]``."""
+    times = hourly.get("time", [])
+    raw = {col: hourly.get(src, [None] * len(times)) for col, src in _SERIES_SOURCES.items()}
+
+    if np is not None:
+        stamps = np.array(times, dtype="datetime64[s]")
+        keep = (stamps >= np.datetime64(start_dt, "s")) & (stamps <= np.datetime64(end_dt, "s"))
+        columns = {"time": stamps[keep]}
+        for col in SERIES_COLUMNS:
+            if col == "weathercode":  # WMO codes fit in int16; -1 marks missing values.
+                values = np.array([-1 if v is None else v for v in raw[col]], dtype=np.int16)
+            else:  # None -> NaN.
+                values = np.array(raw[col], dtype=np.float32)
+            columns[col] = values[keep]
+        return columns
+
+    # Pure-Python fallback: naive local epoch seconds plus array.array columns.
+    epoch = datetime(1970, 1, 1)
+    start_s = int((start_dt - epoch).total_seconds())
+    end_s = int((end_dt - epoch).total_seconds())
+    stamps = [int((datetime.fromisoformat(t) - epoch).total_seconds()) for t in times]
+    keep = [i for i, t in enumerate(stamps) if start_s <= t <= end_s]
+    columns = {"time": array("q", (stamps[i] for i in keep))}
+    for col in SERIES_COLUMNS:
+        values = raw[col]
+        if col == "weathercode":
+            columns[col] = array("h", (-1 if values[i] is None else int(values[i]) for i in keep))
+        else:
+            columns[col] = array("f", (float("nan") if values[i] is None else values[i] for i in keep))
+    return columns
+
+
+def iter_weather_series(tz_name, start, end, chunk_days=SERIES_CHUNK_DAYS):
+    """Stream hourly weather for ``tz_name`` between ``start`` and ``end`` as columnar chunks.
+
+    Long ranges are split into archive/forecast requests of at most
+    ``chunk_days`` days; each yielded chunk is a dict of typed columns
+    (``time`` plus ``SERIES_COLUMNS``), so multi-year pulls never hold more
+    than one chunk of JSON in memory.
+    """
+
+    start_dt, end_dt = _as_datetime(start), _as_datetime(end, end=True)
+    if end_dt < start_dt:
+        raise ValueError("Series end must not be before its start.")
+
+    lat, lon = get_location_from_timezone(tz_name)[:2]
+    for url, first, last in _series_chunks(start_dt.date(), end_dt.date(), chunk_days):
+        hourly = _fetch_hourly_range(url, lat, lon, first.isoformat(), last.isoformat(), tz_name)
+        yield _series_columns(hourly, start_dt, end_dt)
+
+
+def get_weather_series(tz_name, start, end, chunk_days=SERIES_CHUNK_DAYS):
+    """Fetch an hourly weather range as compact columns.
+
+    Returns ``time`` (``datetime64[s]`` local wall times) and ``temperature``,
+    ``humidity``, ``precipitation``, ``cloudcover`` (float32, NaN if missing)
+    and ``weathercode`` (int16, -1 if missing) as NumPy arrays, plus location
+    metadata. Without NumPy the columns are ``array.array`` objects and
+    ``time`` holds naive local epoch seconds.
+    """
+
+    lat, lon, city_name, country_code = get_location_from_timezone(tz_name)
+    chunks = list(iter_weather_series(tz_name, start, end, chunk_days))
+
+    if np is not None:
+        series = {
+            col: np.concatenate([c[col] for c in chunks]) if chunks else np.array([], dtype=dtype)
+            for col, dtype in (("time", "datetime64[s]"), ("temperature", np.float32), ("humidity", np.float32),
+                               ("precipitation", np.float32), ("weathercode", np.int16), ("cloudcover", np.float32))
+        }
+    else:
+        series = {"time": array("q"), "weathercode": array("h")}
+        for col in ("temperature", "humidity", "precipitation", "cloudcover"):
+            series[col] = array("f")
+        for chunk in chunks:
+            for col, values in chunk.items():
+                series[col].extend(values)
+
+    series.update({"city": city_name, "country": country_code, "latitude": lat, "longitude": lon, "timezone": tz_name})
+    return series
+
+
+def series_index(series, dt_requested):
+    """O(1) position of ``dt_requested`` in a series returned by ``get_weather_series`` (or ``None``)."""
+    times = series["time"]
+    if not len(times):
+        return None
+    first = times[0]
+    if np is not None and isinstance(times, np.ndarray):
+        guess = int((np.datetime64(dt_requested, "s") - first) // np.timedelta64(1, "h"))
+        ok = 0 <= guess < len(times) and times[guess] == np.datetime64(dt_requested, "s")
+    else:
+        target = int((dt_requested - datetime(1970, 1, 1)).total_seconds())
+        guess = (target - first) // 3600
+        ok = 0 <= guess < len(times) and times[guess] == target
+    return guess if ok else None
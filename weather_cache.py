@@ -0,0 +1,321 @@
+"""Two-level caches that keep repeat Open-Meteo lookups off the network."""
+
+import json  # Serialises cached values for the on-disk store.
+import os  # Cache directory discovery.
+import sqlite3  # Persistent store that survives restarts.
+import sys  # Platform check for the cache directory.
+import threading  # Caches are shared between the GUI thread and workers.
+import time  # TTL bookkeeping.
+from collections import OrderedDict  # Ordered dict doubles as an LRU.
+
+APP_CACHE_NAME = "PythonJackfruit"  # Folder name used inside the user cache directory.
+CACHE_DIR_ENV = "PYTHONJACKFRUIT_CACHE_DIR"  # Optional override for the cache location.
+
+_MISSING = object()  # Sentinel so cached ``None`` values stay distinguishable from misses.
+
+
+def user_cache_dir():
+    """Return the per-user cache folder for this app, honouring the env override."""
+
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return override
+
+    if os.name == "nt":  # Windows keeps caches under %LOCALAPPDATA%.
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    elif sys.platform == "darwin":  # macOS convention.
+        base = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    else:  # XDG layout for Linux and friends.
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, APP_CACHE_NAME)
+
+
+class LRUCache:
+    """Small thread-safe LRU whose entries carry their own expiry timestamp."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key, now=None):
+        """Return the cached value or ``_MISSING`` when absent/expired."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= now:  # Lazily drop expired entries.
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)  # Mark as most recently used.
+            return value
+
+    def set(self, key, value, expires_at=None):
+        """Store ``value`` until ``expires_at`` (``None`` means never expire)."""
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:  # Evict the least recently used entries.
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class GeocodeCache:
+    """In-process LRU in front of a SQLite store for timezone -> location lookups.
+
+    Negative results (the geocoder found nothing) are cached too, on their own
+    shorter TTL, so a bad zone does not hit the network on every click.
+    """
+
+    def __init__(
+        self,
+        path=None,
+        ttl=30 * 24 * 3600,
+        negative_ttl=24 * 3600,
+        memory_size=512,
+        disk_size=10000,
+        persistent=True,
+    ):
+        self.path = path or os.path.join(user_cache_dir(), "geocode.sqlite3")
+        self.ttl = ttl  # Seconds a positive hit stays valid.
+        self.negative_ttl = negative_ttl  # Seconds a "not found" answer stays valid.
+        self.disk_size = disk_size  # Max rows kept on disk.
+        self.persistent = persistent  # False keeps everything in memory (tests, read-only installs).
+        self._memory = LRUCache(memory_size)
+        self._db = None  # Opened lazily so importing weather_api never touches the disk.
+        self._db_failed = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    # --- Disk layer -------------------------------------------------------
+    def _connect(self):
+        """Open (or create) the SQLite store, degrading to memory-only on failure."""
+        if self._db is not None or self._db_failed or not self.persistent:
+            return self._db
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT,"  # JSON payload, NULL for negative results.
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            db.commit()
+            self._db = db
+        except (OSError, sqlite3.Error):
+            self._db_failed = True  # Never retry on every lookup; memory layer still works.
+        return self._db
+
+    def _disk_get(self, key, now):
+        db = self._connect()
+        if db is None:
+            return _MISSING, None
+        try:
+            row = db.execute("SELECT value, expires_at FROM geocode WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return _MISSING, None
+            raw, expires_at = row
+            if expires_at <= now:
+                db.execute("DELETE FROM geocode WHERE key = ?", (key,))
+                db.commit()
+                return _MISSING, None
+            db.execute("UPDATE geocode SET accessed_at = ? WHERE key = ?", (now, key))
+            db.commit()
+        except sqlite3.Error:
+            return _MISSING, None
+        value = None if raw is None else tuple(json.loads(raw))
+        return value, expires_at
+
+    def _disk_put(self, key, value, expires_at, now):
+        db = self._connect()
+        if db is None:
+            return
+        raw = None if value is None else json.dumps(list(value))
+        try:
+            db.execute(
+                "INSERT OR REPLACE INTO geocode (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, raw, expires_at, now),
+            )
+            # Trim the table back to its size budget, dropping the coldest rows first.
+            db.execute(
+                "DELETE FROM geocode WHERE key IN ("
+                " SELECT key FROM geocode ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.disk_size,),
+            )
+            db.commit()
+        except sqlite3.Error:
+            pass
+
+    # --- Public API -------------------------------------------------------
+    def get(self, tz_name):
+        """Return ``(found, location)``; ``location`` is ``None`` for a cached negative result."""
+        now = time.time()
+        with self._lock:
+            value = self._memory.get(tz_name, now)
+            if value is not _MISSING:
+                self.hits += 1
+                self.memory_hits += 1
+                if value is None:
+                    self.negative_hits += 1
+                return True, value
+
+            value, expires_at = self._disk_get(tz_name, now)
+            if value is not _MISSING:
+                self._memory.set(tz_name, value, expires_at)  # Promote into the fast layer.
+                self.hits += 1
+                self.disk_hits += 1
+                if value is None:
+                    self.negative_hits += 1
+                return True, value
+
+            self.misses += 1
+            return False, None
+
+    def put(self, tz_name, location):
+        """Remember a successful geocode result for ``ttl`` seconds."""
+        self._store(tz_name, tuple(location), self.ttl)
+
+    def put_negative(self, tz_name):
+        """Remember that the geocoder had no match for ``negative_ttl`` seconds."""
+        self._store(tz_name, None, self.negative_ttl)
+
+    def _store(self, tz_name, value, ttl):
+        now = time.time()
+        expires_at = now + ttl
+        with self._lock:
+            self._memory.set(tz_name, value, expires_at)
+            self._disk_put(tz_name, value, expires_at, now)
+
+    def clear(self):
+        """Drop every cached entry from both layers and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            db = self._connect()
+            if db is not None:
+                try:
+                    db.execute("DELETE FROM geocode")
+                    db.commit()
+                except sqlite3.Error:
+                    pass
+            self.hits = self.memory_hits = self.disk_hits = self.negative_hits = self.misses = 0
+
+    def stats(self):
+        """Snapshot of hit/miss counters so callers can confirm the cache is earning its keep."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+
+class DayPayloadCache:
+    """Memory cache of decoded hourly day payloads keyed by (lat, lon, date, tz, endpoint).
+
+    Archive days never change once published, so they are kept until evicted.
+    Forecast days are fresh for ``ttl`` seconds; for a further ``stale_ttl``
+    seconds the stale payload is served immediately while a background thread
+    refreshes it (stale-while-revalidate). Older entries are refetched inline.
+    """
+
+    def __init__(self, maxsize=256, ttl=15 * 60, stale_ttl=45 * 60):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data = LRUCache(maxsize)  # key -> (payload, fetched_at, immutable)
+        self._lock = threading.Lock()
+        self._refreshing = set()  # Keys with a background refresh already in flight.
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def get_or_fetch(self, key, fetch, immutable=False):
+        """Return the payload for ``key``, calling ``fetch()`` only when the cache cannot answer."""
+        now = time.time()
+        entry = self._data.get(key, now)
+        if entry is not _MISSING:
+            payload, fetched_at, cached_immutable = entry
+            age = now - fetched_at
+            if cached_immutable or age < self.ttl:
+                with self._lock:
+                    self.hits += 1
+                return payload
+            if age < self.ttl + self.stale_ttl:  # Serve stale now, refresh behind the caller's back.
+                with self._lock:
+                    self.stale_hits += 1
+                self._refresh_in_background(key, fetch, immutable)
+                return payload
+
+        with self._lock:
+            self.misses += 1
+        payload = fetch()  # Errors propagate; nothing is cached for a failed fetch.
+        self.put(key, payload, immutable)
+        return payload
+
+    def peek(self, key):
+        """Return a cached payload that is still fresh (or within its stale window), else ``None``."""
+        entry = self._data.get(key)
+        if entry is _MISSING:
+            return None
+        payload, fetched_at, immutable = entry
+        if immutable or time.time() - fetched_at < self.ttl + self.stale_ttl:
+            return payload
+        return None
+
+    def put(self, key, payload, immutable=False):
+        """Store an already decoded payload (used by batch fetchers as well)."""
+        self._data.set(key, (payload, time.time(), immutable))
+
+    def _refresh_in_background(self, key, fetch, immutable):
+        with self._lock:
+            if key in self._refreshing:  # One refresh per key is enough.
+                return
+            self._refreshing.add(key)
+
+        def worker():
+            try:
+                self.put(key, fetch(), immutable)
+                with self._lock:
+                    self.refreshes += 1
+            except Exception:
+                pass  # Keep serving the stale copy; the next miss will surface the error.
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=worker, name="weather-refresh", daemon=True).start()
+
+    def clear(self):
+        self._data.clear()
+        with self._lock:
+            self.hits = self.stale_hits = self.misses = self.refreshes = 0
+
+    def stats(self):
+        """Snapshot of hit/stale/miss counters."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "hit_rate": ((self.hits + self.stale_hits) / lookups) if lookups else 0.0,
+            "entries": len(self._data),
+        }
@@ -0,0 +1,102 @@
+"""Speculative weather/geocode prefetch so GET WEATHER usually finds its answer ready."""
+
+import threading  # Counters are bumped from the UI thread and read from anywhere.
+
+
+class WeatherPrefetcher:
+    """Start the likely next weather lookup before it is asked for.
+
+    ``prefetch(dt_str, tz)`` runs as soon as a conversion produces a result;
+    ``prefetch_location(tz)`` warms the geocode cache when the target zone
+    changes. ``take(dt_str, tz)`` hands the matching future to the real
+    request (a hit) or returns ``None`` (a miss). Only the latest speculative
+    lookup is kept: older ones are cancelled if still queued and counted as
+    wasted, and repeating the same prefetch reuses the existing future.
+    """
+
+    def __init__(self, executor, fetch_weather, fetch_location=None):
+        self.executor = executor  # Shared worker pool (same one the explicit lookups use).
+        self.fetch_weather = fetch_weather  # (dt_str, tz_name) -> weather dict.
+        self.fetch_location = fetch_location  # tz_name -> location tuple (cache warm-up only).
+        self._lock = threading.Lock()
+        self._key = None  # (tz_name, dt_str) of the outstanding speculative lookup.
+        self._future = None
+        self._location_tz = None  # Zone whose geocode warm-up is queued/running.
+        self._location_future = None
+        self.prefetched = 0  # Speculative weather lookups submitted.
+        self.deduplicated = 0  # prefetch() calls answered by an already outstanding lookup.
+        self.location_prefetched = 0  # Geocode warm-ups submitted.
+        self.hits = 0  # take() served from a prefetch.
+        self.misses = 0  # take() found nothing usable.
+        self.wasted = 0  # Prefetches superseded, cancelled or failed before being used.
+
+    def prefetch(self, dt_str, tz_name):
+        """Speculatively fetch weather for ``dt_str`` in ``tz_name`` (no-op if already outstanding)."""
+        key = (tz_name, dt_str)
+        with self._lock:
+            if key == self._key and self._future is not None:
+                self.deduplicated += 1
+                return self._future
+            self._discard()
+            self._key = key
+            self._future = self.executor.submit(self.fetch_weather, dt_str, tz_name)
+            self.prefetched += 1
+            return self._future
+
+    def prefetch_location(self, tz_name):
+        """Resolve ``tz_name``'s coordinates in the background so the weather lookup skips geocoding."""
+        if self.fetch_location is None:
+            return None
+        with self._lock:
+            if tz_name == self._location_tz and self._location_future is not None and not self._location_future.done():
+                return self._location_future
+            if self._location_future is not None:
+                self._location_future.cancel()
+            self._location_tz = tz_name
+            self._location_future = self.executor.submit(self.fetch_location, tz_name)
+            self.location_prefetched += 1
+            return self._location_future
+
+    def take(self, dt_str, tz_name):
+        """Claim the prefetched future for this lookup, or ``None`` if the caller must fetch itself."""
+        with self._lock:
+            future = self._future if self._key == (tz_name, dt_str) else None
+            if future is not None and (future.cancelled() or (future.done() and future.exception() is not None)):
+                # Failed speculation is retried by the caller rather than replaying a stale error.
+                self._discard()
+                future = None
+            if future is None:
+                self.misses += 1
+                return None
+            self._key = self._future = None
+            self.hits += 1
+            return future
+
+    def cancel(self):
+        """Drop any outstanding speculation (e.g. target zone changed or the UI was reset)."""
+        with self._lock:
+            self._discard()
+            if self._location_future is not None:
+                self._location_future.cancel()
+            self._location_tz = self._location_future = None
+
+    def _discard(self):
+        # Caller holds the lock. A queued future is cancelled; a running one just finishes unused.
+        if self._future is not None:
+            self._future.cancel()
+            self.wasted += 1
+        self._key = self._future = None
+
+    def stats(self):
+        """Hit rate and waste counters for the speculative lookups."""
+        with self._lock:
+            taken = self.hits + self.misses
+            return {
+                "prefetched": self.prefetched,
+                "deduplicated": self.deduplicated,
+                "location_prefetched": self.location_prefetched,
+                "hits": self.hits,
+                "misses": self.misses,
+                "wasted": self.wasted,
+                "hit_rate": self.hits / taken if taken else 0.0,
+            }
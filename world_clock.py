@@ -0,0 +1,131 @@
+"""GUI-free engine for the multi-zone world clock.
+
+One UTC instant is rendered into many zones per tick. Each zone keeps the UTC
+offset it resolved last time together with the validity window from its
+transition table, so a tick is a comparison plus an addition per zone; the
+binary search only runs again once a zone crosses its next DST transition.
+``tick()`` reports only the zones whose formatted text changed.
+"""
+
+import bisect  # Offset re-resolution at transition boundaries.
+import time  # System clock for live mode.
+
+from tz_engine import DEFAULT_FORMAT, timestamp_codec, transition_table
+
+
+class _ZoneClock:
+    """Cached offset for one zone, valid on ``[valid_from, valid_until)`` (UTC seconds)."""
+
+    __slots__ = ("zone", "table", "offset", "valid_from", "valid_until", "text")
+
+    def __init__(self, zone):
+        self.zone = zone
+        self.table = transition_table(zone)  # Raises pytz.UnknownTimeZoneError for bad names.
+        self.valid_from = self.valid_until = 0  # Empty window: first lookup resolves.
+        self.offset = 0
+        self.text = None  # Last text handed out, for change detection.
+
+    def resolve(self, utc_seconds):
+        """Re-derive the offset and its validity window around ``utc_seconds``."""
+        utc = self.table.utc
+        i = max(0, bisect.bisect_right(utc, utc_seconds) - 1)
+        self.offset = self.table.offsets[i]
+        self.valid_from = utc[i] if i else float("-inf")
+        self.valid_until = utc[i + 1] if i + 1 < len(utc) else float("inf")
+
+
+class WorldClock:
+    """Render one instant across ``zones``, reusing offsets until each zone's next transition.
+
+    ``anchor_utc=None`` follows the system clock (live mode); an integer pins
+    the clock to that UTC instant (e.g. the time entered in the main window).
+    """
+
+    def __init__(self, zones=(), time_format=DEFAULT_FORMAT, anchor_utc=None):
+        self.codec = timestamp_codec(time_format)
+        self.anchor_utc = anchor_utc
+        self._clocks = []
+        self.resolves = 0  # Offset lookups that had to binary-search (first use / DST change).
+        self.ticks = 0
+        self.changed = 0  # Labels reported as changed across all ticks.
+        for zone in zones:
+            self.add(zone)
+
+    @property
+    def zones(self):
+        return [c.zone for c in self._clocks]
+
+    def add(self, zone):
+        """Append ``zone`` (ignored if already shown); returns its row index."""
+        for i, clock in enumerate(self._clocks):
+            if clock.zone == zone:
+                return i
+        self._clocks.append(_ZoneClock(zone))
+        return len(self._clocks) - 1
+
+    def remove(self, zone):
+        """Drop ``zone``; returns its former row index or ``None``."""
+        for i, clock in enumerate(self._clocks):
+            if clock.zone == zone:
+                del self._clocks[i]
+                return i
+        return None
+
+    def set_anchor(self, anchor_utc):
+        """Pin to a UTC instant, or pass ``None`` to follow the system clock again."""
+        self.anchor_utc = anchor_utc
+
+    def now(self):
+        """UTC second currently being displayed."""
+        return int(time.time()) if self.anchor_utc is None else self.anchor_utc
+
+    def offset(self, index, utc_seconds):
+        """Cached UTC offset of row ``index`` at ``utc_seconds``."""
+        clock = self._clocks[index]
+        if not clock.valid_from <= utc_seconds < clock.valid_until:
+            clock.resolve(utc_seconds)
+            self.resolves += 1
+        return clock.offset
+
+    def render(self, utc_seconds=None):
+        """Formatted wall time for every zone (no change tracking)."""
+        utc_seconds = self.now() if utc_seconds is None else utc_seconds
+        return [self.codec.format(utc_seconds + self.offset(i, utc_seconds)) for i in range(len(self._clocks))]
+
+    def tick(self, utc_seconds=None):
+        """Advance to ``utc_seconds`` (default: ``now()``) and return ``[(index, zone, text)]`` that changed."""
+        utc_seconds = self.now() if utc_seconds is None else utc_seconds
+        self.ticks += 1
+        changes = []
+        for i, clock in enumerate(self._clocks):
+            if not clock.valid_from <= utc_seconds < clock.valid_until:  # Inlined offset(): hot loop.
+                clock.resolve(utc_seconds)
+                self.resolves += 1
+            text = self.codec.format(utc_seconds + clock.offset)
+            if text != clock.text:
+                clock.text = text
+                changes.append((i, clock.zone, text))
+        self.changed += len(changes)
+        return changes
+
+    def invalidate(self):
+        """Forget the last texts so the next tick reports every row (e.g. after rebuilding labels)."""
+        for clock in self._clocks:
+            clock.text = None
+
+    def utc_offset_label(self, index, utc_seconds=None):
+        """``UTC+05:30``-style label for row ``index``."""
+        utc_seconds = self.now() if utc_seconds is None else utc_seconds
+        offset = self.offset(index, utc_seconds)
+        sign = "+" if offset >= 0 else "-"
+        hours, minutes = divmod(abs(offset) // 60, 60)
+        return f"UTC{sign}{hours:02d}:{minutes:02d}"
+
+    def stats(self):
+        return {"zones": len(self._clocks), "ticks": self.ticks, "resolves": self.resolves, "changed": self.changed}
+
+
+def instant_from_local(time_str, from_tz, time_format=DEFAULT_FORMAT):
+    """UTC seconds of a wall-clock string in ``from_tz`` (same DST rules as ``time_zone_converter``)."""
+    local_seconds = timestamp_codec(time_format).parse(time_str)
+    return transition_table(from_tz).utc_from_local(local_seconds)
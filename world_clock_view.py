@@ -0,0 +1,126 @@
+"""World-clock window: one instant across many zones, refreshed once a second."""
+
+import wx  # wxPython widgets + timer.
+
+from tz_search import POPULAR_ZONES  # Default rows.
+from world_clock import WorldClock  # Offset caching + change detection.
+from zone_picker import ZonePicker  # Same typeahead picker as the main window.
+
+ROW_HEIGHT = 26
+
+
+class WorldClockFrame(wx.Frame):
+    """Rows of ``zone | wall time | UTC offset`` driven by a 1 s ``wx.Timer``.
+
+    Each tick asks ``WorldClock`` for the rows whose text changed and only
+    those labels are touched, so a pinned instant costs no repaints at all.
+    Right-click a row to remove it.
+    """
+
+    def __init__(self, parent=None, zones=POPULAR_ZONES, anchor_utc=None, title="World Clock"):
+        super().__init__(parent, title=title, size=(560, 640))
+        self.clock = WorldClock(zones, anchor_utc=anchor_utc)
+        self.panel = wx.ScrolledWindow(self)
+        self.panel.SetScrollRate(0, ROW_HEIGHT)
+
+        self.picker = ZonePicker(self.panel, size=(260, 30), style=wx.CB_DROPDOWN | wx.TE_PROCESS_ENTER)
+        add_btn = wx.Button(self.panel, label="ADD ZONE")
+        self.mode_btn = wx.Button(self.panel, label="")
+        add_btn.Bind(wx.EVT_BUTTON, self.on_add)
+        self.picker.Bind(wx.EVT_TEXT_ENTER, self.on_add)
+        self.mode_btn.Bind(wx.EVT_BUTTON, self.on_toggle_live)
+
+        header = wx.BoxSizer(wx.HORIZONTAL)
+        header.Add(self.picker, 0, wx.ALL, 6)
+        header.Add(add_btn, 0, wx.ALL, 6)
+        header.Add(self.mode_btn, 0, wx.ALL, 6)
+
+        self.grid = wx.FlexGridSizer(cols=3, vgap=4, hgap=18)
+        self.rows = []  # [(zone_label, time_label, offset_label)] aligned with clock.zones
+        for zone in self.clock.zones:
+            self._add_row(zone)
+
+        outer = wx.BoxSizer(wx.VERTICAL)
+        outer.Add(header, 0, wx.EXPAND)
+        outer.Add(self.grid, 0, wx.ALL, 10)
+        self.panel.SetSizer(outer)
+
+        self.timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_tick, self.timer)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+        self._update_mode_label()
+        self.refresh(full=True)
+        self.timer.Start(1000)
+
+    # --- Rows -------------------------------------------------------------
+    def _add_row(self, zone):
+        labels = (
+            wx.StaticText(self.panel, label=zone),
+            wx.StaticText(self.panel, label=""),
+            wx.StaticText(self.panel, label=""),
+        )
+        labels[1].SetFont(wx.Font(11, wx.FONTFAMILY_TELETYPE, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        for label in labels:
+            self.grid.Add(label, 0, wx.ALIGN_CENTER_VERTICAL)
+            # Deferred: remove_zone destroys this label, which is unsafe inside its own handler.
+            label.Bind(wx.EVT_RIGHT_UP, lambda event, z=zone: wx.CallAfter(self.remove_zone, z))
+        self.rows.append(labels)
+
+    def add_zone(self, zone):
+        if zone in self.clock.zones:
+            return
+        self.clock.add(zone)
+        self._add_row(zone)
+        self.panel.FitInside()
+        self.panel.Layout()
+        self.refresh(full=True)
+
+    def remove_zone(self, zone):
+        index = self.clock.remove(zone)
+        if index is None:
+            return
+        for label in self.rows.pop(index):
+            self.grid.Detach(label)
+            label.Destroy()
+        self.panel.FitInside()
+        self.panel.Layout()
+
+    # --- Updates ----------------------------------------------------------
+    def refresh(self, full=False):
+        """Push changed times to their labels (``full`` also re-reads every UTC offset label)."""
+        if full:
+            self.clock.invalidate()
+        utc_now = self.clock.now()
+        for index, _zone, text in self.clock.tick(utc_now):
+            self.rows[index][1].SetLabel(text)
+        for index, labels in enumerate(self.rows):  # Cached offsets: only DST changes rewrite these.
+            offset_text = self.clock.utc_offset_label(index, utc_now)
+            if full or labels[2].GetLabel() != offset_text:
+                labels[2].SetLabel(offset_text)
+
+    def set_anchor(self, anchor_utc):
+        """Pin the view to ``anchor_utc`` (UTC seconds) or follow the system clock with ``None``."""
+        self.clock.set_anchor(anchor_utc)
+        self._update_mode_label()
+        self.refresh(full=True)
+
+    def _update_mode_label(self):
+        self.mode_btn.SetLabel("LIVE" if self.clock.anchor_utc is None else "PINNED (click for live)")
+
+    # --- Events -----------------------------------------------------------
+    def on_tick(self, event):
+        self.refresh()
+
+    def on_add(self, event):
+        zone = self.picker.GetStringSelection()
+        if zone:
+            self.add_zone(zone)
+            self.picker.SetSelection(wx.NOT_FOUND)
+
+    def on_toggle_live(self, event):
+        if self.clock.anchor_utc is not None:
+            self.set_anchor(None)
+
+    def on_close(self, event):
+        self.timer.Stop()
+        event.Skip()
@@ -0,0 +1,103 @@
+"""Typeahead timezone picker backed by the tz_search index."""
+
+import wx  # wxPython widgets.
+import wx.lib.newevent  # Resolved-zone change notification.
+
+import tz_search  # Prebuilt zone/city/country/alias index.
+
+# Fired when the zone the picker resolves to changes through typing or picking a row
+# (``event.zone`` is the new zone, "" when the text no longer names one). Like
+# ``wx.Choice``, programmatic ``SetStringSelection``/``SetSelection`` stay silent.
+ZoneChangedEvent, EVT_ZONE_CHANGED = wx.lib.newevent.NewCommandEvent()
+
+
+class ZonePicker(wx.ComboBox):
+    """Editable combo box that only lists the zones matching what has been typed.
+
+    It keeps the small ``wx.Choice`` surface the rest of Tzpy relies on
+    (``GetStringSelection``, ``SetStringSelection``, ``SetSelection``), so the
+    event handlers did not have to change. Typed aliases and city names such as
+    "kolkata" or "IST" resolve to their canonical zone.
+    """
+
+    def __init__(self, parent, limit=40, **kwargs):
+        kwargs.setdefault("style", wx.CB_DROPDOWN)
+        super().__init__(parent, choices=[], **kwargs)
+        self.limit = limit  # Max rows rendered in the dropdown.
+        self._index = None  # Built lazily (or by preload()) so startup stays fast.
+        self._updating = False  # Guards against EVT_TEXT fired by our own Set()/ChangeValue().
+        self._zone = ""  # Last resolved zone, for EVT_ZONE_CHANGED.
+        self.SetHint("Type a city, zone, country or alias")
+        self.Bind(wx.EVT_TEXT, self._on_text)
+        self.Bind(wx.EVT_COMBOBOX, self._on_pick)
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = tz_search.default_index()
+        return self._index
+
+    def preload(self):
+        """Build the shared search index now and show the popular zones."""
+        self._show(self.index.search("", limit=self.limit))
+
+    def _show(self, zones):
+        """Replace the dropdown rows without disturbing the typed text or caret."""
+        value, caret = self.GetValue(), self.GetInsertionPoint()
+        self._updating = True
+        try:
+            self.Set(zones)
+            self.ChangeValue(value)
+            self.SetInsertionPoint(caret)
+        finally:
+            self._updating = False
+
+    def _on_text(self, event):
+        if not self._updating:
+            self._show(self.index.search(self.GetValue(), limit=self.limit))
+            self._notify_zone()
+        event.Skip()  # Let Tzpy's own EVT_TEXT bindings run too.
+
+    def _on_pick(self, event):
+        self._notify_zone()
+        event.Skip()
+
+    def _notify_zone(self):
+        """Send EVT_ZONE_CHANGED if the typed/picked text now resolves to a different zone."""
+        zone = self.GetStringSelection()
+        if zone != self._zone:
+            self._zone = zone
+            self.GetEventHandler().ProcessEvent(ZoneChangedEvent(self.GetId(), zone=zone))
+
+    # --- wx.Choice-compatible surface -----------------------------------
+    def GetStringSelection(self):
+        """Canonical zone for the current text, or "" when it does not name one zone."""
+        return self.index.resolve(self.GetValue()) or ""
+
+    def SetStringSelection(self, zone):
+        """Show ``zone`` (resolving aliases); returns False if it is not a known zone."""
+        resolved = self.index.resolve(zone)
+        if resolved is None:
+            return False
+        self._updating = True
+        try:
+            self.Set([resolved])
+            self.ChangeValue(resolved)
+        finally:
+            self._updating = False
+        self._zone = resolved
+        return True
+
+    def SetSelection(self, n):
+        """``wx.NOT_FOUND`` clears the picker; other values select that visible row."""
+        if n == wx.NOT_FOUND:
+            self._updating = True
+            try:
+                self.ChangeValue("")
+            finally:
+                self._updating = False
+            self._show(self.index.search("", limit=self.limit))
+            self._zone = ""
+            return
+        super().SetSelection(n)
+        self._zone = self.GetStringSelection()
@@ -0,0 +1,157 @@
+"""Offline timezone -> location table built from the tz database's own zone.tab/zone1970.tab.
+
+Every canonical IANA zone ships with representative coordinates and a country
+code, so most weather lookups never need the network geocoder. The table is
+precomputed into ``zone_table.json`` (run ``python zone_table.py`` after a pytz
+upgrade to rebuild it) and loaded lazily on the first lookup. Backward-compatible
+link names such as ``US/Eastern`` are included using the ``L <target> <link>``
+lines of ``tzdata.zi``. A link target can serve several countries (Africa/Asmera
+points at Africa/Nairobi), so a link only borrows a zone.tab row from its own
+country; links whose country cannot be told are left to the geocoder.
+"""
+
+import difflib  # Matching old spellings ("Asmera") to their zone.tab row ("Asmara").
+import json  # Compact on-disk table.
+import os  # Locating the table next to this module.
+import threading  # Guard the one-time lazy load.
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "zone_table.json")
+
+_table = None  # zone -> (lat, lon, display_name, country_code), loaded on first use.
+_lock = threading.Lock()
+
+
+def _parse_coordinate(text, degree_digits):
+    """Turn ``+DDMM``/``+DDMMSS`` (or ``+DDDMM...`` for longitude) into decimal degrees."""
+    sign = -1 if text[0] == "-" else 1
+    digits = text[1:]
+    degrees = int(digits[:degree_digits])
+    minutes = int(digits[degree_digits:degree_digits + 2])
+    seconds = int(digits[degree_digits + 2:] or 0)
+    return round(sign * (degrees + minutes / 60 + seconds / 3600), 4)
+
+
+def _parse_iso6709(coords):
+    """Split a zone.tab coordinate pair like ``+3541+13946`` into (lat, lon)."""
+    split = max(coords.rfind("+"), coords.rfind("-"))  # Start of the longitude part.
+    return _parse_coordinate(coords[:split], 2), _parse_coordinate(coords[split:], 3)
+
+
+def _read_tab(pytz, name):
+    try:
+        with pytz.open_resource(name) as fh:
+            return fh.read().decode("utf-8").splitlines()
+    except (IOError, OSError):
+        return []
+
+
+def display_name(zone):
+    """Human-readable city for a zone (matches ``weather_api.city_name_from_timezone``)."""
+    return zone.split("/")[-1].replace("_", " ")
+
+
+def read_links(pytz):
+    """``{link: canonical target}`` from the ``L <target> <link>`` lines of ``tzdata.zi``."""
+    links = {}
+    for line in _read_tab(pytz, "tzdata.zi"):
+        fields = line.split()
+        if len(fields) == 3 and fields[0] == "L":
+            links[fields[2]] = fields[1]
+    for link in links:  # Follow any link-to-link chains to the real zone.
+        seen = {link}
+        while links[link] in links and links[link] not in seen:
+            seen.add(links[link])
+            links[link] = links[links[link]]
+    return links
+
+
+def _squash(name):
+    return "".join(ch for ch in name.lower() if ch.isalnum())
+
+
+def _link_row(link, target, candidates, table, countries):
+    """The zone.tab zone whose row ``link`` should borrow, or ``None`` if its country is unclear.
+
+    In order: the same place under its modern spelling (Africa/Asmera -> Africa/Asmara),
+    the target's zone in the country the link is named after (GB, Canada/Eastern,
+    Singapore), then the target itself when every candidate is in one country.
+    """
+    city = _squash(display_name(link))
+    area = link.split("/")[0]
+    for zone in candidates:
+        if zone.split("/")[0] == area and difflib.SequenceMatcher(None, city, _squash(display_name(zone))).ratio() >= 0.8:
+            return zone
+    code = countries.get(_squash(area))
+    if code:
+        in_country = [zone for zone in candidates if table[zone][3] == code]
+        return target if target in in_country else (in_country[0] if in_country else None)
+    if target in table and len({table[zone][3] for zone in candidates}) == 1:
+        return target
+    return None
+
+
+def build_table():
+    """Parse the tz database tables bundled with pytz into ``{zone: [lat, lon, name, cc]}``."""
+    import pytz  # Only needed when (re)building.
+
+    table = {}
+    # zone1970.tab lists several countries per zone; zone.tab has one, so it wins below.
+    for filename in ("zone1970.tab", "zone.tab"):
+        for line in _read_tab(pytz, filename):
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split("\t")
+            if len(fields) < 3:
+                continue
+            codes, coords, zone = fields[0], fields[1], fields[2]
+            lat, lon = _parse_iso6709(coords)
+            table[zone] = [lat, lon, display_name(zone), codes.split(",")[0]]
+
+    # Link names (US/Eastern, Japan, Asia/Calcutta, ...) borrow a zone.tab row that shares their target.
+    links = read_links(pytz)
+    siblings = {}  # target -> zone.tab zones that are (or link to) it
+    for zone in table:
+        siblings.setdefault(links.get(zone, zone), []).append(zone)
+    countries = {_squash(name): code for code, name in pytz.country_names.items()}
+    countries.update((code.lower(), code) for code in pytz.country_names)
+    for link, target in links.items():
+        if link not in table:
+            zone = _link_row(link, target, siblings.get(target, []), table, countries)
+            if zone:
+                table[link] = list(table[zone])  # Keep the zone.tab city name for display.
+
+    return {"tzdata": getattr(pytz, "OLSON_VERSION", ""), "zones": dict(sorted(table.items()))}
+
+
+def write_table(path=TABLE_PATH):
+    """Build the table and save it as compact JSON (the install-time step)."""
+    data = build_table()
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, separators=(",", ":"), ensure_ascii=False)
+        fh.write("\n")
+    return len(data["zones"])
+
+
+def _load():
+    """Load the precomputed table, rebuilding it in memory if the file is missing."""
+    global _table
+    with _lock:
+        if _table is None:
+            try:
+                with open(TABLE_PATH, encoding="utf-8") as fh:
+                    zones = json.load(fh)["zones"]
+            except (OSError, ValueError, KeyError):
+                zones = build_table()["zones"]  # Still offline: parses pytz's bundled tables.
+            _table = {zone: tuple(entry) for zone, entry in zones.items()}
+    return _table
+
+
+def lookup(tz_name):
+    """Return ``(lat, lon, display_name, country_code)`` for ``tz_name`` or ``None`` if not covered."""
+    table = _table if _table is not None else _load()
+    return table.get(tz_name)
+
+
+if __name__ == "__main__":
+    count = write_table()
+    print(f"Wrote {count} zones to {TABLE_PATH}")